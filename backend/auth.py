@@ -0,0 +1,12 @@
+import secrets
+
+from fastapi import Header, HTTPException
+
+from config import settings
+
+
+async def require_admin_token(x_admin_token: str | None = Header(default=None)):
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(403, "Admin endpoints are disabled; set ADMIN_TOKEN to enable them")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(401, "Invalid admin token")
@@ -0,0 +1,108 @@
+"""REST API and database latency benchmark against a dataset from ``generate_dataset``.
+
+Requests go through the real FastAPI app in-process (httpx ``ASGITransport``), so the
+numbers cover routing, validation, serialization and every query the services run,
+without network noise. Measured endpoints:
+
+* ``GET /api/rooms``
+* ``GET /api/rooms/{id}`` for randomly chosen rooms
+* ``GET /api/messages/{room_id}`` on a deep room at increasing offsets
+* ``DELETE /api/rooms/{id}`` (destructive: removes ``--deletes`` rooms from the dataset)
+
+Usage (from ``backend/``)::
+
+    uv run python -m benchmarks.bench_api --database-url sqlite+aiosqlite:///./bench.db --output api.json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.common import log, parse_int_list, summarize, write_results
+
+
+async def timed_requests(client, method: str, paths: list[str], expected_status: int) -> dict:
+    durations = []
+    failures = 0
+    for path in paths:
+        start = time.perf_counter()
+        response = await client.request(method, path)
+        durations.append(time.perf_counter() - start)
+        if response.status_code != expected_status:
+            failures += 1
+    return {**summarize(durations), "failures": failures}
+
+
+async def run(args) -> list[dict]:
+    from httpx import ASGITransport, AsyncClient
+    from sqlalchemy import func, select
+
+    from benchmarks.generate_dataset import DEEP_ROOM_PREFIX
+    from database import async_session, engine
+    from main import app
+    from models.message import Message
+    from models.room import Room
+
+    rng = random.Random(args.seed)
+    async with async_session() as db:
+        room_ids = list((await db.execute(
+            select(Room.id).where(~Room.name.startswith(DEEP_ROOM_PREFIX))
+        )).scalars().all())
+        deep = (await db.execute(
+            select(Room.id, func.count(Message.id))
+            .join(Message, Message.room_id == Room.id)
+            .where(Room.name.startswith(DEEP_ROOM_PREFIX))
+            .group_by(Room.id)
+            .order_by(func.count(Message.id).desc())
+            .limit(1)
+        )).first()
+    if not room_ids:
+        raise SystemExit("No rooms found - run benchmarks.generate_dataset first")
+    log(f"{len(room_ids)} rooms, deep room: {deep[1] if deep else 0} messages")
+
+    results = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        def add(name: str, stats: dict, **params):
+            results.append({"endpoint": name, **params, **stats})
+            log(f"{name:<32} {str(params or ''):<20} p50={stats.get('p50_ms')}ms p99={stats.get('p99_ms')}ms")
+
+        add("GET /api/rooms", await timed_requests(client, "GET", ["/api/rooms"] * args.list_requests, 200))
+
+        sample = [rng.choice(room_ids) for _ in range(args.requests)]
+        add("GET /api/rooms/{id}", await timed_requests(client, "GET", [f"/api/rooms/{r}" for r in sample], 200))
+
+        if deep:
+            deep_id, deep_count = deep
+            for offset in args.offsets:
+                if offset >= deep_count:
+                    continue
+                paths = [f"/api/messages/{deep_id}?limit={args.page_size}&offset={offset}"] * args.requests
+                add("GET /api/messages/{room_id}", await timed_requests(client, "GET", paths, 200), offset=offset)
+
+        to_delete = rng.sample(room_ids, min(args.deletes, len(room_ids)))
+        add("DELETE /api/rooms/{id}", await timed_requests(client, "DELETE", [f"/api/rooms/{r}" for r in to_delete], 204))
+
+    await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark REST endpoints against a large synthetic dataset")
+    parser.add_argument("--database-url", required=True, help="Database created by benchmarks.generate_dataset")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per single-object endpoint")
+    parser.add_argument("--list-requests", type=int, default=10, help="Requests to GET /api/rooms")
+    parser.add_argument("--offsets", type=parse_int_list, default=[0, 1000, 10000, 50000, 99000])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--deletes", type=int, default=20, help="Rooms to delete (destructive)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    # Must be set before config/database are imported so the app binds to the benchmark database.
+    os.environ["DATABASE_URL"] = args.database_url
+    results = asyncio.run(run(args))
+    params = {k: v for k, v in vars(args).items() if k != "output"}
+    write_results("rest_api", params, results, args.output)
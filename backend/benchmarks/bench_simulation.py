@@ -0,0 +1,205 @@
+"""Throughput benchmark for the simulation engine.
+
+Drives ``SimulationManager`` against a throwaway SQLite database with a zero-latency
+stub in place of the LLM, and reports turns/second plus a per-turn breakdown of
+history build, DB commit and broadcast time. Two sweeps are run:
+
+* transcript length: one room pre-seeded with N messages, then a fixed number of turns
+* concurrent rooms: R rooms started at once, each running a fixed number of turns
+
+Usage (from ``backend/``)::
+
+    uv run python -m benchmarks.bench_simulation --output sim.json
+    uv run python -m benchmarks.bench_simulation --transcript-lengths 10,1000 --room-counts 1,50
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.common import PhaseTimer, log, parse_int_list, write_results
+from config import settings
+from database import Base
+from models.agent import Agent
+from models.message import Message
+from models.room import Room
+from models.room_agent import RoomAgent
+from services import simulation_engine
+from services.simulation_engine import LLMResult, SimulationManager, SimulationRunner, ws_manager
+
+timer = PhaseTimer()
+
+
+class TimedSession(AsyncSession):
+    async def commit(self):
+        with timer.measure("db_commit"):
+            await super().commit()
+
+
+class NullWebSocket:
+    """Viewer stand-in that accepts every frame, so broadcasts still pay for JSON encoding."""
+
+    def __init__(self):
+        self.received = 0
+
+    async def send_text(self, data: str):
+        self.received += 1
+
+
+def install_instrumentation():
+    settings.SIMULATION_TURN_DELAY = 0
+
+    async def stub_call_llm(self, agent_model, history):
+        return LLMResult(f"{agent_model.name} replies to {len(history)} messages.")
+
+    original_build_history = SimulationRunner._build_history
+
+    async def timed_build_history(self, *args, **kwargs):
+        with timer.measure("history_build"):
+            return await original_build_history(self, *args, **kwargs)
+
+    original_broadcast = ws_manager.broadcast
+
+    async def timed_broadcast(room_id, data):
+        if data.get("type") == "error":
+            timer.record("errors", 0)
+        with timer.measure("broadcast"):
+            await original_broadcast(room_id, data)
+
+    SimulationRunner._call_llm = stub_call_llm
+    SimulationRunner._build_history = timed_build_history
+    ws_manager.broadcast = timed_broadcast
+
+
+async def create_room(session_factory, agents_per_room: int, max_turns: int, seed_messages: int = 0) -> str:
+    room_id = str(uuid.uuid4())
+    agent_ids = [str(uuid.uuid4()) for _ in range(agents_per_room)]
+    async with session_factory() as db:
+        await db.execute(insert(Agent), [
+            {"id": aid, "name": f"Agent {i}", "system_prompt": "Benchmark agent.", "model": "litellm/stub/zero"}
+            for i, aid in enumerate(agent_ids)
+        ])
+        await db.execute(insert(Room), [{"id": room_id, "name": "Benchmark room", "max_turns": max_turns}])
+        await db.execute(insert(RoomAgent), [
+            {"room_id": room_id, "agent_id": aid, "turn_order": i} for i, aid in enumerate(agent_ids)
+        ])
+        if seed_messages:
+            base = datetime.now(UTC) - timedelta(seconds=seed_messages)
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "room_id": room_id,
+                    "agent_id": agent_ids[i % agents_per_room],
+                    "role": "assistant",
+                    "content": f"Seeded message {i} with some filler text to look like a reply.",
+                    "turn_number": i,
+                    "created_at": base + timedelta(seconds=i),
+                }
+                for i in range(seed_messages)
+            ]
+            for start in range(0, len(rows), 5000):
+                await db.execute(insert(Message), rows[start:start + 5000])
+        await db.commit()
+    return room_id
+
+
+async def run_rooms(manager: SimulationManager, room_ids: list[str], viewers: int) -> float:
+    sockets = []
+    for room_id in room_ids:
+        for _ in range(viewers):
+            ws = NullWebSocket()
+            sockets.append(ws)
+            await ws_manager.connect(room_id, ws)
+
+    timer.reset()
+    start = time.perf_counter()
+    for room_id in room_ids:
+        await manager.start(room_id)
+    tasks = [manager.simulations[room_id].task for room_id in room_ids]
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    for room_id in room_ids:
+        for ws in list(ws_manager.rooms.get(room_id, [])):
+            ws_manager.disconnect(room_id, ws)
+        manager.simulations.pop(room_id, None)
+    return elapsed
+
+
+def scenario_result(scenario: str, elapsed: float, turns: int, **params) -> dict:
+    phases = timer.summary()
+    errors = phases.pop("errors", {}).get("count", 0)
+    return {
+        "scenario": scenario,
+        **params,
+        "turns": turns,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "turns_per_second": round(turns / elapsed, 2) if elapsed else None,
+        "per_turn_ms": round(elapsed / turns * 1000, 4) if turns else None,
+        "phases": phases,
+    }
+
+
+async def main(args) -> list[dict]:
+    install_instrumentation()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        engine = create_async_engine(
+            db_url, pool_size=args.pool_size, max_overflow=0, connect_args={"timeout": 60},
+        )
+        session_factory = async_sessionmaker(engine, class_=TimedSession, expire_on_commit=False)
+        simulation_engine.async_session = session_factory
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        SimulationManager._instance = None
+        manager = SimulationManager()
+        results = []
+
+        for length in args.transcript_lengths:
+            room_id = await create_room(session_factory, args.agents_per_room, args.turns, seed_messages=length)
+            elapsed = await run_rooms(manager, [room_id], args.viewers)
+            result = scenario_result(
+                "transcript_length", elapsed, args.turns, transcript_length=length, rooms=1,
+            )
+            results.append(result)
+            log(f"transcript={length:>6}  {result['turns_per_second']:>9} turns/s  errors={result['errors']}")
+
+        for count in args.room_counts:
+            room_ids = [
+                await create_room(session_factory, args.agents_per_room, args.turns_per_room)
+                for _ in range(count)
+            ]
+            elapsed = await run_rooms(manager, room_ids, args.viewers)
+            result = scenario_result(
+                "concurrent_rooms", elapsed, count * args.turns_per_room, transcript_length=0, rooms=count,
+            )
+            results.append(result)
+            log(f"rooms={count:>5}       {result['turns_per_second']:>9} turns/s  errors={result['errors']}")
+
+        await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the simulation engine with a stubbed LLM")
+    parser.add_argument("--transcript-lengths", type=parse_int_list, default=[10, 100, 1000, 10000])
+    parser.add_argument("--room-counts", type=parse_int_list, default=[1, 10, 100, 1000])
+    parser.add_argument("--turns", type=int, default=20, help="Turns per transcript-length scenario")
+    parser.add_argument("--turns-per-room", type=int, default=5, help="Turns per room in the concurrency sweep")
+    parser.add_argument("--agents-per-room", type=int, default=2)
+    parser.add_argument("--viewers", type=int, default=1, help="Fake WebSocket viewers per room")
+    parser.add_argument("--pool-size", type=int, default=1000, help="DB connection pool size")
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+    write_results("simulation", {k: v for k, v in vars(args).items() if k != "output"}, results, args.output)
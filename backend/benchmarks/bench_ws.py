@@ -0,0 +1,200 @@
+"""WebSocket fan-out benchmark and load harness.
+
+Starts the FastAPI app on a local uvicorn instance (in this process, so events can be
+driven straight through ``ws_manager.broadcast``) and spawns a separate client process
+that opens N loopback WebSocket connections on ``/ws/{room_id}`` spread across M rooms.
+Every event carries its send timestamp, so the clients can report delivery latency.
+
+For each scenario the harness reports delivery latency percentiles (for normal and
+deliberately slow clients separately), delivered messages/second, time spent inside
+``broadcast`` per event, and server-side memory per connection (RSS delta / N).
+Slow clients sleep after every frame they read, which exercises back-pressure.
+
+Usage (from ``backend/``)::
+
+    uv run python -m benchmarks.bench_ws --clients 1000 --rooms 10 --output ws.json
+    uv run python -m benchmarks.bench_ws --clients 200 --rooms 4 --slow-clients 0,10 --slow-delay 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+
+from benchmarks.common import log, parse_int_list, rss_bytes, summarize, write_results
+
+DONE = "bench_done"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def room_ids(count: int) -> list[str]:
+    return [f"bench-room-{i}" for i in range(count)]
+
+
+# --- Client process -------------------------------------------------------------------------
+
+
+async def _client(url: str, slow_delay: float, latencies: list[float], received: list[float]):
+    from websockets.asyncio.client import connect
+
+    async with connect(url, max_size=None) as ws:
+        async for frame in ws:
+            now = time.time()
+            data = json.loads(frame)
+            if data.get("type") == DONE:
+                return
+            latencies.append(now - data["sent_at"])
+            received.append(now)
+            if slow_delay:
+                await asyncio.sleep(slow_delay)
+
+
+async def run_clients(args):
+    rooms = room_ids(args.rooms)
+    fast_latencies: list[float] = []
+    slow_latencies: list[float] = []
+    received: list[float] = []
+    tasks = []
+    for i in range(args.clients):
+        slow = i < args.slow_clients
+        url = f"{args.url}/ws/{rooms[i % len(rooms)]}"
+        target = slow_latencies if slow else fast_latencies
+        tasks.append(asyncio.create_task(_client(url, args.slow_delay if slow else 0, target, received)))
+        if i % 100 == 99:
+            await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    print(json.dumps({
+        "fast": summarize(fast_latencies),
+        "slow": summarize(slow_latencies),
+        "delivered": len(received),
+        "first_receive": min(received, default=0),
+        "last_receive": max(received, default=0),
+    }))
+
+
+# --- Server side ----------------------------------------------------------------------------
+
+
+async def wait_for_connections(manager, expected: int, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while sum(len(sockets) for sockets in manager.rooms.values()) < expected:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Only {sum(len(s) for s in manager.rooms.values())}/{expected} clients connected")
+        await asyncio.sleep(0.05)
+
+
+async def run_scenario(args, url: str, slow_clients: int) -> dict:
+    from services.simulation_engine import ws_manager
+
+    rooms = room_ids(args.rooms)
+    rss_before = rss_bytes()
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.bench_ws", "--client",
+        "--url", url, "--clients", str(args.clients), "--rooms", str(args.rooms),
+        "--slow-clients", str(slow_clients), "--slow-delay", str(args.slow_delay),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    await wait_for_connections(ws_manager, args.clients)
+    rss_after = rss_bytes()
+
+    payload = "x" * args.payload_bytes
+    interval = 1 / args.rate if args.rate else 0
+    broadcast_times: list[float] = []
+    start = time.time()
+    for seq in range(args.events):
+        tick = time.perf_counter()
+        for room_id in rooms:
+            t0 = time.perf_counter()
+            await ws_manager.broadcast(room_id, {"type": "bench", "seq": seq, "sent_at": time.time(), "payload": payload})
+            broadcast_times.append(time.perf_counter() - t0)
+        if interval:
+            await asyncio.sleep(max(0.0, interval - (time.perf_counter() - tick)))
+        else:
+            await asyncio.sleep(0)
+    send_elapsed = time.time() - start
+    for room_id in rooms:
+        await ws_manager.broadcast(room_id, {"type": DONE})
+
+    stdout, _ = await proc.communicate()
+    client = json.loads(stdout.decode().strip().splitlines()[-1])
+    ws_manager.rooms.clear()
+
+    delivery_window = max(client["last_receive"] - start, send_elapsed) or 1e-9
+    return {
+        "scenario": "fanout",
+        "clients": args.clients,
+        "rooms": args.rooms,
+        "slow_clients": slow_clients,
+        "slow_delay_s": args.slow_delay,
+        "events_per_room": args.events,
+        "payload_bytes": args.payload_bytes,
+        "expected_deliveries": args.events * args.clients,
+        "delivered": client["delivered"],
+        "send_elapsed_s": round(send_elapsed, 4),
+        "messages_per_second": round(client["delivered"] / delivery_window, 2),
+        "latency_fast": client["fast"],
+        "latency_slow": client["slow"],
+        "broadcast_call": summarize(broadcast_times),
+        "server_rss_per_connection_bytes": round((rss_after - rss_before) / args.clients) if args.clients else 0,
+    }
+
+
+async def run_server(args) -> list[dict]:
+    import uvicorn
+
+    from main import app
+
+    port = args.port or _free_port()
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning", backlog=4096)
+    server = uvicorn.Server(config)
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    results = []
+    try:
+        for slow in args.slow_clients:
+            result = await run_scenario(args, f"ws://127.0.0.1:{port}", slow)
+            results.append(result)
+            log(
+                f"clients={args.clients} rooms={args.rooms} slow={slow}: "
+                f"{result['messages_per_second']} msg/s, "
+                f"p99 fast={result['latency_fast'].get('p99_ms')}ms slow={result['latency_slow'].get('p99_ms', '-')}ms, "
+                f"{result['server_rss_per_connection_bytes']} B/conn"
+            )
+    finally:
+        server.should_exit = True
+        await serve_task
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket fan-out through ConnectionManager")
+    parser.add_argument("--clients", type=int, default=200, help="Total WebSocket clients")
+    parser.add_argument("--rooms", type=int, default=10, help="Rooms the clients are spread across")
+    parser.add_argument("--events", type=int, default=200, help="Events broadcast to each room")
+    parser.add_argument("--rate", type=float, default=0, help="Events per second per room (0 = as fast as possible)")
+    parser.add_argument("--payload-bytes", type=int, default=512)
+    parser.add_argument("--slow-clients", default="0", help="Comma-separated slow client counts to sweep")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="Seconds a slow client sleeps per frame")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--output", help="Write JSON results to this file instead of stdout")
+    parser.add_argument("--client", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.client:
+        args.slow_clients = int(args.slow_clients)
+        asyncio.run(run_clients(args))
+    else:
+        args.slow_clients = parse_int_list(args.slow_clients)
+        results = asyncio.run(run_server(args))
+        params = {k: v for k, v in vars(args).items() if k not in ("output", "client", "url")}
+        write_results("websocket_fanout", params, results, args.output)
@@ -0,0 +1,108 @@
+"""Shared helpers for the benchmark scripts: timing, percentiles and JSON result output."""
+
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+
+def parse_int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def summarize(values: list[float]) -> dict:
+    """Return count, mean and percentiles (in milliseconds) for a list of durations in seconds."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        idx = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+        return round(ordered[idx] * 1000, 4)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p50_ms": pct(50),
+        "p90_ms": pct(90),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(ordered[-1] * 1000, 4),
+        "total_ms": round(sum(ordered) * 1000, 4),
+    }
+
+
+class PhaseTimer:
+    """Collects wall-clock durations per named phase."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+
+    def record(self, phase: str, seconds: float):
+        self.samples.setdefault(phase, []).append(seconds)
+
+    @contextmanager
+    def measure(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def reset(self):
+        self.samples = {}
+
+    def summary(self) -> dict:
+        return {phase: summarize(values) for phase, values in sorted(self.samples.items())}
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_metadata() -> dict:
+    return {
+        "timestamp": datetime.now(UTC).isoformat(),
+        "git_commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+    }
+
+
+def write_results(benchmark: str, params: dict, results: list[dict], output: str | None):
+    """Write results as JSON to ``output`` (or stdout when not given)."""
+    payload = {"benchmark": benchmark, **run_metadata(), "params": params, "results": results}
+    text = json.dumps(payload, indent=2)
+    if output:
+        Path(output).write_text(text + "\n")
+        print(f"Results written to {output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+def log(message: str):
+    print(message, file=sys.stderr, flush=True)
@@ -0,0 +1,146 @@
+"""Bulk-load a synthetic dataset straight into the database for the API benchmarks.
+
+Unlike ``scripts/seed.py`` this bypasses the HTTP API and inserts rows in large batches,
+so it can produce thousands of agents, tens of thousands of rooms and millions of
+messages in minutes. Messages are spread evenly over the regular rooms, plus a few
+"deep" rooms holding a long transcript each for deep-offset pagination tests.
+
+Usage (from ``backend/``)::
+
+    uv run python -m benchmarks.generate_dataset --database-url sqlite+aiosqlite:///./bench.db
+    uv run python -m benchmarks.generate_dataset --database-url sqlite+aiosqlite:///./bench.db \\
+        --agents 5000 --rooms 50000 --messages 5000000 --deep-rooms 2 --deep-room-messages 200000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from benchmarks.common import log
+from database import Base
+from models.agent import Agent
+from models.message import Message
+from models.room import Room
+from models.room_agent import RoomAgent
+
+DEEP_ROOM_PREFIX = "Deep room"
+MODELS = ["litellm/openai/gpt-5.2", "litellm/openai/gpt-5-mini", "litellm/openrouter/deepseek/deepseek-r1"]
+STATUSES = ["idle", "idle", "idle", "stopped", "paused"]
+FILLER = (
+    "That is an interesting point, but consider how the argument changes once we account for "
+    "second-order effects and the incentives of everyone involved. "
+)
+
+
+async def _insert_batches(conn, model, rows, batch_size: int):
+    for start in range(0, len(rows), batch_size):
+        await conn.execute(insert(model), rows[start:start + batch_size])
+
+
+async def generate(args):
+    rng = random.Random(args.seed)
+    engine = create_async_engine(args.database_url)
+    started = time.perf_counter()
+    base_time = datetime.now(UTC) - timedelta(days=30)
+
+    async with engine.begin() as conn:
+        if args.drop:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        if engine.dialect.name == "sqlite":
+            await conn.exec_driver_sql("PRAGMA synchronous = OFF")
+
+        agent_ids = [str(uuid.uuid4()) for _ in range(args.agents)]
+        await _insert_batches(conn, Agent, [
+            {
+                "id": aid,
+                "name": f"Agent {i}",
+                "system_prompt": f"You are synthetic agent number {i}. Stay in character.",
+                "model": MODELS[i % len(MODELS)],
+                "created_at": base_time + timedelta(seconds=i),
+            }
+            for i, aid in enumerate(agent_ids)
+        ], args.batch_size)
+        log(f"agents:      {len(agent_ids):>10}")
+
+        total_rooms = args.rooms + args.deep_rooms
+        room_ids = [str(uuid.uuid4()) for _ in range(total_rooms)]
+        await _insert_batches(conn, Room, [
+            {
+                "id": rid,
+                "name": f"{DEEP_ROOM_PREFIX} {i - args.rooms}" if i >= args.rooms else f"Room {i}",
+                "description": "Synthetic benchmark room",
+                "status": "idle" if i >= args.rooms else rng.choice(STATUSES),
+                "max_turns": 20,
+                "created_at": base_time + timedelta(seconds=i),
+            }
+            for i, rid in enumerate(room_ids)
+        ], args.batch_size)
+        log(f"rooms:       {len(room_ids):>10}")
+
+        room_members: dict[str, list[str]] = {}
+        assignments = []
+        for rid in room_ids:
+            members = rng.sample(agent_ids, min(args.agents_per_room, len(agent_ids)))
+            room_members[rid] = members
+            assignments.extend(
+                {"room_id": rid, "agent_id": aid, "turn_order": order} for order, aid in enumerate(members)
+            )
+        await _insert_batches(conn, RoomAgent, assignments, args.batch_size)
+        log(f"assignments: {len(assignments):>10}")
+
+    plan = [(rid, args.messages // args.rooms + (1 if i < args.messages % args.rooms else 0))
+            for i, rid in enumerate(room_ids[:args.rooms])] if args.rooms else []
+    plan += [(rid, args.deep_room_messages) for rid in room_ids[args.rooms:]]
+
+    written = 0
+    batch: list[dict] = []
+    for rid, count in plan:
+        members = room_members[rid]
+        for turn in range(count):
+            injected = turn % 25 == 24
+            batch.append({
+                "id": str(uuid.uuid4()),
+                "room_id": rid,
+                "agent_id": None if injected else members[turn % len(members)],
+                "role": "user" if injected else "assistant",
+                "content": FILLER * rng.randint(1, 4),
+                "turn_number": turn,
+                "created_at": base_time + timedelta(seconds=turn),
+            })
+            if len(batch) >= args.batch_size:
+                async with engine.begin() as conn:
+                    await conn.execute(insert(Message), batch)
+                written += len(batch)
+                batch = []
+                if written % (args.batch_size * 20) == 0:
+                    log(f"messages:    {written:>10}")
+    if batch:
+        async with engine.begin() as conn:
+            await conn.execute(insert(Message), batch)
+        written += len(batch)
+    log(f"messages:    {written:>10}")
+
+    await engine.dispose()
+    log(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-load a synthetic dataset for benchmarking")
+    parser.add_argument("--database-url", required=True, help="Target database, e.g. sqlite+aiosqlite:///./bench.db")
+    parser.add_argument("--agents", type=int, default=2000)
+    parser.add_argument("--rooms", type=int, default=20000)
+    parser.add_argument("--agents-per-room", type=int, default=3)
+    parser.add_argument("--messages", type=int, default=1000000, help="Messages spread over the regular rooms")
+    parser.add_argument("--deep-rooms", type=int, default=2, help="Rooms holding one long transcript each")
+    parser.add_argument("--deep-room-messages", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--drop", action="store_true", help="Drop existing tables first")
+    asyncio.run(generate(parser.parse_args()))
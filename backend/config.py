@@ -1,3 +1,4 @@
+import json
 import os
 from pathlib import Path
 
@@ -7,12 +8,86 @@ env_path = Path(__file__).resolve().parent.parent / ".env"
 load_dotenv(env_path)
 
 
+def _env_bool(name: str, default: bool = False) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
 class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY", "")
     BACKEND_URL: str = os.getenv("BACKEND_URL", "http://localhost:8484")
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3737")
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./agent_nebula.db")
+    SIMULATION_TURN_DELAY: float = float(os.getenv("SIMULATION_TURN_DELAY", "1"))
+    # Starts beyond this many running simulations (per process) wait in a queue; 0 means no limit.
+    MAX_CONCURRENT_SIMULATIONS: int = int(os.getenv("MAX_CONCURRENT_SIMULATIONS", "0"))
+    # What startup does with rooms a previous process left running/paused/queued:
+    # "resume" from their persisted turn, "stop" them (resumable by hand), or "off".
+    SIMULATION_RECOVERY: str = os.getenv("SIMULATION_RECOVERY", "resume")
+    # Finished runners and WebSocket rooms without viewers are forgotten after this long.
+    FINISHED_RUNNER_TTL_SECONDS: float = float(os.getenv("FINISHED_RUNNER_TTL_SECONDS", "300"))
+    REAPER_INTERVAL_SECONDS: float = float(os.getenv("REAPER_INTERVAL_SECONDS", "60"))
+    # On shutdown, in-flight turns get this long to finish before being cancelled (and redone after restart).
+    SHUTDOWN_DRAIN_SECONDS: float = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "20"))
+    # Sent to WebSocket clients before their socket is closed with code 1012.
+    SHUTDOWN_RECONNECT_HINT_MS: int = int(os.getenv("SHUTDOWN_RECONNECT_HINT_MS", "2000"))
+
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_RETRY_BASE_DELAY: float = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+    LLM_RETRY_MAX_DELAY: float = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+    LLM_HEDGE_DEFAULT_DELAY: float = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "10"))
+
+    CIRCUIT_BREAKER_WINDOW: int = int(os.getenv("CIRCUIT_BREAKER_WINDOW", "20"))
+    CIRCUIT_BREAKER_MIN_CALLS: int = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "5"))
+    CIRCUIT_BREAKER_ERROR_RATE: float = float(os.getenv("CIRCUIT_BREAKER_ERROR_RATE", "0.5"))
+    CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_SECONDS", "60"))
+    CIRCUIT_BREAKER_SLOW_CALL_RATE: float = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL_RATE", "0.5"))
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", "30"))
+
+    LLM_CACHE_ENABLED: bool = _env_bool("LLM_CACHE_ENABLED")
+    LLM_CACHE_MEMORY_ENTRIES: int = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "1024"))
+    LLM_CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+    LLM_CACHE_DISK_MAX_MB: int = int(os.getenv("LLM_CACHE_DISK_MAX_MB", "512"))
+    LLM_CACHE_TTL_SECONDS: float = float(os.getenv("LLM_CACHE_TTL_SECONDS", "604800"))
+
+    # JSON object of USD prices per million tokens, e.g.
+    # {"openai/gpt-5.2": {"input": 1.25, "output": 10, "cached_input": 0.125}}
+    LLM_PRICE_TABLE: dict = json.loads(os.getenv("LLM_PRICE_TABLE", "{}"))
+
+    DB_QUERY_INSTRUMENTATION: bool = _env_bool("DB_QUERY_INSTRUMENTATION")
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "100"))
+    DB_REPEATED_QUERY_THRESHOLD: int = int(os.getenv("DB_REPEATED_QUERY_THRESHOLD", "3"))
+
+    # Required in the X-Admin-Token header for every /api/admin endpoint; they are disabled while unset.
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+    LOOP_WATCHDOG_ENABLED: bool = _env_bool("LOOP_WATCHDOG_ENABLED", True)
+    LOOP_WATCHDOG_INTERVAL: float = float(os.getenv("LOOP_WATCHDOG_INTERVAL", "0.1"))
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = float(os.getenv("LOOP_BLOCK_THRESHOLD_SECONDS", "0.5"))
+
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")
+    TRACING_FILE: str = os.getenv("TRACING_FILE", "traces.jsonl")
+    TRACING_OTLP_ENDPOINT: str = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACING_BUFFER_TRACES: int = int(os.getenv("TRACING_BUFFER_TRACES", "2000"))
+
+    # "inline" runs simulations in the API process; "external" leaves them to worker.py processes,
+    # reached through the DB command queue (needs a cross-process PUBSUB_BACKEND).
+    SIMULATION_MODE: str = os.getenv("SIMULATION_MODE", "inline")
+
+    # Run several API workers against one database: rooms are owned through leases and
+    # control commands are routed to the owning worker.
+    SIMULATION_LEASES_ENABLED: bool = _env_bool("SIMULATION_LEASES_ENABLED")
+    WORKER_ID: str = os.getenv("WORKER_ID", "")  # defaults to host:pid:random
+    SIMULATION_LEASE_TTL_SECONDS: float = float(os.getenv("SIMULATION_LEASE_TTL_SECONDS", "15"))
+    SIMULATION_LEASE_HEARTBEAT_SECONDS: float = float(os.getenv("SIMULATION_LEASE_HEARTBEAT_SECONDS", "5"))
+    SIMULATION_COMMAND_POLL_SECONDS: float = float(os.getenv("SIMULATION_COMMAND_POLL_SECONDS", "0.5"))
+    SIMULATION_COMMAND_TIMEOUT_SECONDS: float = float(os.getenv("SIMULATION_COMMAND_TIMEOUT_SECONDS", "10"))
+
+    # How room events reach WebSockets: "memory" (single process) or "redis" (any worker can
+    # serve any room's viewers; needs the redis extra).
+    PUBSUB_BACKEND: str = os.getenv("PUBSUB_BACKEND", "memory")
+    PUBSUB_REDIS_URL: str = os.getenv("PUBSUB_REDIS_URL", "redis://localhost:6379/0")
 
 
 settings = Settings()
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 
 sys.path.insert(0, str(Path(__file__).parent))
 
+from config import settings
 from database import Base, get_db
 from main import app
 
@@ -61,3 +62,11 @@ async def client():
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+async def admin_client(client, monkeypatch):
+    """``client`` sending a valid ``X-Admin-Token``."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "test-admin-token")
+    client.headers["X-Admin-Token"] = "test-admin-token"
+    yield client
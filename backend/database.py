@@ -1,4 +1,7 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import json
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from config import settings
@@ -25,7 +28,50 @@ async def get_db() -> AsyncSession:
             raise
 
 
-async def init_db():
-    async with engine.begin() as conn:
-        from models import agent, message, room, room_agent  # noqa: F401
+def _default_sql(column) -> str | None:
+    """SQL literal for a column's Python-side default, used to backfill rows that predate it."""
+    if column.default is None:
+        return None
+    value = column.default.arg
+    if callable(value):
+        value = value(None)
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int | float):
+        return str(value)
+    if isinstance(value, list | dict):
+        value = json.dumps(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _add_missing_columns(conn, metadata=Base.metadata):
+    """Add columns introduced after a table was created; ``create_all`` never alters existing tables.
+
+    Existing rows get the column's default. A non-null column without one is added as nullable:
+    SQLite can't add a NOT NULL column without a default, and there is nothing to backfill with.
+    """
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {col["name"] for col in inspector.get_columns(table.name)}
+        added = False
+        for column in table.columns:
+            if column.name in present:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}"
+            if not column.nullable and (default := _default_sql(column)) is not None:
+                ddl += f" NOT NULL DEFAULT {default}"
+            conn.exec_driver_sql(ddl)
+            added = True
+        if added:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+
+async def init_db(bind: AsyncEngine = engine):
+    async with bind.begin() as conn:
+        from models import agent, message, room, room_agent, simulation_lease  # noqa: F401
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_add_missing_columns)
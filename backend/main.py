@@ -1,27 +1,68 @@
+import argparse
+import asyncio
+import contextlib
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+import uvicorn
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
-from database import init_db
+from database import engine, init_db
 from routers import (
+    admin_router,
     agents_router,
     messages_router,
+    metrics_router,
+    profiling_router,
     rooms_router,
     simulation_router,
+    usage_router,
     ws_router,
 )
+from services.loop_watchdog import loop_watchdog
+from services.query_stats import query_instrumentation
+from services.simulation_engine import simulation_manager, ws_manager
+from services.simulation_leases import LeaseCoordinator
+from services.tracing import tracer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    if settings.DB_QUERY_INSTRUMENTATION:
+        query_instrumentation.install(engine.sync_engine)
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    await ws_manager.start()
+    background = []
+    background.append(asyncio.create_task(
+        simulation_manager.run_reaper(settings.REAPER_INTERVAL_SECONDS, settings.FINISHED_RUNNER_TTL_SECONDS)
+    ))
+    if tracer.exporter is not None:
+        background.append(asyncio.create_task(tracer.run_exporter()))
+    if settings.SIMULATION_MODE == "external":
+        if ws_manager.backend.local_only:
+            raise RuntimeError("SIMULATION_MODE=external needs a cross-process PUBSUB_BACKEND such as redis")
+        # Only routes commands; worker processes own, renew and take over the leases.
+        simulation_manager.leases = LeaseCoordinator.from_settings()
+        simulation_manager.external = True
+    else:
+        if settings.SIMULATION_LEASES_ENABLED:
+            simulation_manager.leases = LeaseCoordinator.from_settings()
+            background.append(asyncio.create_task(simulation_manager.leases.run(simulation_manager)))
+        await simulation_manager.recover(settings.SIMULATION_RECOVERY)
     yield
+    await simulation_manager.drain(settings.SHUTDOWN_DRAIN_SECONDS)
+    for task in background:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await ws_manager.close()
+    await loop_watchdog.stop()
 
 
 app = FastAPI(title="Agent Nebula", version="1.0.0", lifespan=lifespan)
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[settings.FRONTEND_URL, "http://localhost:3737"],
@@ -30,13 +71,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    with (
+        tracer.span("http.request", new_trace=True, method=request.method, path=request.url.path) as span,
+        query_instrumentation.track(f"{request.method} {request.url.path}") as queries,
+    ):
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if route is not None:
+            span.set_attribute("route", route.path)
+        if queries is not None:
+            # Aggregate per route template rather than per concrete path.
+            if route is not None:
+                queries.label = f"{request.method} {route.path}"
+            span.set_attribute("db.queries", queries.count)
+            span.set_attribute("db.time_ms", round(queries.total_seconds * 1000, 3))
+            response.headers["X-DB-Queries"] = str(queries.count)
+        span.set_attribute("status_code", response.status_code)
+        if response.status_code >= 500:
+            span.status = "error"
+        response.headers["X-Trace-Id"] = span.trace_id
+        return response
+
+
 app.include_router(agents_router)
 app.include_router(rooms_router)
 app.include_router(simulation_router)
 app.include_router(messages_router)
 app.include_router(ws_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
+app.include_router(usage_router)
+app.include_router(profiling_router)
 
 
 @app.get("/api/health")
 async def health():
     return {"status": "ok"}
+
+
+class Server(uvicorn.Server):
+    """uvicorn server that sends WebSocket clients the reconnect hint before shutting down.
+
+    uvicorn closes every WebSocket with 1012 before lifespan shutdown runs, so the lifespan can't send it.
+    """
+
+    async def shutdown(self, sockets=None):
+        await ws_manager.close_all(retry_after_ms=settings.SHUTDOWN_RECONNECT_HINT_MS)
+        await super().shutdown(sockets=sockets)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Agent Nebula API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8484)
+    args = parser.parse_args()
+    Server(uvicorn.Config(app, host=args.host, port=args.port)).run()
@@ -2,5 +2,6 @@ from models.agent import Agent
 from models.message import Message
 from models.room import Room
 from models.room_agent import RoomAgent
+from models.simulation_lease import SimulationCommand, SimulationLease
 
-__all__ = ["Agent", "Room", "RoomAgent", "Message"]
+__all__ = ["Agent", "Room", "RoomAgent", "Message", "SimulationLease", "SimulationCommand"]
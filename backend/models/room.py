@@ -1,7 +1,7 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
@@ -16,6 +16,11 @@ class Room(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="idle")
     current_turn_index: Mapped[int] = mapped_column(Integer, default=0)
     max_turns: Mapped[int] = mapped_column(Integer, default=20)
+    coalesce_llm_requests: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    llm_timeout_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    hedge_llm_requests: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    turn_mode: Mapped[str] = mapped_column(String(20), nullable=False, default="sequential")
+    round_order: Mapped[str] = mapped_column(String(20), nullable=False, default="turn")
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC)
     )
@@ -1,10 +1,15 @@
+from routers.admin import router as admin_router
 from routers.agents import router as agents_router
 from routers.messages import router as messages_router
+from routers.metrics import router as metrics_router
+from routers.profiling import router as profiling_router
 from routers.rooms import router as rooms_router
 from routers.simulation import router as simulation_router
+from routers.usage import router as usage_router
 from routers.ws import router as ws_router
 
 __all__ = [
     "agents_router", "rooms_router", "simulation_router",
-    "messages_router", "ws_router",
+    "messages_router", "ws_router", "admin_router", "metrics_router", "usage_router",
+    "profiling_router",
 ]
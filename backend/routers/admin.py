@@ -0,0 +1,117 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from auth import require_admin_token
+from schemas.simulation import BulkSimulationAction
+from services.circuit_breaker import circuit_breakers
+from services.llm_cache import llm_cache
+from services.loop_watchdog import loop_watchdog
+from services.query_stats import query_instrumentation
+from services.simulation_engine import simulation_manager
+from services.singleflight import llm_singleflight
+from services.tracing import tracer
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/llm-cache")
+async def get_llm_cache_stats():
+    return llm_cache.stats()
+
+
+@router.delete("/llm-cache", status_code=204)
+async def clear_llm_cache():
+    await llm_cache.clear()
+
+
+@router.get("/llm-coalescing")
+async def get_llm_coalescing_stats():
+    return llm_singleflight.stats()
+
+
+@router.get("/circuit-breakers")
+async def list_circuit_breakers():
+    return circuit_breakers.snapshot()
+
+
+@router.post("/circuit-breakers/{name:path}/reset")
+async def reset_circuit_breaker(name: str):
+    breaker = circuit_breakers.breakers.get(name)
+    if not breaker:
+        raise HTTPException(404, "Circuit breaker not found")
+    breaker.reset()
+    return breaker.snapshot()
+
+
+@router.get("/traces")
+async def list_traces(
+    name: str | None = Query(None, description="Root span name, e.g. simulation.turn or http.request"),
+    room_id: str | None = None,
+    min_duration_ms: float = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Buffered traces, slowest first."""
+    roots = tracer.recent_traces(name, min_duration_ms, limit=None if room_id else limit)
+    if room_id:
+        roots = [s for s in roots if s.attributes.get("room_id") == room_id][:limit]
+    return [s.to_dict() for s in roots]
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    spans = tracer.get_trace(trace_id)
+    if not spans:
+        raise HTTPException(404, "Trace not found (it may have been evicted from the buffer)")
+    return {"trace_id": trace_id, "spans": [s.to_dict() for s in spans]}
+
+
+@router.get("/queries")
+async def get_query_stats(
+    order_by: Literal["avg_queries", "max_queries", "avg_db_ms", "flagged_requests"] = "avg_queries",
+    limit: int = Query(50, ge=1, le=500),
+):
+    """Per-route SQL query counts and time, with repeated statements (requires DB_QUERY_INSTRUMENTATION)."""
+    return {"enabled": query_instrumentation.enabled, "routes": query_instrumentation.summary(order_by, limit)}
+
+
+@router.delete("/queries", status_code=204)
+async def reset_query_stats():
+    query_instrumentation.reset()
+
+
+@router.get("/simulations")
+async def list_live_simulations():
+    """Every live simulation runner with its turn rate, LLM/DB time, queue depth, viewers and cache size."""
+    return simulation_manager.snapshot()
+
+
+@router.get("/simulations/queue")
+async def get_simulation_queue():
+    """Starts waiting for a slot under MAX_CONCURRENT_SIMULATIONS, in admission order."""
+    return simulation_manager.queue_snapshot()
+
+
+@router.post("/simulations/bulk")
+async def bulk_simulation_action(data: BulkSimulationAction):
+    results = await simulation_manager.bulk(data.action, data.room_ids)
+    return {
+        "action": data.action,
+        "succeeded": [room_id for room_id, ok in results.items() if ok],
+        "failed": [room_id for room_id, ok in results.items() if not ok],
+    }
+
+
+@router.get("/leases")
+async def list_simulation_leases():
+    """Room ownership across workers; empty unless SIMULATION_LEASES_ENABLED is set."""
+    leases = simulation_manager.leases
+    if leases is None:
+        return {"enabled": False, "worker_id": None, "leases": []}
+    return {"enabled": True, "worker_id": leases.worker_id, "leases": await leases.leases()}
+
+
+@router.get("/event-loop")
+async def get_event_loop_stats(include_stacks: bool = True):
+    """Loop lag percentiles and the most recent blocking events with the stack captured mid-block."""
+    return loop_watchdog.snapshot(include_stacks)
@@ -28,6 +28,14 @@ async def get_messages(
                 turn_number=m.turn_number,
                 created_at=m.created_at,
                 agent_name=m.agent.name if m.agent else None,
+                trace_id=m.trace_id,
+                run_id=m.run_id,
+                model_used=m.model_used,
+                finish_reason=m.finish_reason,
+                input_tokens=m.input_tokens,
+                output_tokens=m.output_tokens,
+                cached_tokens=m.cached_tokens,
+                latency_ms=m.latency_ms,
             )
             for m in messages
         ],
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from datetime import UTC, datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from auth import require_admin_token
+from services.profiler import ProfilerBusyError, cpu_profiler, memory_profiler
+
+router = APIRouter(prefix="/api/admin/profile", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+
+def _download(body: str, name: str) -> PlainTextResponse:
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+    return PlainTextResponse(body, headers={"Content-Disposition": f'attachment; filename="{name}-{stamp}.txt"'})
+
+
+@router.post("/cpu")
+async def profile_cpu(
+    seconds: float = Query(10, gt=0, le=300),
+    interval_ms: float = Query(10, ge=1, le=1000),
+    thread: Literal["all", "loop"] = "all",
+    include_lines: bool = False,
+):
+    """Sample stacks for ``seconds`` and download them in folded format (flamegraph.pl / speedscope)."""
+    thread_id = threading.get_ident() if thread == "loop" else None
+    try:
+        folded, info = await cpu_profiler.profile(seconds, interval_ms / 1000, thread_id, include_lines)
+    except ProfilerBusyError as e:
+        raise HTTPException(409, str(e)) from e
+    response = _download(folded, "cpu-profile")
+    response.headers["X-Profile-Samples"] = str(info["samples"])
+    return response
+
+
+@router.get("/memory")
+async def memory_status():
+    return memory_profiler.status()
+
+
+@router.post("/memory/start")
+async def start_memory_tracing(frames: int = Query(25, ge=1, le=100)):
+    memory_profiler.start(frames)
+    return memory_profiler.status()
+
+
+@router.post("/memory/stop")
+async def stop_memory_tracing():
+    """Stop tracemalloc and drop stored snapshots, removing its allocation overhead."""
+    memory_profiler.stop()
+    return memory_profiler.status()
+
+
+@router.post("/memory/snapshots", status_code=201)
+async def take_memory_snapshot():
+    try:
+        snapshot_id = await asyncio.to_thread(memory_profiler.take_snapshot)
+    except RuntimeError as e:
+        raise HTTPException(400, str(e)) from e
+    return {"id": snapshot_id}
+
+
+@router.get("/memory/snapshots/{snapshot_id}")
+async def download_memory_snapshot(
+    snapshot_id: str, group_by: GroupBy = "lineno", limit: int = Query(50, ge=1, le=1000),
+):
+    snapshot = memory_profiler.get(snapshot_id)
+    if snapshot is None:
+        raise HTTPException(404, "Snapshot not found")
+    body = await asyncio.to_thread(memory_profiler.top, snapshot, group_by, limit)
+    return _download(body, f"memory-snapshot-{snapshot_id}")
+
+
+@router.get("/memory/diff")
+async def download_memory_diff(
+    base: str, target: str, group_by: GroupBy = "lineno", limit: int = Query(50, ge=1, le=1000),
+):
+    base_snapshot, target_snapshot = memory_profiler.get(base), memory_profiler.get(target)
+    if base_snapshot is None or target_snapshot is None:
+        raise HTTPException(404, "Snapshot not found")
+    body = await asyncio.to_thread(memory_profiler.diff, base_snapshot, target_snapshot, group_by, limit)
+    return _download(body, f"memory-diff-{base}-{target}")
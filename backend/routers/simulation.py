@@ -1,26 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from schemas.simulation import InjectMessage, SimulationStatus
 from services.room_service import RoomService
 from services.simulation_engine import simulation_manager
+from services.simulation_leases import WorkerUnavailableError
 
 router = APIRouter(prefix="/api/simulation", tags=["simulation"])
 
 
 @router.post("/{room_id}/start")
-async def start_simulation(room_id: str, db: AsyncSession = Depends(get_db)):
+async def start_simulation(
+    room_id: str,
+    priority: int = Query(0, description="Higher priorities leave the start queue first"),
+    resume: bool = Query(False, description="Continue from the persisted turn instead of turn 0"),
+    db: AsyncSession = Depends(get_db),
+):
     service = RoomService(db)
     room = await service.get_room(room_id)
     if not room:
         raise HTTPException(404, "Room not found")
     if not room.agents:
         raise HTTPException(400, "Room has no agents assigned")
-    started = await simulation_manager.start(room_id)
-    if not started:
+    if simulation_manager.draining:
+        raise HTTPException(503, "Server is shutting down; retry shortly")
+    if resume and room.current_turn_index >= room.max_turns:
+        raise HTTPException(400, "Simulation already reached max_turns")
+    try:
+        admitted = await simulation_manager.admit(room_id, reset=not resume, priority=priority)
+    except WorkerUnavailableError:
+        raise HTTPException(503, "No simulation worker responded; retry shortly") from None
+    if admitted is None:
         raise HTTPException(400, "Simulation already running")
-    return {"status": "started"}
+    return admitted
 
 
 @router.post("/{room_id}/pause")
@@ -46,20 +59,49 @@ async def stop_simulation(room_id: str):
 
 @router.post("/{room_id}/inject")
 async def inject_message(room_id: str, data: InjectMessage):
-    if not await simulation_manager.inject(room_id, data.content):
+    if not await simulation_manager.inject(room_id, data.content, interrupt=data.mode == "interrupt"):
         raise HTTPException(400, "Cannot inject message (simulation not running)")
     return {"status": "injected"}
 
 
+MAX_BATCH_STATUS = 200
+
+
+async def _statuses(room_ids: list[str], db: AsyncSession) -> dict[str, dict]:
+    """Live runners answer from memory; only the remaining rooms hit the DB, in one narrow query."""
+    statuses = {}
+    missing = []
+    for room_id in room_ids:
+        live = simulation_manager.live_status(room_id)
+        if live:
+            statuses[room_id] = live
+        else:
+            missing.append(room_id)
+    if missing:
+        rows = await RoomService(db).get_statuses(missing)
+        queued = [row["room_id"] for row in rows if row["status"] == "queued"]
+        positions = await simulation_manager.queue_positions(queued) if queued else {}
+        for row in rows:
+            row["queue_position"] = positions.get(row["room_id"])
+            statuses[row["room_id"]] = row
+    return statuses
+
+
+@router.get("/status", response_model=list[SimulationStatus])
+async def get_statuses(
+    room_ids: list[str] = Query(..., description="Repeat the parameter or pass a comma-separated list"),
+    db: AsyncSession = Depends(get_db),
+):
+    ids = list(dict.fromkeys(i for value in room_ids for i in value.split(",") if i))
+    if len(ids) > MAX_BATCH_STATUS:
+        raise HTTPException(400, f"At most {MAX_BATCH_STATUS} rooms per request")
+    statuses = await _statuses(ids, db)
+    return [statuses[room_id] for room_id in ids if room_id in statuses]
+
+
 @router.get("/{room_id}/status", response_model=SimulationStatus)
 async def get_status(room_id: str, db: AsyncSession = Depends(get_db)):
-    service = RoomService(db)
-    room = await service.get_room(room_id)
-    if not room:
+    status = (await _statuses([room_id], db)).get(room_id)
+    if not status:
         raise HTTPException(404, "Room not found")
-    return SimulationStatus(
-        room_id=room.id,
-        status=room.status,
-        current_turn_index=room.current_turn_index,
-        max_turns=room.max_turns,
-    )
+    return status
@@ -0,0 +1,50 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import get_db
+from schemas.usage import UsageSummary
+from services.usage_service import UsageService
+
+router = APIRouter(prefix="/api/usage", tags=["usage"])
+
+OrderBy = Literal["tokens", "cost", "latency"]
+
+
+@router.get("/agents", response_model=list[UsageSummary])
+async def usage_by_agent(
+    room_id: str | None = None,
+    order_by: OrderBy = "tokens",
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    service = UsageService(db)
+    return await service.by_agent(room_id, order_by, limit)
+
+
+@router.get("/rooms", response_model=list[UsageSummary])
+async def usage_by_room(
+    order_by: OrderBy = "tokens",
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    service = UsageService(db)
+    return await service.by_room(order_by, limit)
+
+
+@router.get("/runs", response_model=list[UsageSummary])
+async def usage_by_run(
+    room_id: str | None = None,
+    order_by: OrderBy = "tokens",
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    service = UsageService(db)
+    return await service.by_run(room_id, order_by, limit)
+
+
+@router.get("/prices")
+async def get_price_table():
+    return settings.LLM_PRICE_TABLE
@@ -1,11 +1,13 @@
 from schemas.agent import AgentCreate, AgentResponse, AgentUpdate
 from schemas.message import MessageResponse
 from schemas.room import RoomAgentAdd, RoomAgentReorder, RoomCreate, RoomResponse, RoomUpdate
-from schemas.simulation import InjectMessage, SimulationStatus
+from schemas.simulation import BulkSimulationAction, InjectMessage, SimulationStatus
+from schemas.usage import UsageSummary
 
 __all__ = [
     "AgentCreate", "AgentUpdate", "AgentResponse",
     "RoomCreate", "RoomUpdate", "RoomResponse", "RoomAgentAdd", "RoomAgentReorder",
     "MessageResponse",
-    "SimulationStatus", "InjectMessage",
+    "SimulationStatus", "InjectMessage", "BulkSimulationAction",
+    "UsageSummary",
 ]
@@ -1,18 +1,22 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AgentCreate(BaseModel):
     name: str
     system_prompt: str
     model: str
+    llm_timeout_seconds: float | None = Field(default=None, gt=0)
+    fallback_models: list[str] = []
 
 
 class AgentUpdate(BaseModel):
     name: str | None = None
     system_prompt: str | None = None
     model: str | None = None
+    llm_timeout_seconds: float | None = Field(default=None, gt=0)
+    fallback_models: list[str] | None = None
 
 
 class AgentResponse(BaseModel):
@@ -20,6 +24,8 @@ class AgentResponse(BaseModel):
     name: str
     system_prompt: str
     model: str
+    llm_timeout_seconds: float | None = None
+    fallback_models: list[str] = []
     created_at: datetime
 
     model_config = {"from_attributes": True}
@@ -12,5 +12,13 @@ class MessageResponse(BaseModel):
     turn_number: int
     created_at: datetime
     agent_name: str | None = None
+    trace_id: str | None = None
+    run_id: str | None = None
+    model_used: str | None = None
+    finish_reason: str | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    latency_ms: float | None = None
 
     model_config = {"from_attributes": True}
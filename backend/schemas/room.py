@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from schemas.agent import AgentResponse
 
@@ -9,12 +10,22 @@ class RoomCreate(BaseModel):
     name: str
     description: str = ""
     max_turns: int = 20
+    coalesce_llm_requests: bool = True
+    llm_timeout_seconds: float | None = Field(default=None, gt=0)
+    hedge_llm_requests: bool = False
+    turn_mode: Literal["sequential", "parallel"] = "sequential"
+    round_order: Literal["turn", "completion"] = "turn"
 
 
 class RoomUpdate(BaseModel):
     name: str | None = None
     description: str | None = None
     max_turns: int | None = None
+    coalesce_llm_requests: bool | None = None
+    llm_timeout_seconds: float | None = Field(default=None, gt=0)
+    hedge_llm_requests: bool | None = None
+    turn_mode: Literal["sequential", "parallel"] | None = None
+    round_order: Literal["turn", "completion"] | None = None
 
 
 class RoomAgentInfo(BaseModel):
@@ -32,6 +43,11 @@ class RoomResponse(BaseModel):
     status: str
     current_turn_index: int
     max_turns: int
+    coalesce_llm_requests: bool = True
+    llm_timeout_seconds: float | None = None
+    hedge_llm_requests: bool = False
+    turn_mode: str = "sequential"
+    round_order: str = "turn"
     created_at: datetime
     agents: list[RoomAgentInfo] = []
 
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import Literal
+
+from pydantic import BaseModel, Field
 
 
 class SimulationStatus(BaseModel):
@@ -6,7 +8,17 @@ class SimulationStatus(BaseModel):
     status: str
     current_turn_index: int
     max_turns: int
+    queue_position: int | None = None
 
 
 class InjectMessage(BaseModel):
     content: str
+    mode: Literal["queue", "interrupt"] = Field(
+        default="queue",
+        description="queue: picked up by the next turn; interrupt: saved now and the in-flight reply is regenerated",
+    )
+
+
+class BulkSimulationAction(BaseModel):
+    action: Literal["pause", "resume", "stop"]
+    room_ids: list[str] | None = Field(default=None, description="Rooms to act on; all live simulations if omitted")
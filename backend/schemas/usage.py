@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class UsageSummary(BaseModel):
+    id: str
+    name: str
+    room_id: str | None = None
+    messages: int
+    models: list[str]
+    input_tokens: int
+    output_tokens: int
+    cached_tokens: int
+    total_tokens: int
+    latency_ms_total: float
+    latency_ms_avg: float
+    cost_usd: float
+    unpriced_messages: int
+    first_message_at: datetime
+    last_message_at: datetime
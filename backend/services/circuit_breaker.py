@@ -0,0 +1,156 @@
+import time
+from collections import deque
+
+from config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when every candidate model for a call has an open circuit."""
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker that trips on error rate or slow-call rate.
+
+    The last ``window`` outcomes are kept. Once at least ``min_calls`` are recorded, the
+    breaker opens if the share of failures or of calls slower than ``slow_call_seconds``
+    reaches its threshold. After ``open_seconds`` it lets a single probe through
+    (half-open): a fast success closes it again, anything else re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        error_rate: float = 0.5,
+        slow_call_seconds: float = 60,
+        slow_call_rate: float = 0.5,
+        open_seconds: float = 30,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.opened_at: float | None = None
+        self.open_reason: str | None = None
+        self.times_opened = 0
+        self._outcomes: deque[tuple[bool, bool]] = deque(maxlen=window)
+        self._probe_in_flight = False
+
+    @classmethod
+    def from_settings(cls, name: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            window=settings.CIRCUIT_BREAKER_WINDOW,
+            min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+            error_rate=settings.CIRCUIT_BREAKER_ERROR_RATE,
+            slow_call_seconds=settings.CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate=settings.CIRCUIT_BREAKER_SLOW_CALL_RATE,
+            open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+        )
+
+    def allow_request(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                return False
+            self.state = HALF_OPEN
+            self._probe_in_flight = False
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self, latency: float):
+        slow = latency >= self.slow_call_seconds
+        if self.state == HALF_OPEN:
+            if slow:
+                self._open("slow probe")
+            else:
+                self._close()
+            return
+        self._record(ok=True, slow=slow)
+
+    def record_failure(self):
+        if self.state == HALF_OPEN:
+            self._open("failed probe")
+            return
+        self._record(ok=False, slow=False)
+
+    def record_ignored(self):
+        """The call ended without saying anything about provider health (e.g. cancelled, bad request)."""
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+
+    def reset(self):
+        self._close()
+
+    def _record(self, ok: bool, slow: bool):
+        self._outcomes.append((ok, slow))
+        if self.state != CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        total = len(self._outcomes)
+        failures = sum(1 for o, _ in self._outcomes if not o)
+        slow_calls = sum(1 for _, s in self._outcomes if s)
+        if failures / total >= self.error_rate:
+            self._open(f"error rate {failures}/{total}")
+        elif slow_calls / total >= self.slow_call_rate:
+            self._open(f"slow calls {slow_calls}/{total}")
+
+    def _open(self, reason: str):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.open_reason = reason
+        self.times_opened += 1
+        self._probe_in_flight = False
+
+    def _close(self):
+        self.state = CLOSED
+        self.opened_at = None
+        self.open_reason = None
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        total = len(self._outcomes)
+        failures = sum(1 for o, _ in self._outcomes if not o)
+        slow_calls = sum(1 for _, s in self._outcomes if s)
+        return {
+            "name": self.name,
+            "provider": self.name.split("/", 1)[0],
+            "state": self.state,
+            "open_reason": self.open_reason,
+            "times_opened": self.times_opened,
+            "seconds_until_probe": (
+                round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 2)
+                if self.state == OPEN else None
+            ),
+            "window_calls": total,
+            "window_failures": failures,
+            "window_slow_calls": slow_calls,
+        }
+
+
+class BreakerRegistry:
+    def __init__(self):
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker.from_settings(name)
+        return breaker
+
+    def snapshot(self) -> list[dict]:
+        return [b.snapshot() for _, b in sorted(self.breakers.items())]
+
+
+circuit_breakers = BreakerRegistry()
@@ -0,0 +1,206 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Two-tier cache for LLM responses: an in-memory LRU in front of an optional on-disk store.
+
+    Entries are keyed on a hash of everything that determines the response (see ``make_key``).
+    The disk tier stores one JSON file per entry; a file's mtime is bumped on every hit so the
+    oldest mtime is the least recently used entry when the size budget forces an eviction.
+    Both tiers honour ``ttl_seconds`` (0 disables expiry).
+
+    Disk I/O runs in worker threads. ``_disk_lock`` serialises them around ``_disk_bytes``; the
+    counters are only touched on the event loop, so the disk helpers return their deltas instead.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        memory_entries: int = 1024,
+        disk_dir: str | Path | None = None,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+        ttl_seconds: float = 0,
+    ):
+        self.enabled = enabled
+        self.memory_entries = memory_entries
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = disk_max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._disk_bytes: int | None = None
+        self._disk_lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0,
+            "memory_evictions": 0, "disk_evictions": 0, "expired": 0,
+        }
+
+    @classmethod
+    def from_settings(cls) -> "LLMResponseCache":
+        return cls(
+            enabled=settings.LLM_CACHE_ENABLED,
+            memory_entries=settings.LLM_CACHE_MEMORY_ENTRIES,
+            disk_dir=settings.LLM_CACHE_DIR or None,
+            disk_max_bytes=settings.LLM_CACHE_DISK_MAX_MB * 1024 * 1024,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+        )
+
+    @staticmethod
+    def make_key(model: str, instructions: str, history: list[dict], generation_settings: dict) -> str:
+        payload = json.dumps(
+            {"model": model, "instructions": instructions, "history": history, "settings": generation_settings},
+            sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> dict | None:
+        if not self.enabled:
+            return None
+        entry = self._memory.get(key)
+        if entry is not None:
+            created_at, value = entry
+            if not self._expired(created_at):
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return value
+            del self._memory[key]
+            self._counters["expired"] += 1
+
+        if self.disk_dir:
+            entry, counts = await asyncio.to_thread(self._disk_read, key)
+            self._count(counts)
+            if entry is not None:
+                self._counters["disk_hits"] += 1
+                self._remember(key, *entry)
+                return entry[1]
+
+        self._counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: dict):
+        if not self.enabled:
+            return
+        created_at = time.time()
+        self._remember(key, created_at, value)
+        self._counters["writes"] += 1
+        if self.disk_dir:
+            try:
+                self._count(await asyncio.to_thread(self._disk_write, key, created_at, value))
+            except OSError as e:
+                logger.warning(f"Failed to write LLM cache entry {key}: {e}")
+
+    async def clear(self):
+        self._memory.clear()
+        if self.disk_dir:
+            await asyncio.to_thread(self._disk_clear)
+
+    def stats(self) -> dict:
+        lookups = self._counters["memory_hits"] + self._counters["disk_hits"] + self._counters["misses"]
+        hits = lookups - self._counters["misses"]
+        return {
+            "enabled": self.enabled,
+            **self._counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_bytes": self._disk_bytes or 0,
+        }
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, value: dict):
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._counters["memory_evictions"] += 1
+
+    def _count(self, counts: dict[str, int]):
+        for name, n in counts.items():
+            self._counters[name] += n
+
+    # Disk tier (runs in a worker thread)
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _disk_read(self, key: str) -> tuple[tuple[float, dict] | None, dict[str, int]]:
+        path = self._path(key)
+        with self._disk_lock:
+            try:
+                entry = json.loads(path.read_text())
+            except (OSError, ValueError):
+                return None, {}
+            if self._expired(entry["created_at"]):
+                self._disk_unlink(path)
+                return None, {"expired": 1}
+            os.utime(path)
+            return (entry["created_at"], entry["value"]), {}
+
+    def _disk_write(self, key: str, created_at: float, value: dict) -> dict[str, int]:
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(p.stat().st_size for p in self.disk_dir.glob("*/*.json"))
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps({"created_at": created_at, "value": value}, ensure_ascii=False)
+            previous = path.stat().st_size if path.exists() else 0
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(data)
+            tmp.replace(path)
+            self._disk_bytes += path.stat().st_size - previous
+            if self._disk_bytes > self.disk_max_bytes:
+                return {"disk_evictions": self._disk_evict()}
+            return {}
+
+    def _disk_evict(self) -> int:
+        entries = []
+        for path in self.disk_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        # Evict down to 90% of the budget so every write past the limit doesn't rescan the directory.
+        target = self.disk_max_bytes * 0.9
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self._disk_unlink(path)
+            total -= size
+            evicted += 1
+        self._disk_bytes = total
+        return evicted
+
+    def _disk_unlink(self, path: Path):
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        if self._disk_bytes is not None:
+            self._disk_bytes -= size
+
+    def _disk_clear(self):
+        with self._disk_lock:
+            if self.disk_dir.exists():
+                for path in self.disk_dir.glob("*/*.json"):
+                    path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+
+llm_cache = LLMResponseCache.from_settings()
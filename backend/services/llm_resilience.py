@@ -0,0 +1,136 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+import openai
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Timeouts, connection failures, rate limits and 5xx responses are worth another attempt."""
+    if isinstance(exc, TimeoutError | ConnectionError | openai.APIConnectionError):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per key (e.g. model), for percentile lookups."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, key: str, seconds: float):
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, key: str, pct: float) -> float | None:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+@dataclass
+class CallPolicy:
+    timeout: float | None = None
+    max_retries: int = 0
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    hedge: bool = False
+    hedge_delay: float = 10.0
+
+
+def default_policy(timeout: float | None = None, hedge: bool = False) -> CallPolicy:
+    return CallPolicy(
+        timeout=timeout or settings.LLM_TIMEOUT_SECONDS or None,
+        max_retries=settings.LLM_MAX_RETRIES,
+        backoff_base=settings.LLM_RETRY_BASE_DELAY,
+        backoff_max=settings.LLM_RETRY_MAX_DELAY,
+        hedge=hedge,
+        hedge_delay=settings.LLM_HEDGE_DEFAULT_DELAY,
+    )
+
+
+llm_latency = LatencyTracker()
+
+
+async def call_with_policy(
+    fn: Callable[[], Awaitable[Any]],
+    policy: CallPolicy,
+    latency_key: str,
+    tracker: LatencyTracker = llm_latency,
+) -> Any:
+    """Run ``fn`` with a per-attempt timeout, jittered retries on retryable errors and optional hedging."""
+    attempt = 0
+    while True:
+        try:
+            if policy.hedge:
+                return await _hedged(fn, policy, latency_key, tracker)
+            return await _timed(fn, policy.timeout, latency_key, tracker)
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, policy.backoff_base, policy.backoff_max)
+            attempt += 1
+            logger.warning(
+                f"LLM call for {latency_key} failed ({type(e).__name__}: {e}); "
+                f"retry {attempt}/{policy.max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+
+async def _timed(fn, timeout: float | None, latency_key: str, tracker: LatencyTracker) -> Any:
+    start = time.perf_counter()
+    async with asyncio.timeout(timeout):
+        result = await fn()
+    tracker.record(latency_key, time.perf_counter() - start)
+    return result
+
+
+async def _hedged(fn, policy: CallPolicy, latency_key: str, tracker: LatencyTracker) -> Any:
+    """Start a second identical request once the first has run past the model's p95 latency.
+
+    Whichever request succeeds first wins and the other is cancelled; if both fail, the
+    last error is raised.
+    """
+    delay = tracker.percentile(latency_key, 95) or policy.hedge_delay
+    primary = asyncio.create_task(_timed(fn, policy.timeout, latency_key, tracker))
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            logger.info(f"Hedging LLM call for {latency_key} after {delay:.2f}s")
+            pending.add(asyncio.create_task(_timed(fn, policy.timeout, latency_key, tracker)))
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
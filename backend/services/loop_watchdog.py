@@ -0,0 +1,162 @@
+"""Event-loop lag monitor with a blocking-call detector.
+
+A heartbeat coroutine wakes every ``interval`` seconds and records how late it was. A daemon
+thread watches the heartbeat: if the loop hasn't ticked for ``block_threshold`` seconds,
+something is running synchronously on it, and the thread grabs the loop thread's Python stack
+(``sys._current_frames``) plus the asyncio task that was executing, while the block is still
+in progress. Once the loop recovers, the heartbeat fills in how long the block lasted.
+"""
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from config import settings
+from services.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG, EVENT_LOOP_LAG_HISTOGRAM
+
+logger = logging.getLogger(__name__)
+
+
+def _describe_task(task: asyncio.Task | None) -> str | None:
+    if task is None:
+        return None
+    coro = task.get_coro()
+    return f"{task.get_name()} ({getattr(coro, '__qualname__', repr(coro))})"
+
+
+class LoopWatchdog:
+    def __init__(self, interval: float = 0.1, block_threshold: float = 0.5, window: int = 3000, max_blocks: int = 50):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.lags: deque[float] = deque(maxlen=window)
+        self.blocks: deque[dict] = deque(maxlen=max_blocks)
+        self.total_blocks = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._last_beat = 0.0
+        self._captured_beat: float | None = None
+        self._pending: dict | None = None
+        self._lock = threading.Lock()
+        self._heartbeat: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    @classmethod
+    def from_settings(cls) -> "LoopWatchdog":
+        return cls(interval=settings.LOOP_WATCHDOG_INTERVAL, block_threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS)
+
+    @property
+    def running(self) -> bool:
+        return self._heartbeat is not None and not self._heartbeat.done()
+
+    def start(self):
+        """Start monitoring the running loop; call from a coroutine on that loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopping.clear()
+        self._heartbeat = self._loop.create_task(self._beat(), name="loop-watchdog-heartbeat")
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        self._stopping.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._heartbeat
+            self._heartbeat = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, 1)
+            self._thread = None
+
+    async def _beat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last_beat = now
+            self._record_lag(max(0.0, now - before - self.interval))
+
+    def _record_lag(self, lag: float):
+        self.lags.append(lag)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            pending["duration_seconds"] = round(lag, 4)
+            logger.warning(f"Event loop was blocked for {lag:.3f}s in {pending['task'] or 'a callback'}")
+
+    def _watch(self):
+        check_every = max(self.interval / 2, 0.01)
+        while not self._stopping.wait(check_every):
+            last_beat = self._last_beat
+            stalled = time.monotonic() - last_beat - self.interval
+            if stalled >= self.block_threshold and self._captured_beat != last_beat:
+                self._captured_beat = last_beat
+                self._capture(stalled, last_beat)
+
+    def _capture(self, stalled: float, beat: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        block = {
+            "detected_at": time.time(),
+            "stalled_seconds_at_capture": round(stalled, 4),
+            "duration_seconds": None,
+            "task": _describe_task(task),
+            "stack": [line.rstrip() for line in stack],
+        }
+        with self._lock:
+            # If the loop already recovered while we were capturing, its lag sample is gone.
+            if self._last_beat == beat:
+                self._pending = block
+        self.blocks.append(block)
+        self.total_blocks += 1
+        EVENT_LOOP_BLOCKS.inc()
+        logger.warning(
+            f"Event loop blocked for {stalled:.3f}s+ in {block['task'] or 'a callback'}:\n{''.join(stack[-8:])}"
+        )
+
+    def percentiles(self) -> dict:
+        if not self.lags:
+            return {"samples": 0}
+        ordered = sorted(self.lags)
+
+        def pct(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 3)
+
+        return {
+            "samples": len(ordered),
+            "p50_ms": pct(50),
+            "p90_ms": pct(90),
+            "p99_ms": pct(99),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        }
+
+    def snapshot(self, include_stacks: bool = True) -> dict:
+        blocks = list(self.blocks)
+        if not include_stacks:
+            blocks = [{k: v for k, v in b.items() if k != "stack"} for b in blocks]
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval,
+            "block_threshold_seconds": self.block_threshold,
+            "lag": self.percentiles(),
+            "total_blocks": self.total_blocks,
+            "recent_blocks": blocks[::-1],
+        }
+
+
+loop_watchdog = LoopWatchdog.from_settings()
@@ -0,0 +1,217 @@
+"""Minimal Prometheus-compatible metrics: counters, gauges and histograms with labels.
+
+Recording a sample is a dict lookup plus a few integer updates, so instrumentation can stay
+on in production. Gauges that describe current state (running simulations, connections,
+queue depth) are filled by collector callbacks right before each scrape instead of being
+maintained on every change.
+"""
+
+import bisect
+import math
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: dict | None = None) -> str:
+    pairs = list(zip(names, values, strict=True)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values, **kwargs):
+        key = tuple(str(v) for v in values) if values else tuple(str(kwargs[n]) for n in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def clear(self):
+        self._children.clear()
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels; use .labels(...) first")
+        return self.labels()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for key, child in sorted(self._children.items()):
+            lines.extend(self._render_child(key, child))
+        return lines
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+    def _render_child(self, key, child):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value: float):
+        self._default().set(value)
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+    def _render_child(self, key, child):
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), child.counts, strict=True):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], None]):
+        """Register a callback that refreshes state gauges right before each scrape."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+registry = MetricsRegistry()
+
+TURN_DURATION = registry.histogram("nebula_turn_duration_seconds", "Wall-clock time of one simulation turn")
+LLM_LATENCY = registry.histogram(
+    "nebula_llm_latency_seconds", "LLM call latency per model, including retries", ("model", "outcome"),
+)
+HISTORY_BUILD = registry.histogram("nebula_history_build_seconds", "Time to build the conversation history for a turn")
+DB_COMMIT = registry.histogram("nebula_db_commit_seconds", "Time spent in simulation DB commits")
+BROADCAST = registry.histogram("nebula_broadcast_seconds", "Time to fan one event out to a room's WebSocket clients")
+SIMULATIONS = registry.gauge("nebula_simulations", "Live simulations by state", ("state",))
+WS_CONNECTIONS = registry.gauge("nebula_websocket_connections", "Open WebSocket connections per room", ("room_id",))
+INJECT_QUEUE_DEPTH = registry.gauge("nebula_inject_queue_depth", "Injected messages waiting per room", ("room_id",))
+RUNNER_MEMORY = registry.gauge(
+    "nebula_runner_memory_bytes", "Approximate memory held by each live simulation runner", ("room_id",),
+)
+LLM_TOKENS = registry.counter(
+    "nebula_llm_tokens_total", "Tokens billed by LLM providers per model", ("model", "kind"),
+)
+LLM_CACHE_EVENTS = registry.counter(
+    "nebula_llm_cache_events_total", "LLM response cache and request coalescing events", ("event",),
+)
+EVENT_LOOP_LAG = registry.gauge("nebula_event_loop_lag_seconds", "Most recent event-loop scheduling lag")
+EVENT_LOOP_LAG_HISTOGRAM = registry.histogram(
+    "nebula_event_loop_lag_histogram_seconds", "Event-loop scheduling lag samples",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+EVENT_LOOP_BLOCKS = registry.counter(
+    "nebula_event_loop_blocks_total", "Times the event loop was blocked longer than the watchdog threshold",
+)
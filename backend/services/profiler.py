@@ -0,0 +1,144 @@
+"""On-demand profilers for a running server: a sampling CPU profiler and tracemalloc snapshots.
+
+Neither costs anything until started. The CPU profiler samples every thread's stack from a
+background thread (``sys._current_frames``) for a bounded time and emits folded stacks, the
+input format of flamegraph.pl / speedscope. Memory profiling wraps ``tracemalloc``, which
+only slows allocations while it is tracing.
+"""
+
+import asyncio
+import itertools
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import UTC, datetime
+
+
+class ProfilerBusyError(Exception):
+    """Raised when a CPU profile is requested while another one is running."""
+
+
+def _folded(frame, include_lines: bool) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        location = f"{code.co_filename}:{frame.f_lineno}" if include_lines else code.co_filename
+        parts.append(f"{code.co_qualname} ({location})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class SamplingProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.running = False
+
+    async def profile(
+        self, seconds: float, interval: float = 0.01, thread_id: int | None = None, include_lines: bool = False,
+    ) -> tuple[str, dict]:
+        """Sample for ``seconds`` without blocking the event loop; return folded stacks and run info."""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A CPU profile is already running")
+        try:
+            self.running = True
+            return await asyncio.to_thread(self._sample, seconds, interval, thread_id, include_lines)
+        finally:
+            self.running = False
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float, thread_id: int | None, include_lines: bool):
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        stacks: Counter[str] = Counter()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while time.perf_counter() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident == me or (thread_id is not None and ident != thread_id):
+                    continue
+                thread = names.get(ident, str(ident))
+                stacks[f"{thread};{_folded(frame, include_lines)}"] += 1
+            samples += 1
+            time.sleep(interval)
+        folded = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        info = {
+            "duration_seconds": round(time.perf_counter() - started, 3),
+            "samples": samples,
+            "unique_stacks": len(stacks),
+        }
+        return folded + "\n", info
+
+
+class MemoryProfiler:
+    """tracemalloc start/stop plus a small set of named snapshots for diffing."""
+
+    def __init__(self, max_snapshots: int = 10):
+        self.max_snapshots = max_snapshots
+        self.snapshots: dict[str, tuple[datetime, tracemalloc.Snapshot]] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 25):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        tracemalloc.stop()
+        self.snapshots.clear()
+
+    def take_snapshot(self) -> str:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running; start it first")
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        snapshot_id = str(next(self._ids))
+        self.snapshots[snapshot_id] = (datetime.now(UTC), snapshot)
+        while len(self.snapshots) > self.max_snapshots:
+            del self.snapshots[next(iter(self.snapshots))]
+        return snapshot_id
+
+    def get(self, snapshot_id: str) -> tracemalloc.Snapshot | None:
+        entry = self.snapshots.get(snapshot_id)
+        return entry[1] if entry else None
+
+    def status(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory() if self.tracing else (0, 0)
+        return {
+            "tracing": self.tracing,
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "snapshots": [
+                {"id": sid, "taken_at": taken_at.isoformat(), "traces": len(snap.traces)}
+                for sid, (taken_at, snap) in self.snapshots.items()
+            ],
+        }
+
+    @staticmethod
+    def top(snapshot: tracemalloc.Snapshot, group_by: str = "lineno", limit: int = 50) -> str:
+        stats = snapshot.statistics(group_by)
+        lines = [f"Top {min(limit, len(stats))} of {len(stats)} allocation sites by size ({group_by})", ""]
+        for stat in stats[:limit]:
+            lines.append(str(stat))
+            if group_by == "traceback":
+                lines.extend(f"    {line}" for line in stat.traceback.format())
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def diff(base: tracemalloc.Snapshot, target: tracemalloc.Snapshot, group_by: str = "lineno", limit: int = 50) -> str:
+        stats = target.compare_to(base, group_by)
+        growth = sum(s.size_diff for s in stats)
+        lines = [f"Net change {growth:+,} bytes; top {min(limit, len(stats))} of {len(stats)} sites by growth", ""]
+        lines.extend(str(stat) for stat in stats[:limit])
+        return "\n".join(lines) + "\n"
+
+
+cpu_profiler = SamplingProfiler()
+memory_profiler = MemoryProfiler()
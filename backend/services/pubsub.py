@@ -0,0 +1,110 @@
+"""Pub/sub transports for room events, so a WebSocket can be served by any process.
+
+``ConnectionManager.broadcast`` publishes each event once; every process subscribed to the
+room delivers it to its own sockets. The in-process backend delivers directly (one process,
+the default). The Redis backend lets the API run behind a load balancer with viewers and
+runners in different processes; it needs the optional ``redis`` package.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, str], Awaitable[None]]
+
+
+class InProcessPubSub:
+    """Publishing delivers straight to this process's sockets."""
+
+    name = "memory"
+    local_only = True
+
+    def __init__(self, deliver: Deliver):
+        self.deliver = deliver
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def subscribe(self, room_id: str):
+        pass
+
+    async def unsubscribe(self, room_id: str):
+        pass
+
+    async def publish(self, room_id: str, message: str):
+        await self.deliver(room_id, message)
+
+
+class RedisPubSub:
+    """One Redis channel per room; a process subscribes while it has viewers for that room."""
+
+    name = "redis"
+    local_only = False
+
+    def __init__(self, deliver: Deliver, url: str, prefix: str = "nebula:room:"):
+        self.deliver = deliver
+        self.url = url
+        self.prefix = prefix
+        self.client = None
+        self.pubsub = None
+        self._reader: asyncio.Task | None = None
+
+    async def start(self):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("PUBSUB_BACKEND=redis requires the redis package (pip install 'redis>=5')") from e
+        self.client = redis.from_url(self.url)
+        self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._reader = asyncio.create_task(self._read(), name="pubsub-reader")
+
+    async def close(self):
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        if self.pubsub is not None:
+            await self.pubsub.aclose()
+        if self.client is not None:
+            await self.client.aclose()
+
+    async def subscribe(self, room_id: str):
+        await self.pubsub.subscribe(self.prefix + room_id)
+
+    async def unsubscribe(self, room_id: str):
+        await self.pubsub.unsubscribe(self.prefix + room_id)
+
+    async def publish(self, room_id: str, message: str):
+        await self.client.publish(self.prefix + room_id, message)
+
+    async def _read(self):
+        while True:
+            try:
+                if not self.pubsub.subscribed:
+                    await asyncio.sleep(0.05)
+                    continue
+                message = await self.pubsub.get_message(timeout=1.0)
+                if message is None or message["type"] != "message":
+                    continue
+                channel = message["channel"].decode()
+                data = message["data"]
+                await self.deliver(channel[len(self.prefix):], data.decode() if isinstance(data, bytes) else data)
+            except Exception:
+                logger.exception("Pub/sub reader failed; retrying")
+                await asyncio.sleep(1)
+
+
+def pubsub_from_settings(deliver: Deliver):
+    backend = settings.PUBSUB_BACKEND
+    if backend == "memory":
+        return InProcessPubSub(deliver)
+    if backend == "redis":
+        return RedisPubSub(deliver, settings.PUBSUB_REDIS_URL)
+    raise ValueError(f"Unknown PUBSUB_BACKEND {backend!r}; expected 'memory' or 'redis'")
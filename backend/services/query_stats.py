@@ -0,0 +1,158 @@
+"""Opt-in SQL instrumentation: per-request query counts and time, slow-query logs and N+1 detection.
+
+Engine events fire inside SQLAlchemy's greenlet, which runs in the calling task's context, so
+the ``QueryStats`` bound with :func:`track` in a request (or a simulation turn) sees every
+statement issued on its behalf.
+"""
+
+import contextlib
+import contextvars
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    label: str
+    count: int = 0
+    total_seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    exact: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, parameters, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.statements[statement] += 1
+        self.exact[(statement, repr(parameters))] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements issued at least ``threshold`` times (typically an N+1 loop)."""
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+    def duplicates(self) -> int:
+        """Queries that repeated an earlier statement with identical parameters."""
+        return sum(n - 1 for n in self.exact.values() if n > 1)
+
+
+@dataclass
+class RouteSummary:
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    db_seconds: float = 0.0
+    flagged_requests: int = 0
+    duplicate_queries: int = 0
+    repeated_statements: Counter = field(default_factory=Counter)
+
+    def to_dict(self, route: str) -> dict:
+        return {
+            "route": route,
+            "requests": self.requests,
+            "avg_queries": round(self.queries / self.requests, 2),
+            "max_queries": self.max_queries,
+            "avg_db_ms": round(self.db_seconds / self.requests * 1000, 3),
+            "flagged_requests": self.flagged_requests,
+            "duplicate_queries": self.duplicate_queries,
+            "repeated_statements": [
+                {"statement": s, "occurrences": n} for s, n in self.repeated_statements.most_common(5)
+            ],
+        }
+
+
+_current: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar("query_stats", default=None)
+
+
+class QueryInstrumentation:
+    def __init__(self, slow_query_ms: float = 100, repeat_threshold: int = 3):
+        self.slow_query_ms = slow_query_ms
+        self.repeat_threshold = repeat_threshold
+        self.enabled = False
+        self.routes: dict[str, RouteSummary] = {}
+
+    @classmethod
+    def from_settings(cls) -> "QueryInstrumentation":
+        return cls(slow_query_ms=settings.DB_SLOW_QUERY_MS, repeat_threshold=settings.DB_REPEATED_QUERY_THRESHOLD)
+
+    def install(self, sync_engine):
+        """Attach cursor listeners to an engine (``AsyncEngine.sync_engine`` for async engines)."""
+        if not event.contains(sync_engine, "before_cursor_execute", self._before):
+            event.listen(sync_engine, "before_cursor_execute", self._before)
+            event.listen(sync_engine, "after_cursor_execute", self._after)
+        self.enabled = True
+
+    def uninstall(self, sync_engine):
+        if event.contains(sync_engine, "before_cursor_execute", self._before):
+            event.remove(sync_engine, "before_cursor_execute", self._before)
+            event.remove(sync_engine, "after_cursor_execute", self._after)
+        self.enabled = False
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, parameters, elapsed)
+        if elapsed * 1000 >= self.slow_query_ms:
+            where = f" during {stats.label}" if stats else ""
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f}ms){where}: {statement} -- params: {repr(parameters)[:500]}"
+            )
+
+    @contextlib.contextmanager
+    def track(self, label: str):
+        """Collect stats for every query issued in this context; yields ``None`` when disabled."""
+        if not self.enabled:
+            yield None
+            return
+        stats = QueryStats(label)
+        token = _current.set(stats)
+        try:
+            yield stats
+        finally:
+            _current.reset(token)
+            self._report(stats)
+
+    def _report(self, stats: QueryStats):
+        if not stats.count:
+            return
+        repeated = stats.repeated(self.repeat_threshold)
+        duplicates = stats.duplicates()
+        if repeated:
+            statement, count = repeated[0]
+            logger.warning(
+                f"{stats.label} ran {stats.count} queries ({duplicates} exact duplicates); "
+                f"possible N+1: {count}x {' '.join(statement.split())[:200]}"
+            )
+        summary = self.routes.get(stats.label)
+        if summary is None:
+            summary = self.routes[stats.label] = RouteSummary()
+        summary.requests += 1
+        summary.queries += stats.count
+        summary.max_queries = max(summary.max_queries, stats.count)
+        summary.db_seconds += stats.total_seconds
+        summary.duplicate_queries += duplicates
+        if repeated:
+            summary.flagged_requests += 1
+            for statement, count in repeated:
+                summary.repeated_statements[" ".join(statement.split())] += count
+
+    def summary(self, order_by: str = "avg_queries", limit: int = 50) -> list[dict]:
+        rows = [s.to_dict(route) for route, s in self.routes.items()]
+        rows.sort(key=lambda r: r[order_by], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        self.routes.clear()
+
+
+query_instrumentation = QueryInstrumentation.from_settings()
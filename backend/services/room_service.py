@@ -28,6 +28,16 @@ class RoomService:
         )
         return result.scalar_one_or_none()
 
+    async def get_statuses(self, room_ids: list[str]) -> list[dict]:
+        """Status columns only, for rooms without a live runner; no agents are loaded."""
+        result = await self.db.execute(
+            select(Room.id, Room.status, Room.current_turn_index, Room.max_turns).where(Room.id.in_(room_ids))
+        )
+        return [
+            {"room_id": room_id, "status": status, "current_turn_index": turn, "max_turns": max_turns}
+            for room_id, status, turn, max_turns in result.all()
+        ]
+
     async def create_room(self, data: RoomCreate) -> Room:
         room = Room(**data.model_dump())
         self.db.add(room)
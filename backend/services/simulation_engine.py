@@ -1,51 +1,305 @@
 import asyncio
+import bisect
 import contextlib
+import contextvars
+import itertools
 import json
 import logging
+import sys
+import time
+import uuid
+from collections import deque
+from dataclasses import asdict, dataclass, field, replace
 
 from agents import Agent, Runner
 from agents.extensions.models.litellm_model import LitellmModel
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 
+from config import settings
 from database import async_session
+from models.agent import Agent as AgentModel
 from models.message import Message
 from models.room import Room
 from models.room_agent import RoomAgent
+from services.circuit_breaker import CircuitOpenError, circuit_breakers
+from services.llm_cache import llm_cache
+from services.llm_resilience import call_with_policy, default_policy, is_retryable
+from services.metrics import (
+    BROADCAST,
+    DB_COMMIT,
+    HISTORY_BUILD,
+    INJECT_QUEUE_DEPTH,
+    LLM_CACHE_EVENTS,
+    LLM_LATENCY,
+    LLM_TOKENS,
+    RUNNER_MEMORY,
+    SIMULATIONS,
+    TURN_DURATION,
+    WS_CONNECTIONS,
+    registry,
+)
+from services.pubsub import InProcessPubSub, pubsub_from_settings
+from services.query_stats import query_instrumentation
+from services.simulation_leases import ANY_WORKER, LeaseCoordinator, WorkerUnavailableError
+from services.singleflight import llm_singleflight
+from services.tracing import current_span, tracer
 
 logger = logging.getLogger(__name__)
 
+# Everything besides model, instructions and input that shapes a response; part of the cache key.
+GENERATION_SETTINGS = {"max_turns": 1}
+
+
+def _litellm_model_name(model: str) -> str:
+    return model[len("litellm/"):] if model.startswith("litellm/") else model
+
+
+@dataclass
+class LLMResult:
+    """A model response plus the usage data persisted with its ``Message``."""
+
+    text: str
+    model_used: str | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    finish_reason: str | None = None
+
+    def to_cache(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_cache(cls, value) -> "LLMResult":
+        """A cached response costs no tokens; entries written before usage tracking are plain strings."""
+        if isinstance(value, str):
+            return cls(text=value)
+        return replace(cls(**value), input_tokens=0, output_tokens=0, cached_tokens=0)
+
+
+def _finish_reason(run_result) -> str | None:
+    """Approximate the provider finish reason from the last response's output items.
+
+    The Agents SDK converts chat completions into Responses-style items and drops
+    ``finish_reason``; a truncated message comes back with status ``incomplete``.
+    """
+    if not run_result.raw_responses:
+        return None
+    output = run_result.raw_responses[-1].output
+    if not output:
+        return "empty"
+    if any(getattr(item, "type", None) == "function_call" for item in output):
+        return "tool_calls"
+    if any(getattr(item, "status", None) == "incomplete" for item in output):
+        return "length"
+    return "stop"
+
 
 class ConnectionManager:
+    """Tracks this process's WebSockets per room; events go through a pub/sub backend."""
+
     def __init__(self):
         self.rooms: dict[str, list] = {}
+        self.backend = InProcessPubSub(self._deliver)
+        self._subscribed: set[str] = set()
+        self._pending: set[asyncio.Task] = set()
+        self.empty_since: dict[str, float] = {}
+
+    async def start(self):
+        """Switch to the configured pub/sub backend; call once the event loop is running."""
+        if self.backend.name != settings.PUBSUB_BACKEND:
+            self.backend = pubsub_from_settings(self._deliver)
+        await self.backend.start()
+
+    async def close(self):
+        await self.backend.close()
+        self._subscribed.clear()
 
     async def connect(self, room_id: str, websocket):
         if room_id not in self.rooms:
             self.rooms[room_id] = []
         self.rooms[room_id].append(websocket)
+        self.empty_since.pop(room_id, None)
+        if room_id not in self._subscribed:
+            self._subscribed.add(room_id)
+            await self.backend.subscribe(room_id)
 
     def disconnect(self, room_id: str, websocket):
         if room_id in self.rooms:
             self.rooms[room_id] = [ws for ws in self.rooms[room_id] if ws != websocket]
+            if not self.rooms[room_id]:
+                self.empty_since.setdefault(room_id, time.monotonic())
+            if not self.rooms[room_id] and room_id in self._subscribed:
+                task = asyncio.get_running_loop().create_task(self._unsubscribe_if_empty(room_id))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+    async def _unsubscribe_if_empty(self, room_id: str):
+        # Re-checked when the task runs: a viewer may have reconnected in the meantime.
+        if not self.rooms.get(room_id) and room_id in self._subscribed:
+            self._subscribed.discard(room_id)
+            await self.backend.unsubscribe(room_id)
+
+    def reap(self, ttl: float) -> int:
+        """Forget rooms that have had no sockets for ``ttl`` seconds."""
+        now = time.monotonic()
+        expired = [room_id for room_id, since in self.empty_since.items() if now - since >= ttl]
+        for room_id in expired:
+            del self.empty_since[room_id]
+            if not self.rooms.get(room_id):
+                self.rooms.pop(room_id, None)
+        return len(expired)
 
     async def broadcast(self, room_id: str, data: dict):
-        if room_id not in self.rooms:
+        if self.backend.local_only and not self.rooms.get(room_id):
+            return  # Nobody to tell, and no other process listening.
+        span = tracer.child_span("ws.broadcast", event=data.get("type"), clients=len(self.rooms.get(room_id, [])))
+        with span:
+            await self.backend.publish(room_id, json.dumps(data, default=str))
+
+    async def close_all(self, retry_after_ms: int = 1000, code: int = 1012, reason: str = "Server restarting"):
+        """Tell this process's clients when to reconnect, then close their sockets (1012 = service restart)."""
+        hint = json.dumps({"type": "reconnect", "retry_after_ms": retry_after_ms})
+        for room_id, sockets in list(self.rooms.items()):
+            for ws in list(sockets):
+                with contextlib.suppress(Exception):
+                    await ws.send_text(hint)
+                    await ws.close(code=code, reason=reason)
+            self.rooms[room_id] = []
+            self.empty_since.setdefault(room_id, time.monotonic())
+
+    async def _deliver(self, room_id: str, message: str):
+        """Send a published event to this process's sockets for the room."""
+        if not self.rooms.get(room_id):
             return
-        dead = []
-        for ws in self.rooms[room_id]:
-            try:
-                await ws.send_text(json.dumps(data, default=str))
-            except Exception as e:
-                logger.warning(f"Failed to broadcast to {room_id}: {e}")
-                dead.append(ws)
-        for ws in dead:
-            self.disconnect(room_id, ws)
+        with BROADCAST.time():
+            dead = []
+            for ws in self.rooms[room_id]:
+                try:
+                    await ws.send_text(message)
+                except Exception as e:
+                    logger.warning(f"Failed to broadcast to {room_id}: {e}")
+                    dead.append(ws)
+            for ws in dead:
+                self.disconnect(room_id, ws)
 
 
 ws_manager = ConnectionManager()
 
 
+@dataclass(frozen=True)
+class AgentConfig:
+    """The parts of an ``Agent`` row a runner needs, detached from any DB session."""
+
+    id: str
+    name: str
+    model: str
+    system_prompt: str
+    llm_timeout_seconds: float | None = None
+    fallback_models: tuple[str, ...] = ()
+
+    @classmethod
+    def from_model(cls, agent: AgentModel) -> "AgentConfig":
+        return cls(
+            id=agent.id,
+            name=agent.name,
+            model=agent.model,
+            system_prompt=agent.system_prompt,
+            llm_timeout_seconds=agent.llm_timeout_seconds,
+            fallback_models=tuple(agent.fallback_models or ()),
+        )
+
+
+@dataclass(frozen=True)
+class RoomConfig:
+    """A room's settings and agents in turn order, read once when a runner starts."""
+
+    name: str
+    current_turn_index: int
+    max_turns: int
+    coalesce_llm_requests: bool = True
+    llm_timeout_seconds: float | None = None
+    hedge_llm_requests: bool = False
+    turn_mode: str = "sequential"
+    round_order: str = "turn"
+    agents: tuple[AgentConfig, ...] = ()
+
+    @classmethod
+    def from_model(cls, room: Room) -> "RoomConfig":
+        return cls(
+            name=room.name,
+            current_turn_index=room.current_turn_index,
+            max_turns=room.max_turns,
+            coalesce_llm_requests=room.coalesce_llm_requests,
+            llm_timeout_seconds=room.llm_timeout_seconds,
+            hedge_llm_requests=room.hedge_llm_requests,
+            turn_mode=room.turn_mode,
+            round_order=room.round_order,
+            agents=tuple(
+                AgentConfig.from_model(ra.agent) for ra in sorted(room.agents, key=lambda ra: ra.turn_order)
+            ),
+        )
+
+
+class HistoryCache:
+    """A room's transcript kept in memory so each turn doesn't re-read every message from the DB.
+
+    Loaded from the DB on a runner's first turn, then appended to as the runner persists
+    messages (it is the only writer to a live room's transcript).
+    """
+
+    # Tuple header plus list slot; string sizes are added per entry.
+    ENTRY_OVERHEAD = 72
+
+    def __init__(self):
+        self.loaded = False
+        self.entries: list[tuple[str | None, str, str]] = []
+        self.size_bytes = 0
+
+    def load(self, entries: list[tuple[str | None, str, str]]):
+        self.entries = []
+        self.size_bytes = 0
+        self.loaded = True
+        for entry in entries:
+            self.append(*entry)
+
+    def append(self, agent_id: str | None, agent_name: str, content: str):
+        if not self.loaded:
+            return
+        self.entries.append((agent_id, agent_name, content))
+        self.size_bytes += self.ENTRY_OVERHEAD + sys.getsizeof(content)
+
+    def build(self, current_agent_id: str) -> list[dict]:
+        """Conversation from ``current_agent_id``'s perspective: its own turns as assistant, others as user."""
+        return [
+            {"role": "assistant", "content": content} if agent_id == current_agent_id
+            else {"role": "user", "content": f"[{name}]: {content}"}
+            for agent_id, name, content in self.entries
+        ]
+
+
+@dataclass
+class RunnerStats:
+    started_at: float = field(default_factory=time.time)
+    turns: int = 0
+    last_turn_seconds: float | None = None
+    llm_seconds: float = 0.0
+    db_seconds: float = 0.0
+    recent_turn_ends: deque = field(default_factory=lambda: deque(maxlen=20))
+
+    def record_turn(self, seconds: float):
+        self.turns += 1
+        self.last_turn_seconds = seconds
+        self.recent_turn_ends.append(time.monotonic())
+
+    def turns_per_minute(self) -> float | None:
+        """Rate over the last few turns, including the delay between them."""
+        if len(self.recent_turn_ends) < 2:
+            return None
+        span = self.recent_turn_ends[-1] - self.recent_turn_ends[0]
+        return (len(self.recent_turn_ends) - 1) / span * 60 if span > 0 else None
+
+
 class SimulationRunner:
     def __init__(self, room_id: str):
         self.room_id = room_id
@@ -53,130 +307,128 @@ class SimulationRunner:
         self.pause_event.set()
         self.inject_queue: asyncio.Queue = asyncio.Queue()
         self.stopped = False
+        self.lease_lost = False
+        self.draining = False
+        self._wake = asyncio.Event()
         self.task: asyncio.Task | None = None
+        self._llm_tasks: set[asyncio.Task] = set()
+        self.coalesce_llm_requests = True
+        self.llm_timeout_seconds: float | None = None
+        self.hedge_llm_requests = False
+        self.run_id = uuid.uuid4().hex
+        self.loaded = False
+        self.room_name: str | None = None
+        self.current_turn_index = 0
+        self.max_turns = 0
+        self.history = HistoryCache()
+        self.stats = RunnerStats()
+        self.finished_at: float | None = None
+
+    @property
+    def active(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    def status(self) -> dict | None:
+        """Status from memory while the runner is live and has loaded its room, else None."""
+        if not self.active or not self.loaded:
+            return None
+        return {
+            "room_id": self.room_id,
+            "status": "paused" if not self.pause_event.is_set() else "running",
+            "current_turn_index": self.current_turn_index,
+            "max_turns": self.max_turns,
+        }
+
+    def snapshot(self) -> dict:
+        """Runtime view of this runner for the admin API."""
+        stats = self.stats
+        rate = stats.turns_per_minute()
+        return {
+            "room_id": self.room_id,
+            "room_name": self.room_name,
+            "run_id": self.run_id,
+            "state": ("paused" if not self.pause_event.is_set() else "running") if self.active else "finished",
+            "current_turn_index": self.current_turn_index,
+            "max_turns": self.max_turns,
+            "uptime_seconds": round(time.time() - stats.started_at, 3),
+            "turns_completed": stats.turns,
+            "turns_per_minute": round(rate, 3) if rate is not None else None,
+            "last_turn_seconds": round(stats.last_turn_seconds, 4) if stats.last_turn_seconds is not None else None,
+            "llm_seconds": round(stats.llm_seconds, 4),
+            "db_seconds": round(stats.db_seconds, 4),
+            "queued_injections": self.inject_queue.qsize(),
+            "viewers": len(ws_manager.rooms.get(self.room_id, [])),
+            "history_messages": len(self.history.entries),
+            "history_cache_bytes": self.history.size_bytes,
+            "memory_bytes": self.memory_bytes(),
+            "finished_at": self.finished_at,
+        }
+
+    def memory_bytes(self) -> int:
+        """Approximate memory this runner holds: its transcript cache plus bookkeeping."""
+        return (
+            self.history.size_bytes
+            + sys.getsizeof(self.history.entries)
+            + sys.getsizeof(self.__dict__)
+            + sys.getsizeof(self.stats.recent_turn_ends)
+        )
 
     async def run(self):
+        # No session is held across turns: each persistence step opens and closes its own, so an
+        # idle or LLM-bound room doesn't pin a pooled connection.
         try:
-            async with async_session() as db:
-                room = await self._load_room(db)
-                if not room:
-                    return
+            config = await self._load_config()
+            if config is None:
+                return
+            self.coalesce_llm_requests = config.coalesce_llm_requests
+            self.llm_timeout_seconds = config.llm_timeout_seconds
+            self.hedge_llm_requests = config.hedge_llm_requests
+            self.room_name = config.name
+            self.current_turn_index = config.current_turn_index
+            self.max_turns = config.max_turns
+            self.loaded = True
 
-                room.status = "running"
-                await db.commit()
-                await ws_manager.broadcast(self.room_id, {
-                    "type": "status", "status": "running",
-                    "current_turn_index": room.current_turn_index,
-                    "max_turns": room.max_turns,
-                })
+            status = "running" if self.pause_event.is_set() else "paused"
+            await self._set_status(status)
+            await ws_manager.broadcast(self.room_id, {
+                "type": "status", "status": status,
+                "current_turn_index": self.current_turn_index,
+                "max_turns": self.max_turns,
+            })
 
-                room_agents = sorted(room.agents, key=lambda ra: ra.turn_order)
-                if not room_agents:
-                    room.status = "idle"
-                    await db.commit()
-                    return
-
-                while not self.stopped and room.current_turn_index < room.max_turns:
-                    await self.pause_event.wait()
-                    if self.stopped:
-                        break
-
-                    # Check for injected user messages
-                    while not self.inject_queue.empty():
-                        try:
-                            inject_content = self.inject_queue.get_nowait()
-                            msg = Message(
-                                room_id=self.room_id,
-                                agent_id=None,
-                                role="user",
-                                content=inject_content,
-                                turn_number=room.current_turn_index,
-                            )
-                            db.add(msg)
-                            await db.commit()
-                            await db.refresh(msg)
-                            await ws_manager.broadcast(self.room_id, {
-                                "type": "message",
-                                "message": {
-                                    "id": msg.id,
-                                    "room_id": msg.room_id,
-                                    "agent_id": None,
-                                    "role": "user",
-                                    "content": inject_content,
-                                    "turn_number": msg.turn_number,
-                                    "created_at": msg.created_at.isoformat(),
-                                    "agent_name": "User",
-                                },
-                            })
-                        except asyncio.QueueEmpty:
-                            break
-
-                    current_ra = room_agents[room.current_turn_index % len(room_agents)]
-                    agent_model = current_ra.agent
-
-                    # Broadcast typing indicator
-                    await ws_manager.broadcast(self.room_id, {
-                        "type": "typing",
-                        "agent_id": agent_model.id,
-                        "agent_name": agent_model.name,
-                    })
-
-                    # Build conversation history from this agent's perspective
-                    history = await self._build_history(db, agent_model.id, agent_model.name)
-
-                    # Call the LLM
-                    try:
-                        response_text = await self._call_llm(agent_model, history)
-                    except Exception as e:
-                        logger.error(f"LLM call failed for agent {agent_model.name}: {e}", exc_info=True)
-                        response_text = f"[Error: LLM call failed for {agent_model.name}. Check server logs for details.]"
-
-                    # Save message
-                    msg = Message(
-                        room_id=self.room_id,
-                        agent_id=agent_model.id,
-                        role="assistant",
-                        content=response_text,
-                        turn_number=room.current_turn_index,
-                    )
-                    db.add(msg)
-                    room.current_turn_index += 1
-                    await db.commit()
-                    await db.refresh(msg)
-
-                    # Broadcast message
-                    await ws_manager.broadcast(self.room_id, {
-                        "type": "message",
-                        "message": {
-                            "id": msg.id,
-                            "room_id": msg.room_id,
-                            "agent_id": msg.agent_id,
-                            "role": "assistant",
-                            "content": response_text,
-                            "turn_number": msg.turn_number,
-                            "created_at": msg.created_at.isoformat(),
-                            "agent_name": agent_model.name,
-                        },
-                    })
-
-                    await ws_manager.broadcast(self.room_id, {
-                        "type": "status", "status": "running",
-                        "current_turn_index": room.current_turn_index,
-                        "max_turns": room.max_turns,
-                    })
-
-                    # Delay between turns
-                    await asyncio.sleep(1)
-
-                # Simulation ended
-                room.status = "stopped" if self.stopped else "idle"
-                await db.commit()
-                await ws_manager.broadcast(self.room_id, {
-                    "type": "status", "status": room.status,
-                    "current_turn_index": room.current_turn_index,
-                    "max_turns": room.max_turns,
-                })
+            if not config.agents:
+                await self._set_status("idle")
+                return
+
+            while not self.stopped and not self.draining and self.current_turn_index < self.max_turns:
+                await self.pause_event.wait()
+                if self.stopped or self.draining:
+                    break
+                if config.turn_mode == "parallel":
+                    await self._run_round(config.agents, config.round_order)
+                else:
+                    await self._run_turn(config.agents)
+                await self._turn_delay()
+
+            if self.draining:
+                # Shutting down: keep queued injections and leave the status as-is so the room is resumed.
+                await self._drain_injects()
+                return
+
+            # Simulation ended
+            status = "stopped" if self.stopped else "idle"
+            await self._set_status(status)
+            await ws_manager.broadcast(self.room_id, {
+                "type": "status", "status": status,
+                "current_turn_index": self.current_turn_index,
+                "max_turns": self.max_turns,
+            })
         except asyncio.CancelledError:
+            if self.lease_lost:
+                return  # Another worker owns the room now; leave its status alone.
+            if self.draining:
+                await self._drain_injects()  # don't lose injections queued for the cancelled turn
+                return
             async with async_session() as db:
                 room = await db.get(Room, self.room_id)
                 if room:
@@ -198,50 +450,433 @@ class SimulationRunner:
                 "type": "error", "error": "Simulation encountered an unexpected error. Check server logs.",
             })
 
-    async def _load_room(self, db) -> Room | None:
-        result = await db.execute(
-            select(Room)
-            .where(Room.id == self.room_id)
-            .options(selectinload(Room.agents).selectinload(RoomAgent.agent))
-        )
-        return result.scalar_one_or_none()
-
-    async def _build_history(self, db, current_agent_id: str, current_agent_name: str) -> list[dict]:
-        result = await db.execute(
-            select(Message)
-            .where(Message.room_id == self.room_id)
-            .options(selectinload(Message.agent))
-            .order_by(Message.created_at.asc())
-        )
-        messages = result.scalars().all()
+    def wake(self):
+        """Cut the current between-turn delay short."""
+        self._wake.set()
 
-        history = []
-        for msg in messages:
-            if msg.agent_id == current_agent_id:
-                history.append({"role": "assistant", "content": msg.content})
+    def interrupt(self) -> bool:
+        """Abandon in-flight LLM calls so their turns restart with the latest injections."""
+        self.wake()
+        in_flight = [task for task in self._llm_tasks if not task.done()]
+        for task in in_flight:
+            task.cancel()
+        return bool(in_flight)
+
+    async def _turn_delay(self):
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._wake.wait(), settings.SIMULATION_TURN_DELAY)
+        self._wake.clear()
+
+    async def _generate(self, agent_model, history: list[dict]) -> LLMResult | None:
+        """Call the LLM as a child task ``interrupt`` can cancel; None if it was interrupted."""
+        task = asyncio.create_task(self._call_llm(agent_model, history))
+        self._llm_tasks.add(task)
+        try:
+            await asyncio.wait([task])
+        finally:
+            self._llm_tasks.discard(task)
+            if not task.done():
+                task.cancel()  # the runner itself is being cancelled
+        if task.cancelled():
+            return None
+        return task.result()
+
+    async def _run_turn(self, agents: tuple[AgentConfig, ...]):
+        """Run one agent turn as its own trace: injected messages, history, LLM call, save, broadcast."""
+        turn_started = time.perf_counter()
+        agent_model = agents[self.current_turn_index % len(agents)]
+        with tracer.span(
+            "simulation.turn", new_trace=True,
+            room_id=self.room_id, turn_number=self.current_turn_index, agent=agent_model.name,
+        ) as turn_span, query_instrumentation.track("simulation.turn") as queries:
+            interruptions = 0
+            while True:
+                await self._drain_injects()
+                await self._broadcast_typing(agent_model)
+
+                # Build conversation history from this agent's perspective
+                with tracer.span("simulation.history") as span, HISTORY_BUILD.time():
+                    history = await self._build_history(agent_model.id)
+                    span.set_attribute("messages", len(history))
+
+                result, latency_ms = await self._reply(agent_model, history, turn_span)
+                if result is not None:
+                    break
+                # An interrupting injection landed mid-generation: start the turn over with it.
+                interruptions += 1
+                turn_span.set_attribute("interruptions", interruptions)
+
+            await self._save_reply(agent_model, result, latency_ms, turn_span.trace_id)
+
+            if queries is not None:
+                turn_span.set_attribute("db.queries", queries.count)
+                turn_span.set_attribute("db.time_ms", round(queries.total_seconds * 1000, 3))
+
+        turn_seconds = time.perf_counter() - turn_started
+        TURN_DURATION.observe(turn_seconds)
+        self.stats.record_turn(turn_seconds)
+
+    async def _run_round(self, agents: tuple[AgentConfig, ...], order: str):
+        """Run the rest of the current round at once: every agent answers the same history snapshot.
+
+        Replies are saved and broadcast in turn order (each as soon as it and those before it are
+        done) or, with ``order="completion"``, as they arrive. Each reply still counts as one turn.
+        """
+        round_started = time.perf_counter()
+        start = self.current_turn_index
+        count = min(len(agents) - start % len(agents), self.max_turns - start)
+        speakers = [agents[(start + k) % len(agents)] for k in range(count)]
+        with tracer.span(
+            "simulation.round", new_trace=True,
+            room_id=self.room_id, turn_number=start, agents=count, order=order,
+        ) as round_span, query_instrumentation.track("simulation.round") as queries:
+            await self._drain_injects()
+            for agent_model in speakers:
+                await self._broadcast_typing(agent_model)
+
+            with tracer.span("simulation.history") as span, HISTORY_BUILD.time():
+                snapshots = [await self._build_history(agent_model.id) for agent_model in speakers]
+                span.set_attribute("messages", len(snapshots[0]))
+
+            async def generate(agent_model: AgentConfig, history: list[dict]):
+                while True:
+                    result, latency_ms = await self._reply(agent_model, history, round_span)
+                    if result is not None:
+                        return agent_model, result, latency_ms
+                    # Interrupted: regenerate with the injection (and any replies already saved).
+                    await self._drain_injects()
+                    history = await self._build_history(agent_model.id)
+
+            tasks = [asyncio.create_task(generate(a, h)) for a, h in zip(speakers, snapshots, strict=True)]
+            try:
+                for next_reply in asyncio.as_completed(tasks) if order == "completion" else tasks:
+                    await self._save_reply(*await next_reply, round_span.trace_id)
+                    reply_seconds = time.perf_counter() - round_started
+                    TURN_DURATION.observe(reply_seconds)
+                    self.stats.record_turn(reply_seconds)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+            if queries is not None:
+                round_span.set_attribute("db.queries", queries.count)
+                round_span.set_attribute("db.time_ms", round(queries.total_seconds * 1000, 3))
+
+    async def _broadcast_typing(self, agent_model: AgentConfig):
+        await ws_manager.broadcast(self.room_id, {
+            "type": "typing",
+            "agent_id": agent_model.id,
+            "agent_name": agent_model.name,
+        })
+
+    async def _reply(self, agent_model: AgentConfig, history: list[dict], turn_span) -> tuple[LLMResult | None, float]:
+        """Generate one reply under an ``llm.call`` span; LLM errors become an error message, interrupts None."""
+        with tracer.span("llm.call", model=agent_model.model) as llm_span:
+            llm_started = time.perf_counter()
+            try:
+                result = await self._generate(agent_model, history)
+            except Exception as e:
+                logger.error(f"LLM call failed for agent {agent_model.name}: {e}", exc_info=True)
+                result = LLMResult(
+                    text=f"[Error: LLM call failed for {agent_model.name}. Check server logs for details.]",
+                    finish_reason="error",
+                )
+                turn_span.set_attribute("llm_error", type(e).__name__)
+            llm_seconds = time.perf_counter() - llm_started
+            self.stats.llm_seconds += llm_seconds
+            if result is None:
+                llm_span.set_attribute("interrupted", True)
             else:
-                name = msg.agent.name if msg.agent else "User"
-                history.append({"role": "user", "content": f"[{name}]: {msg.content}"})
-        return history
-
-    async def _call_llm(self, agent_model, history: list[dict]) -> str:
-        model_str = agent_model.model
-        if model_str.startswith("litellm/"):
-            model_str = model_str[len("litellm/"):]
-        model = LitellmModel(model=model_str)
-        ai_agent = Agent(
-            name=agent_model.name,
-            instructions=agent_model.system_prompt,
-            model=model,
+                llm_span.set_attribute("input_tokens", result.input_tokens)
+                llm_span.set_attribute("output_tokens", result.output_tokens)
+        return result, llm_seconds * 1000
+
+    async def _save_reply(self, agent_model: AgentConfig, result: LLMResult, latency_ms: float, trace_id: str):
+        """Persist a reply as the next turn, then broadcast it and the new turn index."""
+        turn_number = self.current_turn_index
+        msg = Message(
+            room_id=self.room_id,
+            agent_id=agent_model.id,
+            role="assistant",
+            content=result.text,
+            turn_number=turn_number,
+            trace_id=trace_id,
+            run_id=self.run_id,
+            model_used=result.model_used,
+            finish_reason=result.finish_reason,
+            input_tokens=result.input_tokens,
+            output_tokens=result.output_tokens,
+            cached_tokens=result.cached_tokens,
+            latency_ms=latency_ms,
         )
+        async with async_session() as db:
+            db.add(msg)
+            await db.execute(
+                update(Room).where(Room.id == self.room_id).values(current_turn_index=turn_number + 1)
+            )
+            # id and created_at are client-side defaults and survive the commit (expire_on_commit=False).
+            await self._commit(db)
+        self.current_turn_index = turn_number + 1
+        self.history.append(agent_model.id, agent_model.name, result.text)
+
+        await ws_manager.broadcast(self.room_id, {
+            "type": "message",
+            "message": {
+                "id": msg.id,
+                "room_id": msg.room_id,
+                "agent_id": msg.agent_id,
+                "role": "assistant",
+                "content": msg.content,
+                "turn_number": msg.turn_number,
+                "created_at": msg.created_at.isoformat(),
+                "agent_name": agent_model.name,
+                "trace_id": msg.trace_id,
+                "run_id": msg.run_id,
+                "model_used": msg.model_used,
+                "finish_reason": msg.finish_reason,
+                "input_tokens": msg.input_tokens,
+                "output_tokens": msg.output_tokens,
+                "cached_tokens": msg.cached_tokens,
+                "latency_ms": msg.latency_ms,
+            },
+        })
+        await ws_manager.broadcast(self.room_id, {
+            "type": "status", "status": "running",
+            "current_turn_index": self.current_turn_index,
+            "max_turns": self.max_turns,
+        })
+
+    async def _drain_injects(self) -> list[Message]:
+        """Persist and broadcast user messages injected since the last turn, in one transaction."""
+        contents = []
+        while not self.inject_queue.empty():
+            try:
+                contents.append(self.inject_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        if not contents:
+            return []
+        current = current_span()
+        messages = [
+            Message(
+                room_id=self.room_id,
+                agent_id=None,
+                role="user",
+                content=content,
+                turn_number=self.current_turn_index,
+                trace_id=current.trace_id if current else None,
+                run_id=self.run_id,
+            )
+            for content in contents
+        ]
+        async with async_session() as db:
+            db.add_all(messages)
+            await self._commit(db)
+        for msg in messages:
+            self.history.append(None, "User", msg.content)
+            await ws_manager.broadcast(self.room_id, {
+                "type": "message",
+                "message": {
+                    "id": msg.id,
+                    "room_id": msg.room_id,
+                    "agent_id": None,
+                    "role": "user",
+                    "content": msg.content,
+                    "turn_number": msg.turn_number,
+                    "created_at": msg.created_at.isoformat(),
+                    "agent_name": "User",
+                    "trace_id": msg.trace_id,
+                },
+            })
+        return messages
+
+    async def _commit(self, db):
+        with tracer.child_span("db.commit"), DB_COMMIT.time(), self._db_time():
+            await db.commit()
+
+    @contextlib.contextmanager
+    def _db_time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stats.db_seconds += time.perf_counter() - start
+
+    async def _load_config(self) -> RoomConfig | None:
+        async with async_session() as db:
+            result = await db.execute(
+                select(Room)
+                .where(Room.id == self.room_id)
+                .options(selectinload(Room.agents).selectinload(RoomAgent.agent))
+            )
+            room = result.scalar_one_or_none()
+            return RoomConfig.from_model(room) if room else None
+
+    async def _set_status(self, status: str):
+        async with async_session() as db:
+            await db.execute(update(Room).where(Room.id == self.room_id).values(status=status))
+            await self._commit(db)
+
+    async def _build_history(self, current_agent_id: str) -> list[dict]:
+        if not self.history.loaded:
+            with self._db_time():
+                async with async_session() as db:
+                    result = await db.execute(
+                        select(Message.agent_id, AgentModel.name, Message.content)
+                        .outerjoin(AgentModel, AgentModel.id == Message.agent_id)
+                        .where(Message.room_id == self.room_id)
+                        .order_by(Message.created_at.asc())
+                    )
+                    rows = result.all()
+                self.history.load([(agent_id, name or "User", content) for agent_id, name, content in rows])
+        return self.history.build(current_agent_id)
+
+    async def _call_llm(self, agent_model, history: list[dict]) -> LLMResult:
+        model_str = _litellm_model_name(agent_model.model)
         input_messages = history if history else [{"role": "user", "content": "Start the conversation. Introduce yourself and begin discussing."}]
 
+        key = None
+        if llm_cache.enabled or self.coalesce_llm_requests:
+            key = llm_cache.make_key(model_str, agent_model.system_prompt, input_messages, GENERATION_SETTINGS)
+        if llm_cache.enabled:
+            cached = await llm_cache.get(key)
+            if cached is not None:
+                if (span := current_span()) is not None:
+                    span.set_attribute("cache_hit", True)
+                return LLMResult.from_cache(cached)
+
+        policy = default_policy(
+            timeout=agent_model.llm_timeout_seconds or self.llm_timeout_seconds,
+            hedge=self.hedge_llm_requests,
+        )
+
+        leader = False
+
+        async def fetch() -> LLMResult:
+            nonlocal leader
+            leader = True
+            result = await self._call_with_fallback(agent_model, input_messages, policy)
+            LLM_TOKENS.labels(result.model_used, "input").inc(result.input_tokens)
+            LLM_TOKENS.labels(result.model_used, "output").inc(result.output_tokens)
+            LLM_TOKENS.labels(result.model_used, "cached").inc(result.cached_tokens)
+            # The key names the primary model; a fallback reply cached under it would keep being
+            # served after the primary recovers.
+            if llm_cache.enabled and result.model_used == model_str:
+                await llm_cache.set(key, result.to_cache())
+            return result
+
+        if not self.coalesce_llm_requests:
+            return await fetch()
+        result = await llm_singleflight.do(key, fetch)
+        # Tokens of a coalesced call are billed once, to the caller that actually made it.
+        return result if leader else replace(result, input_tokens=0, output_tokens=0, cached_tokens=0)
+
+    async def _call_with_fallback(self, agent_model, input_messages: list[dict], policy) -> LLMResult:
+        """Call the agent's model, or the first fallback model whose circuit breaker is closed."""
+        candidates = [_litellm_model_name(m) for m in [agent_model.model, *(agent_model.fallback_models or [])]]
+        last_error: Exception | None = None
+        for model_str in candidates:
+            breaker = circuit_breakers.get(model_str)
+            if not breaker.allow_request():
+                continue
+            start = time.perf_counter()
+            if (span := current_span()) is not None:
+                span.set_attribute("model_used", model_str)
+            try:
+                response = await call_with_policy(
+                    lambda m=model_str: self._run_agent(agent_model.name, m, agent_model.system_prompt, input_messages),
+                    policy,
+                    model_str,
+                )
+            except Exception as e:
+                LLM_LATENCY.labels(model_str, "error").observe(time.perf_counter() - start)
+                if is_retryable(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_ignored()
+                logger.warning(f"LLM call to {model_str} failed for agent {agent_model.name}: {e}")
+                last_error = e
+                continue
+            except BaseException:
+                breaker.record_ignored()
+                raise
+            elapsed = time.perf_counter() - start
+            LLM_LATENCY.labels(model_str, "ok").observe(elapsed)
+            breaker.record_success(elapsed)
+            return replace(response, model_used=model_str)
+        if last_error:
+            raise last_error
+        raise CircuitOpenError(f"Circuit open for every candidate model: {', '.join(candidates)}")
+
+    async def _run_agent(
+        self, name: str, model_str: str, instructions: str, input_messages: list[dict],
+    ) -> LLMResult:
+        ai_agent = Agent(
+            name=name,
+            instructions=instructions,
+            model=LitellmModel(model=model_str),
+        )
         result = await Runner.run(
             ai_agent,
             input=input_messages,
-            max_turns=1,
+            max_turns=GENERATION_SETTINGS["max_turns"],
+        )
+        usage = result.context_wrapper.usage
+        return LLMResult(
+            text=result.final_output,
+            model_used=model_str,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cached_tokens=usage.input_tokens_details.cached_tokens or 0,
+            finish_reason=_finish_reason(result),
         )
-        return result.final_output
+
+
+@dataclass
+class QueuedStart:
+    room_id: str
+    priority: int = 0
+    reset: bool = True
+    paused: bool = False
+    queued_at: float = field(default_factory=time.time)
+    seq: int = 0
+
+
+class StartQueue:
+    """Starts waiting for a free slot: highest priority first, FIFO within a priority."""
+
+    def __init__(self):
+        self.entries: list[QueuedStart] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, room_id: str) -> bool:
+        return any(e.room_id == room_id for e in self.entries)
+
+    def push(self, entry: QueuedStart) -> int:
+        """Queue ``entry`` and return its 1-based position."""
+        entry.seq = next(self._seq)
+        key = (-entry.priority, entry.seq)
+        index = bisect.bisect(self.entries, key, key=lambda e: (-e.priority, e.seq))
+        self.entries.insert(index, entry)
+        return index + 1
+
+    def pop(self) -> QueuedStart | None:
+        return self.entries.pop(0) if self.entries else None
+
+    def remove(self, room_id: str) -> QueuedStart | None:
+        for i, entry in enumerate(self.entries):
+            if entry.room_id == room_id:
+                return self.entries.pop(i)
+        return None
+
+    def position(self, room_id: str) -> int | None:
+        for i, entry in enumerate(self.entries):
+            if entry.room_id == room_id:
+                return i + 1
+        return None
 
 
 class SimulationManager:
@@ -251,31 +886,208 @@ class SimulationManager:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.simulations: dict[str, SimulationRunner] = {}
+            cls._instance.leases: LeaseCoordinator | None = None
+            # Set on an API process whose simulations run in separate worker processes (worker.py).
+            cls._instance.external = False
+            cls._instance.queue = StartQueue()
+            cls._instance._admitting: set[asyncio.Task] = set()
+            cls._instance.draining = False
         return cls._instance
 
-    async def start(self, room_id: str) -> bool:
+    @property
+    def running_count(self) -> int:
+        return sum(1 for runner in self.simulations.values() if runner.active)
+
+    def at_capacity(self) -> bool:
+        limit = settings.MAX_CONCURRENT_SIMULATIONS
+        return limit > 0 and self.running_count >= limit
+
+    def queue_position(self, room_id: str) -> int | None:
+        return self.queue.position(room_id)
+
+    async def queue_positions(self, room_ids: list[str]) -> dict[str, int]:
+        """Start-queue positions from this process's queue, else as recorded by the owning worker."""
+        positions = {room_id: p for room_id in room_ids if (p := self.queue.position(room_id)) is not None}
+        remote = [room_id for room_id in room_ids if room_id not in positions]
+        if remote and self.leases is not None:
+            positions.update(await self.leases.queue_positions(remote))
+        return positions
+
+    async def start(self, room_id: str, reset: bool = True, paused: bool = False, priority: int = 0) -> bool:
+        """Start a room's runner on this worker, or queue it while MAX_CONCURRENT_SIMULATIONS are running.
+
+        ``reset=False`` continues from the persisted turn index (used when taking over a room
+        from another worker); ``paused`` starts the runner paused. In external mode the start
+        is queued for whichever worker process claims it. Returns False if the room is missing
+        or already running or queued, or if no worker answered.
+        """
+        try:
+            return await self.admit(room_id, reset, paused, priority) is not None
+        except WorkerUnavailableError:
+            return False
+
+    async def admit(
+        self, room_id: str, reset: bool = True, paused: bool = False, priority: int = 0,
+    ) -> dict | None:
+        """``start``, reporting ``{"status": "started"}`` or ``{"status": "queued", "queue_position": n}``.
+
+        None if the start was refused. In external mode this is the claiming worker's answer;
+        raises ``WorkerUnavailableError`` if no worker answered.
+        """
+        if self.external:
+            if await self.leases.owner(room_id) is not None:
+                return None
+            payload = {"reset": reset, "paused": paused, "priority": priority}
+            ok, result = await self.leases.request(room_id, ANY_WORKER, "start", payload)
+            return (result or {"status": "started"}) if ok else None
+
+        if not await self._start_local(room_id, reset, paused, priority):
+            return None
+        position = self.queue_position(room_id)
+        if position is not None:
+            return {"status": "queued", "queue_position": position}
+        return {"status": "started"}
+
+    async def _start_local(self, room_id: str, reset: bool, paused: bool, priority: int) -> bool:
+        if self.draining:
+            return False
         if room_id in self.simulations:
             runner = self.simulations[room_id]
             if runner.task and not runner.task.done():
                 return False
+        if room_id in self.queue:
+            return False
+
+        if self.leases is not None:
+            owner = await self.leases.owner(room_id)
+            if owner is not None and owner != self.leases.worker_id:
+                return False
+            if not await self.leases.acquire(room_id):
+                return False
+
+        if self.at_capacity():
+            return await self._enqueue(QueuedStart(room_id, priority=priority, reset=reset, paused=paused))
+        return await self._launch(room_id, reset, paused)
 
-        # Reset turn counter so the simulation loop can run again
+    async def _launch(self, room_id: str, reset: bool, paused: bool) -> bool:
         async with async_session() as db:
             room = await db.get(Room, room_id)
             if not room:
+                if self.leases is not None:
+                    await self.leases.release(room_id)
                 return False
-            room.current_turn_index = 0
-            await db.commit()
+            if reset:
+                # Reset turn counter so the simulation loop can run again
+                room.current_turn_index = 0
+                await db.commit()
 
         runner = SimulationRunner(room_id)
+        if paused:
+            runner.pause_event.clear()
         self.simulations[room_id] = runner
-        runner.task = asyncio.create_task(runner.run())
+        coro = runner.run() if self.leases is None else self._run_leased(runner)
+        # Run in a fresh context so the runner doesn't inherit the starting request's trace.
+        runner.task = asyncio.create_task(coro, context=contextvars.Context())
+        runner.task.add_done_callback(lambda _task: self._on_runner_done(runner))
+        return True
+
+    async def _enqueue(self, entry: QueuedStart) -> bool:
+        async with async_session() as db:
+            room = await db.get(Room, entry.room_id)
+            if not room:
+                if self.leases is not None:
+                    await self.leases.release(entry.room_id)
+                return False
+            room.status = "queued"
+            if entry.reset:
+                # Reset now so the persisted state is a valid resume point if we restart while queued.
+                room.current_turn_index = 0
+                entry.reset = False
+            await db.commit()
+        position = self.queue.push(entry)
+        if self.leases is not None:
+            await self.leases.mark_queued(entry.room_id, entry.priority, entry.seq)
+        logger.info(f"Queued room {entry.room_id} at position {position} (priority {entry.priority})")
+        await ws_manager.broadcast(entry.room_id, {"type": "status", "status": "queued", "queue_position": position})
         return True
 
+    def _on_runner_done(self, runner: SimulationRunner):
+        # The transcript is only needed while running; the runner itself lingers until reaped.
+        runner.finished_at = time.time()
+        runner.history = HistoryCache()
+        if not self.queue:
+            return
+        task = asyncio.get_running_loop().create_task(self._admit())
+        self._admitting.add(task)
+        task.add_done_callback(self._admitting.discard)
+
+    async def _admit(self):
+        """Start queued rooms while there are free slots, then tell the rest where they stand."""
+        admitted = False
+        popped = []
+        while self.queue and not self.draining and not self.at_capacity():
+            entry = self.queue.pop()
+            popped.append(entry.room_id)
+            admitted = await self._launch(entry.room_id, entry.reset, entry.paused) or admitted
+        if popped and self.leases is not None:
+            await self.leases.clear_queued(popped)
+        if admitted:
+            for position, entry in enumerate(list(self.queue.entries), start=1):
+                await ws_manager.broadcast(entry.room_id, {
+                    "type": "status", "status": "queued", "queue_position": position,
+                })
+
+    async def _run_leased(self, runner: SimulationRunner):
+        try:
+            await runner.run()
+        finally:
+            if runner.draining:
+                # Let another worker pick the room up on its next heartbeat rather than after the TTL.
+                await self.leases.expire(runner.room_id)
+            elif not runner.lease_lost:
+                await self.leases.release(runner.room_id)
+
+    async def drain(self, timeout: float) -> dict[str, int]:
+        """Shut down without losing work.
+
+        New starts are refused, each runner finishes its in-flight turn (runners still busy after
+        ``timeout`` are cancelled and redo that turn later), queued injections are saved, and
+        rooms keep their running/paused/queued status so startup recovery or another worker
+        resumes them.
+        """
+        self.draining = True
+        runners = [runner for runner in self.simulations.values() if runner.active]
+        for runner in runners:
+            runner.draining = True
+            runner.pause_event.set()
+            runner.wake()
+        done, pending = await asyncio.wait([r.task for r in runners], timeout=timeout) if runners else ((), ())
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        queued = [entry.room_id for entry in self.queue.entries]
+        self.queue = StartQueue()
+        if self.leases is not None:
+            for room_id in queued:
+                await self.leases.expire(room_id)
+        result = {"finished": len(done), "interrupted": len(pending), "queued": len(queued)}
+        logger.info(f"Drained simulations: {result}")
+        return result
+
+    async def _forward(self, room_id: str, command: str, payload: dict | None = None) -> bool:
+        """Send a control command to the worker that owns the room, if that isn't this one."""
+        if self.leases is None:
+            return False
+        owner = await self.leases.owner(room_id)
+        if owner is None or owner == self.leases.worker_id:
+            return False
+        return await self.leases.send(room_id, owner, command, payload)
+
     async def pause(self, room_id: str) -> bool:
         runner = self.simulations.get(room_id)
         if not runner or not runner.task or runner.task.done():
-            return False
+            return await self._forward(room_id, "pause")
         runner.pause_event.clear()
         async with async_session() as db:
             room = await db.get(Room, room_id)
@@ -288,7 +1100,7 @@ class SimulationManager:
     async def resume(self, room_id: str) -> bool:
         runner = self.simulations.get(room_id)
         if not runner or not runner.task or runner.task.done():
-            return False
+            return await self._forward(room_id, "resume")
         runner.pause_event.set()
         async with async_session() as db:
             room = await db.get(Room, room_id)
@@ -299,25 +1111,166 @@ class SimulationManager:
         return True
 
     async def stop(self, room_id: str) -> bool:
+        if self.queue.remove(room_id) is not None:
+            await self._dequeued(room_id)  # releases the lease, and its queue entry with it
+            return True
         runner = self.simulations.get(room_id)
-        if not runner:
-            return False
+        if not runner or not runner.task or runner.task.done():
+            self.simulations.pop(room_id, None)  # a finished runner that hasn't been reaped yet
+            return await self._forward(room_id, "stop")
         runner.stopped = True
         runner.pause_event.set()  # Unblock if paused
-        if runner.task and not runner.task.done():
-            runner.task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await runner.task
+        runner.task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await runner.task
         del self.simulations[room_id]
         return True
 
-    async def inject(self, room_id: str, content: str) -> bool:
+    async def recover(self, mode: str = "resume") -> dict[str, list[str]]:
+        """Deal with rooms left running, paused or queued by a process that went away.
+
+        ``resume`` restarts them from their persisted turn index (paused rooms stay paused);
+        ``stop`` marks them stopped so they can be resumed by hand. Rooms leased by another
+        live worker are left alone.
+        """
+        result = {"resumed": [], "stopped": []}
+        if mode == "off":
+            return result
+        async with async_session() as db:
+            rows = (await db.execute(
+                select(Room.id, Room.status).where(Room.status.in_(("running", "paused", "queued")))
+            )).all()
+        for room_id, status in rows:
+            if room_id in self.simulations or room_id in self.queue:
+                continue
+            if self.leases is not None and await self.leases.owner(room_id) not in (None, self.leases.worker_id):
+                continue
+            if mode == "resume" and await self.start(room_id, reset=False, paused=status == "paused"):
+                result["resumed"].append(room_id)
+                continue
+            async with async_session() as db:
+                room = await db.get(Room, room_id)
+                if room and room.status == status:
+                    room.status = "stopped"
+                    await db.commit()
+                    result["stopped"].append(room_id)
+        if rows:
+            logger.warning(
+                f"Recovered interrupted simulations: {len(result['resumed'])} resumed, "
+                f"{len(result['stopped'])} marked stopped"
+            )
+        return result
+
+    async def _dequeued(self, room_id: str):
+        async with async_session() as db:
+            room = await db.get(Room, room_id)
+            if room:
+                room.status = "stopped"
+                await db.commit()
+        if self.leases is not None:
+            await self.leases.release(room_id)
+        await ws_manager.broadcast(room_id, {"type": "status", "status": "stopped"})
+
+    async def inject(self, room_id: str, content: str, interrupt: bool = False) -> bool:
+        """Queue a user message for the next turn, or with ``interrupt`` save it now and restart the turn."""
         runner = self.simulations.get(room_id)
         if not runner or not runner.task or runner.task.done():
-            return False
+            return await self._forward(room_id, "inject", {"content": content, "interrupt": interrupt})
         await runner.inject_queue.put(content)
+        if interrupt and runner.loaded:
+            # Save before cancelling, so the restarted turn's history already includes the message.
+            messages = await runner._drain_injects()
+            interrupted = runner.interrupt()
+            await ws_manager.broadcast(room_id, {
+                "type": "inject_ack",
+                "message_ids": [msg.id for msg in messages],
+                "interrupted": interrupted,
+            })
         return True
 
+    async def execute(self, command: str, room_id: str, payload: dict) -> bool | dict | None:
+        """Run a command forwarded from another worker; starts return ``admit``'s result."""
+        if command == "start":
+            return await self.admit(
+                room_id, reset=payload.get("reset", True), paused=payload.get("paused", False),
+                priority=payload.get("priority", 0),
+            )
+        if command == "inject":
+            return await self.inject(room_id, payload["content"], interrupt=payload.get("interrupt", False))
+        if command not in ("pause", "resume", "stop"):
+            raise ValueError(f"Unknown simulation command {command!r}")
+        return await getattr(self, command)(room_id)
+
+    def leased_rooms(self) -> list[str]:
+        running = [room_id for room_id, runner in self.simulations.items() if runner.active]
+        return running + [entry.room_id for entry in self.queue.entries]
+
+    async def abandon(self, room_id: str):
+        """Stop the local runner without touching room state, after another worker took the lease."""
+        runner = self.simulations.pop(room_id, None)
+        if runner is None:
+            return
+        runner.lease_lost = True
+        runner.stopped = True
+        runner.pause_event.set()
+        if runner.task and not runner.task.done():
+            runner.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await runner.task
+
+    async def bulk(self, action: str, room_ids: list[str] | None = None) -> dict[str, bool]:
+        """Apply pause/resume/stop to many rooms concurrently (every live simulation if ``room_ids`` is None)."""
+        handler = {"pause": self.pause, "resume": self.resume, "stop": self.stop}[action]
+        targets = list(dict.fromkeys(room_ids)) if room_ids is not None else list(self.simulations)
+        results = await asyncio.gather(*(handler(room_id) for room_id in targets))
+        return dict(zip(targets, results, strict=True))
+
+    def snapshot(self) -> list[dict]:
+        return [runner.snapshot() for runner in self.simulations.values()]
+
+    def reap(self, ttl: float) -> int:
+        """Drop runners that finished more than ``ttl`` seconds ago."""
+        now = time.time()
+        expired = []
+        for room_id, runner in self.simulations.items():
+            if runner.active:
+                continue
+            if runner.finished_at is None:
+                runner.finished_at = now  # finished without going through _launch; start its clock
+            elif now - runner.finished_at >= ttl:
+                expired.append(room_id)
+        for room_id in expired:
+            del self.simulations[room_id]
+        return len(expired)
+
+    async def run_reaper(self, interval: float, ttl: float):
+        """Background task: reap finished runners and WebSocket rooms nobody has watched for ``ttl``."""
+        while True:
+            await asyncio.sleep(interval)
+            runners, rooms = self.reap(ttl), ws_manager.reap(ttl)
+            if runners or rooms:
+                logger.info(f"Reaped {runners} finished runners and {rooms} empty WebSocket rooms")
+
+    def queue_snapshot(self) -> dict:
+        now = time.time()
+        return {
+            "max_concurrent": settings.MAX_CONCURRENT_SIMULATIONS,
+            "running": self.running_count,
+            "queued": [
+                {
+                    "room_id": entry.room_id,
+                    "position": position,
+                    "priority": entry.priority,
+                    "waiting_seconds": round(now - entry.queued_at, 3),
+                }
+                for position, entry in enumerate(self.queue.entries, start=1)
+            ],
+        }
+
+    def live_status(self, room_id: str) -> dict | None:
+        runner = self.simulations.get(room_id)
+        return runner.status() if runner else None
+
     def get_status(self, room_id: str) -> dict | None:
         runner = self.simulations.get(room_id)
         if not runner:
@@ -329,3 +1282,31 @@ class SimulationManager:
 
 
 simulation_manager = SimulationManager()
+
+
+def _collect_runtime_metrics():
+    SIMULATIONS.clear()
+    INJECT_QUEUE_DEPTH.clear()
+    RUNNER_MEMORY.clear()
+    counts = {"running": 0, "paused": 0, "queued": len(simulation_manager.queue)}
+    for room_id, runner in simulation_manager.simulations.items():
+        if not runner.task or runner.task.done():
+            continue
+        counts["paused" if not runner.pause_event.is_set() else "running"] += 1
+        INJECT_QUEUE_DEPTH.labels(room_id).set(runner.inject_queue.qsize())
+        RUNNER_MEMORY.labels(room_id).set(runner.memory_bytes())
+    for state, count in counts.items():
+        SIMULATIONS.labels(state).set(count)
+
+    WS_CONNECTIONS.clear()
+    for room_id, sockets in ws_manager.rooms.items():
+        if sockets:
+            WS_CONNECTIONS.labels(room_id).set(len(sockets))
+
+    for event, value in {**llm_cache.stats(), **llm_singleflight.stats()}.items():
+        if event in ("memory_hits", "disk_hits", "misses", "writes", "memory_evictions",
+                     "disk_evictions", "expired", "coalesced"):
+            LLM_CACHE_EVENTS.labels(event).set(value)
+
+
+registry.register_collector(_collect_runtime_metrics)
@@ -0,0 +1,377 @@
+"""Database-backed simulation ownership for running several API workers against one database.
+
+A worker that starts a simulation takes a lease row for the room and renews it on a
+heartbeat. Control calls that land on a worker which doesn't own the room are written to
+``simulation_commands`` and executed by the owner on its next poll. A lease that isn't renewed
+within its TTL (the owner crashed or hung) is taken over by whichever worker notices first,
+which resumes the room from its persisted turn index.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+from database import async_session
+from models.room import Room
+from models.simulation_lease import SimulationCommand, SimulationLease
+
+if TYPE_CHECKING:
+    from services.simulation_engine import SimulationManager
+
+logger = logging.getLogger(__name__)
+
+# Addressee for "start" commands from an API running in external mode; the first worker to claim one runs it.
+ANY_WORKER = "*"
+
+
+class WorkerUnavailableError(Exception):
+    """Raised when no worker picks up a command within ``command_timeout``."""
+
+
+def _now() -> datetime:
+    return datetime.now(UTC)
+
+
+def _rank_queued(rows) -> dict[str, int]:
+    """1-based start-queue positions from ``(room_id, worker_id, priority, seq)`` rows, per worker."""
+    by_worker: dict[str, list[tuple[int, int, str]]] = {}
+    for room_id, worker_id, priority, seq in rows:
+        by_worker.setdefault(worker_id, []).append((-priority, seq, room_id))
+    return {
+        room_id: position
+        for entries in by_worker.values()
+        for position, (_, _, room_id) in enumerate(sorted(entries), start=1)
+    }
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaseCoordinator:
+    def __init__(
+        self,
+        worker_id: str,
+        session_factory=async_session,
+        ttl: float = 15.0,
+        heartbeat_interval: float = 5.0,
+        poll_interval: float = 0.5,
+        command_timeout: float = 10.0,
+        accept_starts: bool = False,
+    ):
+        self.worker_id = worker_id
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.command_timeout = command_timeout
+        self.accept_starts = accept_starts
+
+    @classmethod
+    def from_settings(cls, accept_starts: bool = False) -> "LeaseCoordinator":
+        return cls(
+            worker_id=settings.WORKER_ID or default_worker_id(),
+            ttl=settings.SIMULATION_LEASE_TTL_SECONDS,
+            heartbeat_interval=settings.SIMULATION_LEASE_HEARTBEAT_SECONDS,
+            poll_interval=settings.SIMULATION_COMMAND_POLL_SECONDS,
+            command_timeout=settings.SIMULATION_COMMAND_TIMEOUT_SECONDS,
+            accept_starts=accept_starts,
+        )
+
+    # -- leases ---------------------------------------------------------------
+
+    async def acquire(self, room_id: str) -> bool:
+        """Take (or renew) the room's lease; fails while another worker holds an unexpired one."""
+        now = _now()
+        values = {"worker_id": self.worker_id, "acquired_at": now, "heartbeat_at": now,
+                  "expires_at": now + timedelta(seconds=self.ttl), "queue_priority": None, "queue_seq": None}
+        async with self.session_factory() as db:
+            # A single conditional UPDATE, so two workers racing for an expired lease can't both win.
+            result = await db.execute(
+                update(SimulationLease)
+                .where(
+                    SimulationLease.room_id == room_id,
+                    or_(SimulationLease.worker_id == self.worker_id, SimulationLease.expires_at < now),
+                )
+                .values(**values)
+            )
+            if result.rowcount == 0:
+                db.add(SimulationLease(room_id=room_id, **values))
+            try:
+                await db.commit()
+            except IntegrityError:
+                return False
+        return True
+
+    async def release(self, room_id: str):
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(SimulationLease).where(
+                    SimulationLease.room_id == room_id, SimulationLease.worker_id == self.worker_id,
+                )
+            )
+            await db.commit()
+
+    async def expire(self, room_id: str):
+        """Give up our lease but leave the row, so another worker's heartbeat takes the room over."""
+        async with self.session_factory() as db:
+            await db.execute(
+                update(SimulationLease)
+                .where(SimulationLease.room_id == room_id, SimulationLease.worker_id == self.worker_id)
+                .values(expires_at=_now())
+            )
+            await db.commit()
+
+    async def owner(self, room_id: str) -> str | None:
+        """The worker holding an unexpired lease on the room, if any."""
+        async with self.session_factory() as db:
+            return await db.scalar(
+                select(SimulationLease.worker_id).where(
+                    SimulationLease.room_id == room_id, SimulationLease.expires_at >= _now(),
+                )
+            )
+
+    async def renew(self, room_ids: list[str]) -> set[str]:
+        """Extend this worker's leases; return the rooms whose lease was lost to another worker."""
+        if not room_ids:
+            return set()
+        now = _now()
+        async with self.session_factory() as db:
+            await db.execute(
+                update(SimulationLease)
+                .where(SimulationLease.room_id.in_(room_ids), SimulationLease.worker_id == self.worker_id)
+                .values(heartbeat_at=now, expires_at=now + timedelta(seconds=self.ttl))
+            )
+            held = set(await db.scalars(
+                select(SimulationLease.room_id).where(
+                    SimulationLease.room_id.in_(room_ids), SimulationLease.worker_id == self.worker_id,
+                )
+            ))
+            await db.commit()
+        return set(room_ids) - held
+
+    async def mark_queued(self, room_id: str, priority: int, seq: int):
+        """Record the room's place in this worker's start queue (see ``StartQueue``)."""
+        async with self.session_factory() as db:
+            await db.execute(
+                update(SimulationLease)
+                .where(SimulationLease.room_id == room_id, SimulationLease.worker_id == self.worker_id)
+                .values(queue_priority=priority, queue_seq=seq)
+            )
+            await db.commit()
+
+    async def clear_queued(self, room_ids: list[str]):
+        async with self.session_factory() as db:
+            await db.execute(
+                update(SimulationLease)
+                .where(SimulationLease.room_id.in_(room_ids), SimulationLease.worker_id == self.worker_id)
+                .values(queue_priority=None, queue_seq=None)
+            )
+            await db.commit()
+
+    async def queue_positions(self, room_ids: list[str]) -> dict[str, int]:
+        """Start-queue positions of these rooms in the queues of whichever workers own them."""
+        owners = select(SimulationLease.worker_id).where(SimulationLease.room_id.in_(room_ids))
+        async with self.session_factory() as db:
+            rows = await db.execute(
+                select(
+                    SimulationLease.room_id, SimulationLease.worker_id,
+                    SimulationLease.queue_priority, SimulationLease.queue_seq,
+                ).where(
+                    SimulationLease.worker_id.in_(owners),
+                    SimulationLease.queue_seq.is_not(None),
+                    SimulationLease.expires_at >= _now(),
+                )
+            )
+            positions = _rank_queued(rows.all())
+        return {room_id: positions[room_id] for room_id in room_ids if room_id in positions}
+
+    async def expired(self) -> list[tuple[str, str]]:
+        """``(room_id, room_status)`` for every lease past its expiry."""
+        async with self.session_factory() as db:
+            rows = await db.execute(
+                select(SimulationLease.room_id, Room.status)
+                .join(Room, Room.id == SimulationLease.room_id)
+                .where(SimulationLease.expires_at < _now())
+            )
+            return [(room_id, status) for room_id, status in rows]
+
+    async def drop_expired(self, room_id: str):
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(SimulationLease).where(
+                    SimulationLease.room_id == room_id, SimulationLease.expires_at < _now(),
+                )
+            )
+            await db.commit()
+
+    async def leases(self) -> list[dict]:
+        async with self.session_factory() as db:
+            rows = (await db.scalars(select(SimulationLease).order_by(SimulationLease.acquired_at))).all()
+            now = _now().replace(tzinfo=None)
+            positions = _rank_queued(
+                (lease.room_id, lease.worker_id, lease.queue_priority, lease.queue_seq)
+                for lease in rows if lease.queue_seq is not None
+            )
+            return [
+                {
+                    "room_id": lease.room_id,
+                    "worker_id": lease.worker_id,
+                    "acquired_at": lease.acquired_at,
+                    "heartbeat_at": lease.heartbeat_at,
+                    "expires_at": lease.expires_at,
+                    "expired": lease.expires_at.replace(tzinfo=None) < now,
+                    "queue_position": positions.get(lease.room_id),
+                }
+                for lease in rows
+            ]
+
+    # -- command queue --------------------------------------------------------
+
+    async def send(self, room_id: str, worker_id: str, command: str, payload: dict | None = None) -> bool:
+        """Like ``request``, but only whether it succeeded; False if no worker answered."""
+        try:
+            ok, _result = await self.request(room_id, worker_id, command, payload)
+        except WorkerUnavailableError:
+            return False
+        return ok
+
+    async def request(
+        self, room_id: str, worker_id: str, command: str, payload: dict | None = None,
+    ) -> tuple[bool, dict | None]:
+        """Queue a command for the room's owner and wait for ``(ok, result)``.
+
+        Raises ``WorkerUnavailableError`` if the owner doesn't pick it up within
+        ``command_timeout``; the command is withdrawn in that case so it can't run late.
+        """
+        row = SimulationCommand(room_id=room_id, worker_id=worker_id, command=command, payload=payload or {})
+        async with self.session_factory() as db:
+            db.add(row)
+            await db.commit()
+
+        deadline = time.monotonic() + self.command_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval / 2)
+            async with self.session_factory() as db:
+                done = await db.execute(
+                    select(SimulationCommand.ok, SimulationCommand.result).where(
+                        SimulationCommand.id == row.id, SimulationCommand.processed_at.is_not(None),
+                    )
+                )
+                reply = done.first()
+            if reply is not None:
+                return bool(reply.ok), reply.result
+
+        async with self.session_factory() as db:
+            withdrawn = await db.execute(
+                delete(SimulationCommand).where(
+                    SimulationCommand.id == row.id, SimulationCommand.processed_at.is_(None),
+                )
+            )
+            await db.commit()
+            if withdrawn.rowcount:
+                logger.warning(f"Worker {worker_id} did not answer {command!r} for room {room_id}")
+                raise WorkerUnavailableError(f"No worker answered {command!r} for room {room_id}")
+            reply = (await db.execute(
+                select(SimulationCommand.ok, SimulationCommand.result).where(SimulationCommand.id == row.id)
+            )).one()
+        return bool(reply.ok), reply.result
+
+    async def pending(self) -> list[SimulationCommand]:
+        addressed = SimulationCommand.worker_id == self.worker_id
+        if self.accept_starts:
+            addressed = or_(addressed, SimulationCommand.worker_id == ANY_WORKER)
+        async with self.session_factory() as db:
+            rows = await db.scalars(
+                select(SimulationCommand)
+                .where(addressed, SimulationCommand.processed_at.is_(None))
+                .order_by(SimulationCommand.created_at)
+            )
+            return list(rows)
+
+    async def claim(self, command_id: str) -> bool:
+        """Take an unassigned command; False if another worker got it first."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                update(SimulationCommand)
+                .where(SimulationCommand.id == command_id, SimulationCommand.worker_id == ANY_WORKER)
+                .values(worker_id=self.worker_id)
+            )
+            await db.commit()
+        return result.rowcount == 1
+
+    async def complete(self, command_id: str, ok: bool, error: str | None = None, result: dict | None = None):
+        async with self.session_factory() as db:
+            await db.execute(
+                update(SimulationCommand)
+                .where(SimulationCommand.id == command_id)
+                .values(processed_at=_now(), ok=ok, error=error, result=result)
+            )
+            await db.commit()
+
+    async def prune_commands(self, older_than: float = 3600):
+        cutoff = _now() - timedelta(seconds=older_than)
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(SimulationCommand).where(
+                    SimulationCommand.processed_at.is_not(None), SimulationCommand.processed_at < cutoff,
+                )
+            )
+            await db.commit()
+
+    # -- background loop ------------------------------------------------------
+
+    async def process_commands(self, manager: "SimulationManager") -> int:
+        commands = await self.pending()
+        for cmd in commands:
+            if cmd.worker_id == ANY_WORKER and not await self.claim(cmd.id):
+                continue
+            try:
+                outcome = await manager.execute(cmd.command, cmd.room_id, cmd.payload)
+                # Starts reply with the admission result ({"status": "started" | "queued", ...}).
+                await self.complete(cmd.id, bool(outcome), result=outcome if isinstance(outcome, dict) else None)
+            except Exception as e:
+                logger.exception(f"Command {cmd.command!r} for room {cmd.room_id} failed")
+                await self.complete(cmd.id, False, str(e))
+        return len(commands)
+
+    async def heartbeat(self, manager: "SimulationManager"):
+        """Renew owned leases, give up rooms we lost, and take over rooms whose owner went away."""
+        lost = await self.renew(manager.leased_rooms())
+        for room_id in lost:
+            logger.warning(f"Lost the lease on room {room_id}; stopping the local runner")
+            await manager.abandon(room_id)
+
+        for room_id, status in await self.expired():
+            # Queued rooms hold leases too (a drained worker expires them for us), so re-admit them.
+            if status not in ("running", "paused", "queued"):
+                await self.drop_expired(room_id)
+            elif await self.acquire(room_id):
+                logger.warning(f"Taking over room {room_id} from an expired lease")
+                await manager.start(room_id, reset=False, paused=status == "paused")
+
+    async def run(self, manager: "SimulationManager"):
+        last_heartbeat = 0.0
+        last_prune = time.monotonic()
+        while True:
+            try:
+                await self.process_commands(manager)
+                now = time.monotonic()
+                if now - last_heartbeat >= self.heartbeat_interval:
+                    last_heartbeat = now
+                    await self.heartbeat(manager)
+                if now - last_prune >= 3600:
+                    last_prune = now
+                    await self.prune_commands()
+            except Exception:
+                logger.exception("Simulation lease loop failed; retrying")
+            await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _Call:
+    task: asyncio.Future
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one in-flight execution.
+
+    The first caller for a key starts ``fn`` as a task; callers arriving while it is still
+    running await the same task and receive its result (or exception). The shared task is
+    shielded from any single caller's cancellation and is only cancelled once every caller
+    waiting on it has gone away.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, _Call] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "executed": self.executed, "coalesced": self.coalesced}
+
+
+llm_singleflight = SingleFlight()
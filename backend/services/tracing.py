@@ -0,0 +1,214 @@
+"""Lightweight tracing: nested spans via contextvars, a ring buffer of recent traces, and exporters.
+
+Every simulation turn is its own trace, and so is every HTTP request. Finished spans are
+kept in memory (the most recent ``TRACING_BUFFER_TRACES`` traces) so any single turn can be
+inspected through the admin API, and are optionally shipped in batches to a JSON-lines file
+or an OTLP/HTTP (JSON) collector.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import secrets
+import time
+import urllib.request
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int | None = None
+    attributes: dict = field(default_factory=dict)
+    status: str = "ok"
+
+    @property
+    def duration_ms(self) -> float | None:
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "duration_ms": self.duration_ms}
+
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+class FileSpanExporter:
+    """Appends one JSON object per span to a local file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def export(self, spans: list[Span]):
+        with self.path.open("a") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPHttpSpanExporter:
+    """Posts spans to an OTLP/HTTP collector using the JSON encoding (``/v1/traces``)."""
+
+    def __init__(self, endpoint: str, service_name: str = "agent-nebula", timeout: float = 5):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def encode(self, spans: list[Span]) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+            "scopeSpans": [{
+                "scope": {"name": "agent-nebula"},
+                "spans": [
+                    {
+                        "traceId": s.trace_id,
+                        "spanId": s.span_id,
+                        **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                        "name": s.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(s.start_ns),
+                        "endTimeUnixNano": str(s.end_ns),
+                        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                        "status": {"code": 2 if s.status == "error" else 1},
+                    }
+                    for s in spans
+                ],
+            }],
+        }]}
+
+    def export(self, spans: list[Span]):
+        body = json.dumps(self.encode(spans)).encode()
+        req = urllib.request.Request(
+            self.endpoint, data=body, method="POST", headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(req, timeout=self.timeout):
+            pass
+
+
+class Tracer:
+    def __init__(self, max_traces: int = 2000, exporter=None, batch_size: int = 512, flush_interval: float = 2.0):
+        self.max_traces = max_traces
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._traces: OrderedDict[str, list[Span]] = OrderedDict()
+        self._pending: list[Span] = []
+        self.dropped = 0
+
+    @classmethod
+    def from_settings(cls) -> "Tracer":
+        exporter = None
+        if settings.TRACING_EXPORTER == "file":
+            exporter = FileSpanExporter(settings.TRACING_FILE)
+        elif settings.TRACING_EXPORTER == "otlp":
+            exporter = OTLPHttpSpanExporter(settings.TRACING_OTLP_ENDPOINT)
+        return cls(max_traces=settings.TRACING_BUFFER_TRACES, exporter=exporter)
+
+    @contextlib.contextmanager
+    def span(self, name: str, new_trace: bool = False, **attributes):
+        """Open a span as a child of the current one (or as the root of a new trace)."""
+        parent = None if new_trace else _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.attributes.setdefault("error", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            self._finish(span)
+
+    def child_span(self, name: str, **attributes):
+        """Like :meth:`span`, but a no-op outside an active trace (for helpers called from anywhere)."""
+        if _current_span.get() is None:
+            return contextlib.nullcontext()
+        return self.span(name, **attributes)
+
+    def _finish(self, span: Span):
+        trace = self._traces.get(span.trace_id)
+        if trace is None:
+            trace = self._traces[span.trace_id] = []
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+        trace.append(span)
+        if self.exporter is not None:
+            if len(self._pending) >= self.batch_size * 20:
+                self.dropped += 1
+            else:
+                self._pending.append(span)
+
+    def get_trace(self, trace_id: str) -> list[Span] | None:
+        spans = self._traces.get(trace_id)
+        return sorted(spans, key=lambda s: s.start_ns) if spans else None
+
+    def recent_traces(
+        self, root_name: str | None = None, min_duration_ms: float = 0, limit: int | None = 50,
+    ) -> list[Span]:
+        """Root spans of buffered traces, slowest first."""
+        roots = [
+            s for spans in self._traces.values() for s in spans
+            if s.parent_id is None and (root_name is None or s.name == root_name)
+            and (s.duration_ms or 0) >= min_duration_ms
+        ]
+        roots.sort(key=lambda s: s.duration_ms or 0, reverse=True)
+        return roots[:limit]
+
+    async def flush(self):
+        if self.exporter is None or not self._pending:
+            return
+        while self._pending:
+            batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+            try:
+                await asyncio.to_thread(self.exporter.export, batch)
+            except Exception as e:
+                logger.warning(f"Failed to export {len(batch)} spans: {e}")
+
+    async def run_exporter(self):
+        """Background task: flush finished spans to the exporter every ``flush_interval`` seconds."""
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+        finally:
+            await self.flush()
+
+
+tracer = Tracer.from_settings()
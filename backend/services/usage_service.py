@@ -0,0 +1,120 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models.agent import Agent
+from models.message import Message
+from models.room import Room
+
+ORDER_KEYS = {"tokens": "total_tokens", "cost": "cost_usd", "latency": "latency_ms_total"}
+
+
+def lookup_price(model: str | None, price_table: dict) -> dict | None:
+    """Price entry for a model, matched exactly or without its provider prefix (``openai/gpt-5.2`` -> ``gpt-5.2``)."""
+    if not model:
+        return None
+    if model in price_table:
+        return price_table[model]
+    return price_table.get(model.split("/", 1)[-1])
+
+
+def token_cost(
+    price: dict, input_tokens: int, output_tokens: int, cached_tokens: int,
+) -> float:
+    """USD cost given per-million-token prices; cached input falls back to the input price."""
+    input_price = price.get("input", 0)
+    cached_price = price.get("cached_input", input_price)
+    return (
+        (input_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + output_tokens * price.get("output", 0)
+    ) / 1_000_000
+
+
+class UsageService:
+    def __init__(self, db: AsyncSession, price_table: dict | None = None):
+        self.db = db
+        self.price_table = settings.LLM_PRICE_TABLE if price_table is None else price_table
+
+    async def by_agent(self, room_id: str | None = None, order_by: str = "tokens", limit: int = 50) -> list[dict]:
+        stmt = (
+            select(Message.agent_id, Agent.name, *self._usage_columns())
+            .join(Agent, Agent.id == Message.agent_id)
+            .group_by(Message.agent_id, Agent.name, Message.model_used)
+        )
+        if room_id:
+            stmt = stmt.where(Message.room_id == room_id)
+        return await self._summarize(stmt, order_by, limit)
+
+    async def by_room(self, order_by: str = "tokens", limit: int = 50) -> list[dict]:
+        stmt = (
+            select(Message.room_id, Room.name, *self._usage_columns())
+            .join(Room, Room.id == Message.room_id)
+            .group_by(Message.room_id, Room.name, Message.model_used)
+        )
+        return await self._summarize(stmt, order_by, limit)
+
+    async def by_run(self, room_id: str | None = None, order_by: str = "tokens", limit: int = 50) -> list[dict]:
+        stmt = (
+            select(Message.run_id, Room.name, *self._usage_columns(), Message.room_id)
+            .join(Room, Room.id == Message.room_id)
+            .where(Message.run_id.is_not(None))
+            .group_by(Message.run_id, Message.room_id, Room.name, Message.model_used)
+        )
+        if room_id:
+            stmt = stmt.where(Message.room_id == room_id)
+        return await self._summarize(stmt, order_by, limit)
+
+    @staticmethod
+    def _usage_columns():
+        return (
+            Message.model_used,
+            func.count(Message.id),
+            func.coalesce(func.sum(Message.input_tokens), 0),
+            func.coalesce(func.sum(Message.output_tokens), 0),
+            func.coalesce(func.sum(Message.cached_tokens), 0),
+            func.coalesce(func.sum(Message.latency_ms), 0.0),
+            func.min(Message.created_at),
+            func.max(Message.created_at),
+        )
+
+    async def _summarize(self, stmt, order_by: str, limit: int) -> list[dict]:
+        """Fold per-(group, model) rows into one row per group, pricing each model separately."""
+        stmt = stmt.where(Message.role == "assistant")
+        groups: dict[str, dict] = {}
+        for row in (await self.db.execute(stmt)).all():
+            key, name, model, count, input_tokens, output_tokens, cached_tokens, latency, first, last = row[:10]
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {
+                    "id": key, "name": name, "messages": 0, "models": [],
+                    "input_tokens": 0, "output_tokens": 0, "cached_tokens": 0, "total_tokens": 0,
+                    "latency_ms_total": 0.0, "cost_usd": 0.0, "unpriced_messages": 0,
+                    "first_message_at": first, "last_message_at": last,
+                }
+                if len(row) > 10:
+                    group["room_id"] = row[10]
+            group["messages"] += count
+            group["input_tokens"] += input_tokens
+            group["output_tokens"] += output_tokens
+            group["cached_tokens"] += cached_tokens
+            group["total_tokens"] += input_tokens + output_tokens
+            group["latency_ms_total"] += latency
+            group["first_message_at"] = min(group["first_message_at"], first)
+            group["last_message_at"] = max(group["last_message_at"], last)
+            if model and model not in group["models"]:
+                group["models"].append(model)
+            price = lookup_price(model, self.price_table)
+            if price is None:
+                if input_tokens or output_tokens:
+                    group["unpriced_messages"] += count
+            else:
+                group["cost_usd"] += token_cost(price, input_tokens, output_tokens, cached_tokens)
+
+        rows = list(groups.values())
+        for row in rows:
+            row["models"].sort()
+            row["latency_ms_avg"] = row["latency_ms_total"] / row["messages"] if row["messages"] else 0.0
+            row["cost_usd"] = round(row["cost_usd"], 6)
+        rows.sort(key=lambda r: r[ORDER_KEYS[order_by]], reverse=True)
+        return rows[:limit]
@@ -0,0 +1,82 @@
+"""Fixtures and helpers shared by the simulation tests."""
+
+import pytest
+import pytest_asyncio
+
+from conftest import TestSessionLocal
+from models.room import Room
+from services import simulation_engine
+from services.simulation_engine import SimulationManager
+
+
+class FakeAgentModel:
+    name = "Bot"
+    model = "litellm/openai/gpt-5.2"
+    system_prompt = "Be brief."
+    llm_timeout_seconds = None
+
+    def __init__(self, fallback_models=None):
+        self.fallback_models = fallback_models or []
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent: list[str] = []
+        self.closed = False
+
+    async def send_text(self, data: str):
+        if self.closed:
+            raise RuntimeError("WebSocket closed")
+        self.sent.append(data)
+
+
+@pytest.fixture
+def engine_db(monkeypatch):
+    """Point the simulation engine's sessions at the test database."""
+    monkeypatch.setattr(simulation_engine, "async_session", TestSessionLocal)
+
+
+@pytest_asyncio.fixture
+async def fresh_manager(engine_db):
+    """A new ``SimulationManager`` singleton; its simulations are stopped after the test."""
+    SimulationManager._instance = None
+    mgr = SimulationManager()
+    yield mgr
+    for room_id in list(mgr.simulations):
+        await mgr.stop(room_id)
+    SimulationManager._instance = None
+
+
+async def create_room_with_agent(client) -> tuple[str, str]:
+    agent_resp = await client.post("/api/agents", json={
+        "name": "Bot", "system_prompt": "Say hello", "model": "litellm/openai/gpt-5.2"
+    })
+    agent_id = agent_resp.json()["id"]
+
+    room_resp = await client.post("/api/rooms", json={"name": "Room"})
+    room_id = room_resp.json()["id"]
+
+    await client.post(f"/api/rooms/{room_id}/agents", json={"agent_id": agent_id})
+    return room_id, agent_id
+
+
+async def make_room(client, max_turns: int = 5, agents=("Ada",), **options) -> str:
+    room = await client.post("/api/rooms", json={"name": "Room", "max_turns": max_turns, **options})
+    room_id = room.json()["id"]
+    for name in agents:
+        agent = await client.post("/api/agents", json={"name": name, "system_prompt": "p", "model": "m"})
+        await client.post(f"/api/rooms/{room_id}/agents", json={"agent_id": agent.json()["id"]})
+    return room_id
+
+
+async def message_contents(client, room_id: str) -> list[str]:
+    return [m["content"] for m in (await client.get(f"/api/messages/{room_id}")).json()["messages"]]
+
+
+async def create_room_with_status(status: str = "running", turn: int = 0) -> str:
+    """A room row written straight to the test database, without agents."""
+    async with TestSessionLocal() as db:
+        room = Room(name="R", status=status, current_turn_index=turn)
+        db.add(room)
+        await db.commit()
+        return room.id
@@ -0,0 +1,144 @@
+"""Tests for the simulation start cap and queue."""
+
+import asyncio
+from collections import defaultdict
+
+import pytest_asyncio
+
+from config import settings
+from conftest import TestSessionLocal
+from models.room import Room
+from services import simulation_engine
+from services.simulation_engine import QueuedStart, SimulationManager, SimulationRunner, StartQueue
+from tests.conftest import create_room_with_agent
+
+
+@pytest_asyncio.fixture
+async def manager(fresh_manager, monkeypatch):
+    """A fresh manager capped at one running simulation; each runner waits for ``releases[room_id]``."""
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_SIMULATIONS", 1)
+    broadcasts = []
+
+    async def broadcast(room_id, data):
+        broadcasts.append((room_id, data))
+
+    monkeypatch.setattr(simulation_engine.ws_manager, "broadcast", broadcast)
+    releases: defaultdict[str, asyncio.Event] = defaultdict(asyncio.Event)
+
+    async def run(self):
+        await releases[self.room_id].wait()
+
+    monkeypatch.setattr(SimulationRunner, "run", run)
+    mgr = fresh_manager
+    mgr.releases = releases
+    mgr.broadcasts = broadcasts
+    yield mgr
+    mgr.queue = StartQueue()
+    for room_id in list(mgr.simulations):
+        await mgr.stop(room_id)
+    await asyncio.gather(*mgr._admitting)
+
+
+async def finish(mgr: SimulationManager, room_id: str):
+    mgr.releases[room_id].set()
+    await mgr.simulations[room_id].task
+    await asyncio.sleep(0)
+    await asyncio.gather(*mgr._admitting)
+
+
+async def make_rooms(n: int) -> list[str]:
+    async with TestSessionLocal() as db:
+        rooms = [Room(name=f"R{i}") for i in range(n)]
+        db.add_all(rooms)
+        await db.commit()
+        return [room.id for room in rooms]
+
+
+async def room_status(room_id: str) -> str:
+    async with TestSessionLocal() as db:
+        return (await db.get(Room, room_id)).status
+
+
+class TestStartQueue:
+    def test_priority_then_fifo(self):
+        queue = StartQueue()
+        assert queue.push(QueuedStart("a")) == 1
+        assert queue.push(QueuedStart("b")) == 2
+        assert queue.push(QueuedStart("urgent", priority=5)) == 1
+        assert queue.push(QueuedStart("c")) == 4
+        assert [e.room_id for e in queue.entries] == ["urgent", "a", "b", "c"]
+        assert queue.position("b") == 3
+        assert queue.remove("a").room_id == "a"
+        assert queue.pop().room_id == "urgent"
+        assert "b" in queue and "a" not in queue
+
+
+class TestAdmission:
+    async def test_starts_beyond_cap_are_queued(self, manager):
+        first, second, third = await make_rooms(3)
+        assert await manager.start(first)
+        assert await manager.start(second)
+        assert await manager.start(third, priority=1)
+
+        assert manager.running_count == 1
+        assert manager.queue_position(third) == 1
+        assert manager.queue_position(second) == 2
+        assert await room_status(second) == "queued"
+        assert (second, {"type": "status", "status": "queued", "queue_position": 1}) in manager.broadcasts
+        assert not await manager.start(second)  # already queued
+
+    async def test_finished_runner_admits_next_and_updates_positions(self, manager):
+        first, second, third = await make_rooms(3)
+        for room_id in (first, second, third):
+            await manager.start(room_id)
+
+        await finish(manager, first)
+        assert manager.simulations[second].active
+        assert third not in manager.simulations
+        assert manager.queue_position(third) == 1
+        assert manager.broadcasts[-1] == (third, {"type": "status", "status": "queued", "queue_position": 1})
+
+        await finish(manager, second)
+        assert manager.simulations[third].active
+        assert len(manager.queue) == 0
+
+    async def test_stopped_runner_frees_its_slot(self, manager):
+        first, second = await make_rooms(2)
+        await manager.start(first)
+        await manager.start(second)
+        await manager.stop(first)
+        await asyncio.sleep(0)
+        await asyncio.gather(*manager._admitting)
+        assert manager.simulations[second].active
+
+    async def test_stopping_queued_room_removes_it(self, manager):
+        first, second = await make_rooms(2)
+        await manager.start(first)
+        await manager.start(second)
+        assert await manager.stop(second)
+        assert manager.queue_position(second) is None
+        assert await room_status(second) == "stopped"
+
+    async def test_no_cap_by_default(self, manager, monkeypatch):
+        monkeypatch.setattr(settings, "MAX_CONCURRENT_SIMULATIONS", 0)
+        rooms = await make_rooms(3)
+        for room_id in rooms:
+            assert await manager.start(room_id)
+        assert manager.running_count == 3
+        assert len(manager.queue) == 0
+
+
+class TestQueueAPI:
+    async def test_start_reports_queue_position(self, client, manager, monkeypatch):
+        from routers import simulation as simulation_router
+
+        monkeypatch.setattr(simulation_router, "simulation_manager", manager)
+        room_ids = [(await create_room_with_agent(client))[0] for _ in range(2)]
+
+        assert (await client.post(f"/api/simulation/{room_ids[0]}/start")).json() == {"status": "started"}
+        response = await client.post(f"/api/simulation/{room_ids[1]}/start")
+        assert response.json() == {"status": "queued", "queue_position": 1}
+
+        status = (await client.get(f"/api/simulation/{room_ids[1]}/status")).json()
+        assert status["status"] == "queued"
+        assert status["queue_position"] == 1
@@ -0,0 +1,91 @@
+"""Integration tests for the admin endpoints."""
+
+
+class TestLLMCacheAdmin:
+    async def test_stats(self, admin_client):
+        response = await admin_client.get("/api/admin/llm-cache")
+        assert response.status_code == 200
+        data = response.json()
+        assert "enabled" in data
+        assert "hit_ratio" in data
+
+    async def test_clear(self, admin_client):
+        response = await admin_client.delete("/api/admin/llm-cache")
+        assert response.status_code == 204
+
+
+class TestCircuitBreakerAdmin:
+    async def test_list_and_reset(self, admin_client, monkeypatch):
+        from routers import admin
+        from services.circuit_breaker import BreakerRegistry
+
+        registry = BreakerRegistry()
+        monkeypatch.setattr(admin, "circuit_breakers", registry)
+        registry.get("openai/gpt-5.2")._open("test")
+
+        response = await admin_client.get("/api/admin/circuit-breakers")
+        assert response.status_code == 200
+        assert response.json()[0]["state"] == "open"
+
+        response = await admin_client.post("/api/admin/circuit-breakers/openai/gpt-5.2/reset")
+        assert response.status_code == 200
+        assert response.json()["state"] == "closed"
+
+    async def test_reset_unknown(self, admin_client):
+        response = await admin_client.post("/api/admin/circuit-breakers/nope/reset")
+        assert response.status_code == 404
+
+
+class TestSimulationsAdmin:
+    async def test_list_and_bulk(self, admin_client, engine_db, monkeypatch):
+        import asyncio
+
+        from services.simulation_engine import SimulationRunner, simulation_manager
+
+        runners = {}
+        for room_id in ("room-a", "room-b"):
+            runner = SimulationRunner(room_id)
+            runner.task = asyncio.create_task(asyncio.sleep(10))
+            runners[room_id] = runner
+        monkeypatch.setattr(simulation_manager, "simulations", dict(runners))
+
+        response = await admin_client.get("/api/admin/simulations")
+        assert response.status_code == 200
+        assert {r["room_id"]: r["state"] for r in response.json()} == {"room-a": "running", "room-b": "running"}
+
+        response = await admin_client.post("/api/admin/simulations/bulk", json={
+            "action": "pause", "room_ids": ["room-a", "missing"],
+        })
+        assert response.json() == {"action": "pause", "succeeded": ["room-a"], "failed": ["missing"]}
+        assert not runners["room-a"].pause_event.is_set()
+
+        response = await admin_client.post("/api/admin/simulations/bulk", json={"action": "stop"})
+        assert sorted(response.json()["succeeded"]) == ["room-a", "room-b"]
+        assert simulation_manager.simulations == {}
+        assert all(r.task.cancelled() for r in runners.values())
+
+    async def test_bulk_rejects_unknown_action(self, admin_client):
+        response = await admin_client.post("/api/admin/simulations/bulk", json={"action": "explode"})
+        assert response.status_code == 422
+
+
+class TestAdminAuth:
+    async def test_bulk_stop_requires_token(self, client, monkeypatch):
+        from config import settings
+        from services.simulation_engine import simulation_manager
+
+        async def bulk(action, room_ids=None):
+            raise AssertionError("bulk action ran without a valid admin token")
+
+        monkeypatch.setattr(simulation_manager, "bulk", bulk)
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        response = await client.post("/api/admin/simulations/bulk", json={"action": "stop"})
+        assert response.status_code == 401
+        response = await client.post(
+            "/api/admin/simulations/bulk", json={"action": "stop"}, headers={"X-Admin-Token": "nope"},
+        )
+        assert response.status_code == 401
+
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+        response = await client.post("/api/admin/simulations/bulk", json={"action": "stop"})
+        assert response.status_code == 403
@@ -77,6 +77,18 @@ class TestAgentsAPI:
         response = await client.delete("/api/agents/nonexistent")
         assert response.status_code == 404
 
+    async def test_create_agent_with_fallback_models(self, client):
+        response = await client.post("/api/agents", json={
+            "name": "Bot", "system_prompt": "p", "model": "litellm/openai/gpt-5.2",
+            "fallback_models": ["litellm/openrouter/openai/gpt-5.2"],
+        })
+        assert response.status_code == 201
+        agent_id = response.json()["id"]
+        assert response.json()["fallback_models"] == ["litellm/openrouter/openai/gpt-5.2"]
+
+        response = await client.put(f"/api/agents/{agent_id}", json={"fallback_models": []})
+        assert response.json()["fallback_models"] == []
+
     async def test_create_agent_missing_field(self, client):
         response = await client.post("/api/agents", json={
             "name": "Bot", "system_prompt": "p"
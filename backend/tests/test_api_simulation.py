@@ -1,23 +1,14 @@
 """Integration tests for the simulation API endpoints."""
 
+import asyncio
 
-
-async def _create_room_with_agent(client):
-    agent_resp = await client.post("/api/agents", json={
-        "name": "Bot", "system_prompt": "Say hello", "model": "litellm/openai/gpt-5.2"
-    })
-    agent_id = agent_resp.json()["id"]
-
-    room_resp = await client.post("/api/rooms", json={"name": "Room"})
-    room_id = room_resp.json()["id"]
-
-    await client.post(f"/api/rooms/{room_id}/agents", json={"agent_id": agent_id})
-    return room_id, agent_id
+from services.simulation_engine import SimulationRunner, simulation_manager
+from tests.conftest import create_room_with_agent
 
 
 class TestSimulationAPI:
     async def test_get_status(self, client):
-        room_id, _ = await _create_room_with_agent(client)
+        room_id, _ = await create_room_with_agent(client)
 
         response = await client.get(f"/api/simulation/{room_id}/status")
         assert response.status_code == 200
@@ -60,11 +51,47 @@ class TestSimulationAPI:
         assert response.status_code == 400
 
     async def test_inject_missing_content(self, client):
-        room_id, _ = await _create_room_with_agent(client)
+        room_id, _ = await create_room_with_agent(client)
         response = await client.post(f"/api/simulation/{room_id}/inject", json={})
         assert response.status_code == 422
 
 
+class TestStatusEndpoints:
+    async def test_live_runner_served_from_memory(self, client, monkeypatch):
+        room_id, _ = await create_room_with_agent(client)
+        runner = SimulationRunner(room_id)
+        runner.task = asyncio.create_task(asyncio.sleep(10))
+        runner.loaded = True
+        runner.current_turn_index, runner.max_turns = 7, 20
+        monkeypatch.setattr(simulation_manager, "simulations", {room_id: runner})
+        try:
+            data = (await client.get(f"/api/simulation/{room_id}/status")).json()
+            assert data == {
+                "room_id": room_id, "status": "running", "current_turn_index": 7, "max_turns": 20, "queue_position": None,
+            }
+
+            runner.pause_event.clear()
+            data = (await client.get(f"/api/simulation/{room_id}/status")).json()
+            assert data["status"] == "paused"
+        finally:
+            runner.task.cancel()
+
+    async def test_batch_status(self, client):
+        first, _ = await create_room_with_agent(client)
+        second, _ = await create_room_with_agent(client)
+
+        response = await client.get(
+            "/api/simulation/status", params=[("room_ids", f"{first},missing"), ("room_ids", second)],
+        )
+        assert response.status_code == 200
+        assert [s["room_id"] for s in response.json()] == [first, second]
+        assert all(s["status"] == "idle" for s in response.json())
+
+    async def test_batch_status_requires_ids(self, client):
+        response = await client.get("/api/simulation/status")
+        assert response.status_code == 422
+
+
 class TestHealthEndpoint:
     async def test_health(self, client):
         response = await client.get("/api/health")
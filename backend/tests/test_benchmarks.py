@@ -0,0 +1,30 @@
+"""Tests for the shared benchmark helpers."""
+
+from benchmarks.common import PhaseTimer, parse_int_list, summarize
+
+
+class TestSummarize:
+    def test_empty(self):
+        assert summarize([]) == {"count": 0}
+
+    def test_percentiles_in_milliseconds(self):
+        result = summarize([i / 1000 for i in range(1, 101)])
+        assert result["count"] == 100
+        assert result["p50_ms"] == 51.0
+        assert result["p99_ms"] == 99.0
+        assert result["max_ms"] == 100.0
+
+    def test_parse_int_list(self):
+        assert parse_int_list("1,10, 100,") == [1, 10, 100]
+
+
+class TestPhaseTimer:
+    def test_measure_records_samples(self):
+        timer = PhaseTimer()
+        with timer.measure("build"):
+            pass
+        timer.record("build", 0.5)
+        summary = timer.summary()
+        assert summary["build"]["count"] == 2
+        timer.reset()
+        assert timer.summary() == {}
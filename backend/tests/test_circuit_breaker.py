@@ -0,0 +1,129 @@
+"""Tests for per-model circuit breakers and fallback model selection."""
+
+import time
+
+import openai
+import pytest
+
+from services import simulation_engine
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker, CircuitOpenError
+from services.llm_cache import LLMResponseCache
+from services.llm_resilience import CallPolicy
+from services.simulation_engine import LLMResult, SimulationRunner
+from tests.conftest import FakeAgentModel
+
+
+def _expire(breaker: CircuitBreaker):
+    breaker.opened_at = time.monotonic() - breaker.open_seconds - 1
+
+
+class TestCircuitBreaker:
+    def test_trips_on_error_rate(self):
+        breaker = CircuitBreaker("openai/m", window=10, min_calls=4, error_rate=0.5)
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+        assert breaker.snapshot()["open_reason"] == "error rate 2/4"
+
+    def test_trips_on_slow_calls(self):
+        breaker = CircuitBreaker("openai/m", min_calls=2, slow_call_seconds=1, slow_call_rate=0.5)
+        breaker.record_success(0.1)
+        breaker.record_success(5)
+        assert breaker.state == OPEN
+
+    def test_half_open_allows_one_probe(self):
+        breaker = CircuitBreaker("openai/m", min_calls=1)
+        breaker.record_failure()
+        _expire(breaker)
+        assert breaker.allow_request()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow_request()
+
+    def test_successful_probe_closes(self):
+        breaker = CircuitBreaker("openai/m", min_calls=1)
+        breaker.record_failure()
+        _expire(breaker)
+        breaker.allow_request()
+        breaker.record_success(0.1)
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["window_calls"] == 0
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("openai/m", min_calls=1)
+        breaker.record_failure()
+        _expire(breaker)
+        breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.times_opened == 2
+
+    def test_ignored_probe_releases_slot(self):
+        breaker = CircuitBreaker("openai/m", min_calls=1)
+        breaker.record_failure()
+        _expire(breaker)
+        breaker.allow_request()
+        breaker.record_ignored()
+        assert breaker.allow_request()
+
+    def test_registry_snapshot(self):
+        registry = BreakerRegistry()
+        registry.get("openrouter/x")
+        registry.get("openai/y")
+        snap = registry.snapshot()
+        assert [b["name"] for b in snap] == ["openai/y", "openrouter/x"]
+        assert snap[0]["provider"] == "openai"
+
+
+class TestFallback:
+    @pytest.fixture
+    def runner(self, monkeypatch):
+        monkeypatch.setattr(simulation_engine, "llm_cache", LLMResponseCache(enabled=False))
+        monkeypatch.setattr(simulation_engine, "circuit_breakers", BreakerRegistry())
+        runner = SimulationRunner("room-1")
+        runner.coalesce_llm_requests = False
+        return runner
+
+    def _fake_run_agent(self, monkeypatch, failing: set[str]):
+        calls = []
+
+        async def fake_run_agent(self, name, model_str, instructions, input_messages):
+            calls.append(model_str)
+            if model_str in failing:
+                raise openai.APIConnectionError(request=None)
+            return LLMResult(f"from {model_str}")
+
+        monkeypatch.setattr(SimulationRunner, "_run_agent", fake_run_agent)
+        return calls
+
+    async def test_fallback_used_when_primary_fails(self, runner, monkeypatch):
+        self._fake_run_agent(monkeypatch, failing={"openai/gpt-5.2"})
+        agent = FakeAgentModel(fallback_models=["litellm/openrouter/backup"])
+        result = await runner._call_with_fallback(agent, [], CallPolicy())
+        assert result.text == "from openrouter/backup"
+        assert result.model_used == "openrouter/backup"
+        breakers = simulation_engine.circuit_breakers.breakers
+        assert breakers["openai/gpt-5.2"].snapshot()["window_failures"] == 1
+
+    async def test_open_primary_is_skipped(self, runner, monkeypatch):
+        calls = self._fake_run_agent(monkeypatch, failing=set())
+        primary = simulation_engine.circuit_breakers.get("openai/gpt-5.2")
+        primary._open("test")
+        agent = FakeAgentModel(fallback_models=["openrouter/backup"])
+        result = await runner._call_with_fallback(agent, [], CallPolicy())
+        assert result.text == "from openrouter/backup"
+        assert calls == ["openrouter/backup"]
+
+    async def test_all_open_raises(self, runner, monkeypatch):
+        self._fake_run_agent(monkeypatch, failing=set())
+        simulation_engine.circuit_breakers.get("openai/gpt-5.2")._open("test")
+        with pytest.raises(CircuitOpenError):
+            await runner._call_with_fallback(FakeAgentModel(), [], CallPolicy())
+
+    async def test_error_without_fallback_propagates(self, runner, monkeypatch):
+        self._fake_run_agent(monkeypatch, failing={"openai/gpt-5.2"})
+        with pytest.raises(openai.APIConnectionError):
+            await runner._call_with_fallback(FakeAgentModel(), [], CallPolicy())
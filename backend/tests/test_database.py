@@ -1,6 +1,12 @@
 """Tests for database configuration and initialization."""
 
-from sqlalchemy import text
+from sqlalchemy import Column, Integer, MetaData, String, Table, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database import _add_missing_columns, init_db
+from models.agent import Agent
+from models.message import Message
+from models.room import Room
 
 
 class TestDatabase:
@@ -48,3 +54,69 @@ class TestDatabase:
         assert "role" in columns
         assert "content" in columns
         assert "turn_number" in columns
+
+
+BASELINE_SCHEMA = [
+    """CREATE TABLE agents (
+        id VARCHAR(36) NOT NULL, name VARCHAR(100) NOT NULL, system_prompt TEXT NOT NULL,
+        model VARCHAR(200) NOT NULL, created_at DATETIME NOT NULL, PRIMARY KEY (id))""",
+    """CREATE TABLE rooms (
+        id VARCHAR(36) NOT NULL, name VARCHAR(200) NOT NULL, description TEXT, status VARCHAR(20) NOT NULL,
+        current_turn_index INTEGER NOT NULL, max_turns INTEGER NOT NULL, created_at DATETIME NOT NULL,
+        PRIMARY KEY (id))""",
+    """CREATE TABLE messages (
+        id VARCHAR(36) NOT NULL, room_id VARCHAR(36) NOT NULL, agent_id VARCHAR(36), role VARCHAR(20) NOT NULL,
+        content TEXT NOT NULL, turn_number INTEGER NOT NULL, created_at DATETIME NOT NULL, PRIMARY KEY (id),
+        FOREIGN KEY(room_id) REFERENCES rooms (id) ON DELETE CASCADE,
+        FOREIGN KEY(agent_id) REFERENCES agents (id) ON DELETE SET NULL)""",
+    """CREATE TABLE room_agents (
+        id INTEGER NOT NULL, room_id VARCHAR(36) NOT NULL, agent_id VARCHAR(36) NOT NULL,
+        turn_order INTEGER NOT NULL, PRIMARY KEY (id),
+        CONSTRAINT uq_room_agent UNIQUE (room_id, agent_id), CONSTRAINT uq_room_turn_order UNIQUE (room_id, turn_order),
+        FOREIGN KEY(room_id) REFERENCES rooms (id) ON DELETE CASCADE,
+        FOREIGN KEY(agent_id) REFERENCES agents (id) ON DELETE CASCADE)""",
+    "INSERT INTO agents VALUES ('a1', 'Ada', 'p', 'gpt-4o', '2024-01-01 00:00:00')",
+    "INSERT INTO rooms VALUES ('r1', 'Old', '', 'idle', 2, 20, '2024-01-01 00:00:00')",
+    "INSERT INTO messages VALUES ('m1', 'r1', 'a1', 'assistant', 'hi', 0, '2024-01-01 00:00:00')",
+]
+
+
+class TestSchemaUpgrade:
+    async def test_baseline_database_gains_new_columns(self, tmp_path):
+        old_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+        async with old_engine.begin() as conn:
+            for statement in BASELINE_SCHEMA:
+                await conn.execute(text(statement))
+
+        await init_db(old_engine)
+        await init_db(old_engine)  # idempotent
+
+        session = async_sessionmaker(old_engine, expire_on_commit=False)
+        async with session() as db:
+            room = await db.get(Room, "r1")
+            assert (room.coalesce_llm_requests, room.hedge_llm_requests) == (True, False)
+            assert (room.turn_mode, room.round_order, room.llm_timeout_seconds) == ("sequential", "turn", None)
+            agent = await db.get(Agent, "a1")
+            assert agent.fallback_models == []
+            msg = await db.get(Message, "m1")
+            assert (msg.input_tokens, msg.trace_id, msg.run_id) == (0, None, None)
+            db.add(Room(name="New"))
+            await db.commit()
+            indexes = await db.execute(text("PRAGMA index_list(messages)"))
+            assert "ix_messages_run_id" in {row[1] for row in indexes}
+        await old_engine.dispose()
+
+    async def test_non_null_column_without_default_is_not_backfilled(self, tmp_path):
+        old_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+        async with old_engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE things (id INTEGER PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO things (id) VALUES (1)"))
+
+        metadata = MetaData()
+        Table("things", metadata, Column("id", Integer, primary_key=True), Column("label", String, nullable=False))
+        async with old_engine.begin() as conn:
+            await conn.run_sync(_add_missing_columns, metadata)
+            rows = (await conn.execute(text("SELECT id, label FROM things"))).all()
+        assert rows == [(1, None)]
+        await old_engine.dispose()
+
@@ -0,0 +1,135 @@
+"""Tests for draining simulations and WebSocket clients on shutdown."""
+
+import asyncio
+import json
+
+import pytest
+
+from conftest import TestSessionLocal
+from models.room import Room
+from services import simulation_engine
+from services.simulation_engine import ConnectionManager
+from tests.conftest import FakeWebSocket, make_room, message_contents
+
+
+@pytest.fixture
+def manager(fresh_manager, monkeypatch):
+    monkeypatch.setattr(simulation_engine.settings, "SIMULATION_TURN_DELAY", 30)
+    monkeypatch.setattr(simulation_engine.settings, "MAX_CONCURRENT_SIMULATIONS", 0)
+    return fresh_manager
+
+
+def blocking_llm(monkeypatch) -> tuple[asyncio.Event, asyncio.Event]:
+    """Stub the LLM so each call signals ``called`` and waits for ``release``."""
+    called, release = asyncio.Event(), asyncio.Event()
+
+    async def fake_call_llm(self, agent_model, history):
+        called.set()
+        await release.wait()
+        return simulation_engine.LLMResult("done")
+
+    monkeypatch.setattr(simulation_engine.SimulationRunner, "_call_llm", fake_call_llm)
+    return called, release
+
+
+async def room_state(room_id: str) -> tuple[str, int]:
+    async with TestSessionLocal() as db:
+        room = await db.get(Room, room_id)
+        return room.status, room.current_turn_index
+
+
+class TestDrain:
+    async def test_in_flight_turn_finishes_and_room_stays_resumable(self, client, manager, monkeypatch):
+        room_id = await make_room(client)
+        called, release = blocking_llm(monkeypatch)
+        await manager.start(room_id)
+        await called.wait()
+        await manager.inject(room_id, "still here?")
+
+        drain = asyncio.create_task(manager.drain(timeout=5))
+        await asyncio.sleep(0)
+        assert not await manager.start(room_id)
+        release.set()
+        assert await drain == {"finished": 1, "interrupted": 0, "queued": 0}
+
+        assert await room_state(room_id) == ("running", 1)
+        assert await message_contents(client, room_id) == ["done", "still here?"]
+
+    async def test_turn_past_deadline_is_cancelled_without_stopping_room(self, client, manager, monkeypatch):
+        room_id = await make_room(client)
+        called, _release = blocking_llm(monkeypatch)
+        await manager.start(room_id)
+        await called.wait()
+        await manager.inject(room_id, "saved anyway")
+
+        assert await manager.drain(timeout=0.05) == {"finished": 0, "interrupted": 1, "queued": 0}
+        assert await room_state(room_id) == ("running", 0)
+        assert await message_contents(client, room_id) == ["saved anyway"]
+
+    async def test_paused_room_stays_paused(self, client, manager, monkeypatch):
+        room_id = await make_room(client)
+        blocking_llm(monkeypatch)
+        await manager.start(room_id, paused=True)
+        while not manager.simulations[room_id].loaded:
+            await asyncio.sleep(0.01)
+
+        assert (await manager.drain(timeout=5))["finished"] == 1
+        assert (await room_state(room_id))[0] == "paused"
+
+    async def test_start_endpoint_refuses_while_draining(self, client, manager, monkeypatch):
+        from routers import simulation as simulation_router
+
+        monkeypatch.setattr(simulation_router, "simulation_manager", manager)
+        room_id = await make_room(client)
+        await manager.drain(timeout=1)
+        response = await client.post(f"/api/simulation/{room_id}/start")
+        assert response.status_code == 503
+
+
+class TestCloseAll:
+    async def test_sends_reconnect_hint_then_closes_with_1012(self):
+        class ClosingWebSocket(FakeWebSocket):
+            close_code = None
+
+            async def close(self, code=1000, reason=None):
+                self.close_code = code
+
+        mgr = ConnectionManager()
+        ws = ClosingWebSocket()
+        await mgr.connect("room-1", ws)
+        await mgr.close_all(retry_after_ms=1500)
+
+        assert json.loads(ws.sent[-1]) == {"type": "reconnect", "retry_after_ms": 1500}
+        assert ws.close_code == 1012
+        assert mgr.rooms["room-1"] == []
+
+
+class TestUvicornShutdown:
+    async def test_reconnect_hint_sent_before_uvicorn_closes_sockets(self, monkeypatch):
+        import uvicorn
+        from websockets.asyncio.client import connect
+        from websockets.exceptions import ConnectionClosed
+
+        from main import Server, app
+
+        assert uvicorn.Server.shutdown.__module__ == "uvicorn.server"  # the library class is left alone
+        monkeypatch.setattr(simulation_engine.settings, "SHUTDOWN_RECONNECT_HINT_MS", 1234)
+        server = Server(uvicorn.Config(app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"))
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        port = server.servers[0].sockets[0].getsockname()[1]
+
+        async with connect(f"ws://127.0.0.1:{port}/ws/room-1") as ws:
+            while not simulation_engine.ws_manager.rooms.get("room-1"):
+                await asyncio.sleep(0.01)
+            server.should_exit = True  # what uvicorn's SIGTERM handler does
+            frames = []
+            try:
+                async for frame in ws:
+                    frames.append(json.loads(frame))
+            except ConnectionClosed:
+                pass
+            assert frames == [{"type": "reconnect", "retry_after_ms": 1234}]
+            assert ws.close_code == 1012
+        await serving
@@ -0,0 +1,84 @@
+"""Tests for injections that interrupt the in-flight LLM call."""
+
+import asyncio
+
+import pytest
+
+from routers import simulation as simulation_router
+from services import simulation_engine
+from tests.conftest import make_room, message_contents
+
+
+@pytest.fixture
+def manager(fresh_manager, monkeypatch):
+    monkeypatch.setattr(simulation_engine.settings, "SIMULATION_TURN_DELAY", 30)
+    monkeypatch.setattr(simulation_engine.settings, "MAX_CONCURRENT_SIMULATIONS", 0)
+    return fresh_manager
+
+
+def recording_llm(monkeypatch) -> tuple[list[list[str]], asyncio.Event]:
+    """Stub the LLM: the first call hangs until cancelled, later calls answer at once."""
+    calls: list[list[str]] = []
+    called = asyncio.Event()
+
+    async def fake_call_llm(self, agent_model, history):
+        calls.append([m["content"] for m in history])
+        called.set()
+        if len(calls) == 1:
+            await asyncio.Event().wait()
+        return simulation_engine.LLMResult(f"reply {len(calls)}")
+
+    monkeypatch.setattr(simulation_engine.SimulationRunner, "_call_llm", fake_call_llm)
+    return calls, called
+
+
+def recording_broadcasts(monkeypatch) -> list[dict]:
+    events = []
+
+    async def broadcast(room_id, message):
+        events.append(message)
+
+    monkeypatch.setattr(simulation_engine.ws_manager, "broadcast", broadcast)
+    return events
+
+
+class TestInterruptInject:
+    async def test_interrupt_saves_now_and_regenerates_reply(self, client, manager, monkeypatch):
+        room_id = await make_room(client, max_turns=1)
+        calls, called = recording_llm(monkeypatch)
+        await manager.start(room_id)
+        await called.wait()
+        events = recording_broadcasts(monkeypatch)
+
+        assert await manager.inject(room_id, "wait, consider cost", interrupt=True)
+        ack = next(e for e in events if e["type"] == "inject_ack")
+        assert ack["interrupted"] and len(ack["message_ids"]) == 1
+
+        await manager.simulations[room_id].task
+        assert calls == [[], ["[User]: wait, consider cost"]]
+        assert await message_contents(client, room_id) == ["wait, consider cost", "reply 2"]
+
+    async def test_queued_inject_waits_for_the_turn(self, client, manager, monkeypatch):
+        room_id = await make_room(client)
+        _calls, called = recording_llm(monkeypatch)
+        await manager.start(room_id)
+        await called.wait()
+
+        assert await manager.inject(room_id, "later")
+        assert await message_contents(client, room_id) == []
+        assert manager.simulations[room_id]._llm_tasks
+
+    async def test_api_passes_mode(self, client, monkeypatch):
+        received = []
+
+        async def fake_inject(room_id, content, interrupt=False):
+            received.append((content, interrupt))
+            return True
+
+        monkeypatch.setattr(simulation_router.simulation_manager, "inject", fake_inject)
+        for mode in (None, "queue", "interrupt"):
+            body = {"content": mode or "default"} | ({"mode": mode} if mode else {})
+            assert (await client.post("/api/simulation/r1/inject", json=body)).status_code == 200
+        assert received == [("default", False), ("queue", False), ("interrupt", True)]
+        resp = await client.post("/api/simulation/r1/inject", json={"content": "x", "mode": "shout"})
+        assert resp.status_code == 422
@@ -0,0 +1,142 @@
+"""Tests for the two-tier LLM response cache."""
+
+import asyncio
+import time
+
+from services import simulation_engine
+from services.circuit_breaker import BreakerRegistry
+from services.llm_cache import LLMResponseCache
+from services.simulation_engine import LLMResult, SimulationRunner
+from tests.conftest import FakeAgentModel
+
+
+class TestMakeKey:
+    def test_stable_and_order_independent(self):
+        k1 = LLMResponseCache.make_key("m", "sys", [{"role": "user", "content": "hi"}], {"a": 1, "b": 2})
+        k2 = LLMResponseCache.make_key("m", "sys", [{"content": "hi", "role": "user"}], {"b": 2, "a": 1})
+        assert k1 == k2
+
+    def test_differs_on_any_component(self):
+        base = LLMResponseCache.make_key("m", "sys", [], {})
+        assert base != LLMResponseCache.make_key("m2", "sys", [], {})
+        assert base != LLMResponseCache.make_key("m", "sys2", [], {})
+        assert base != LLMResponseCache.make_key("m", "sys", [{"role": "user", "content": "x"}], {})
+        assert base != LLMResponseCache.make_key("m", "sys", [], {"temperature": 0})
+
+
+class TestLLMResponseCache:
+    async def test_disabled_never_hits(self):
+        cache = LLMResponseCache(enabled=False)
+        await cache.set("k", "v")
+        assert await cache.get("k") is None
+        assert cache.stats()["misses"] == 0
+
+    async def test_memory_hit_and_miss(self):
+        cache = LLMResponseCache()
+        assert await cache.get("k") is None
+        await cache.set("k", "v")
+        assert await cache.get("k") == "v"
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hit_ratio"] == 0.5
+
+    async def test_memory_lru_eviction(self):
+        cache = LLMResponseCache(memory_entries=2)
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        await cache.get("a")
+        await cache.set("c", "3")
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "1"
+        assert cache.stats()["memory_evictions"] == 1
+
+    async def test_disk_persists_across_instances(self, tmp_path):
+        first = LLMResponseCache(disk_dir=tmp_path)
+        await first.set("abc123", "persisted")
+
+        second = LLMResponseCache(disk_dir=tmp_path)
+        assert await second.get("abc123") == "persisted"
+        assert second.stats()["disk_hits"] == 1
+        # Promoted to memory on a disk hit
+        assert await second.get("abc123") == "persisted"
+        assert second.stats()["memory_hits"] == 1
+
+    async def test_ttl_expiry(self, tmp_path, monkeypatch):
+        cache = LLMResponseCache(disk_dir=tmp_path, ttl_seconds=10)
+        await cache.set("key1", "old")
+        now = time.time()
+        monkeypatch.setattr("services.llm_cache.time.time", lambda: now + 60)
+        assert await cache.get("key1") is None
+        assert not list(tmp_path.glob("*/*.json"))
+        assert cache.stats()["expired"] == 2
+
+    async def test_disk_size_eviction(self, tmp_path):
+        cache = LLMResponseCache(memory_entries=1, disk_dir=tmp_path, disk_max_bytes=600)
+        for i in range(10):
+            await cache.set(f"key{i:02d}", "x" * 100)
+        assert cache.stats()["disk_evictions"] > 0
+        assert sum(p.stat().st_size for p in tmp_path.glob("*/*.json")) <= 600
+        assert await cache.get("key09") is not None
+
+    async def test_clear(self, tmp_path):
+        cache = LLMResponseCache(disk_dir=tmp_path)
+        await cache.set("k", "v")
+        await cache.clear()
+        assert await cache.get("k") is None
+        assert not list(tmp_path.glob("*/*.json"))
+        assert cache.stats()["disk_bytes"] == 0
+
+    async def test_concurrent_disk_writes_keep_accounting(self, tmp_path):
+        cache = LLMResponseCache(memory_entries=1, disk_dir=tmp_path, disk_max_bytes=2000)
+        await asyncio.gather(*(cache.set(f"key{i:02d}", "x" * 100) for i in range(40)))
+        on_disk = sum(p.stat().st_size for p in tmp_path.glob("*/*.json"))
+        assert cache.stats()["disk_bytes"] == on_disk <= 2000
+        assert cache.stats()["disk_evictions"] == 40 - len(list(tmp_path.glob("*/*.json")))
+
+
+class TestCallLLMCache:
+    async def test_identical_requests_hit_cache(self, monkeypatch):
+        cache = LLMResponseCache()
+        monkeypatch.setattr(simulation_engine, "llm_cache", cache)
+        calls = []
+
+        async def fake_run_agent(self, name, model_str, instructions, input_messages):
+            calls.append(model_str)
+            return LLMResult("hello")
+
+        monkeypatch.setattr(SimulationRunner, "_run_agent", fake_run_agent)
+        runner = SimulationRunner("room-1")
+        history = [{"role": "user", "content": "[User]: hi"}]
+
+        first = await runner._call_llm(FakeAgentModel(), history)
+        second = await runner._call_llm(FakeAgentModel(), history)
+        assert first.text == second.text == "hello"
+        assert calls == ["openai/gpt-5.2"]
+        assert cache.stats()["memory_hits"] == 1
+
+    async def test_fallback_reply_not_cached_under_primary_key(self, monkeypatch):
+        cache = LLMResponseCache()
+        monkeypatch.setattr(simulation_engine, "llm_cache", cache)
+        calls = []
+
+        async def fake_run_agent(self, name, model_str, instructions, input_messages):
+            calls.append(model_str)
+            if model_str == "openai/gpt-5.2" and len(calls) == 1:
+                raise RuntimeError("primary down")
+            return LLMResult(f"from {model_str}")
+
+        monkeypatch.setattr(SimulationRunner, "_run_agent", fake_run_agent)
+        monkeypatch.setattr(simulation_engine, "circuit_breakers", BreakerRegistry())
+        agent = FakeAgentModel(fallback_models=["litellm/anthropic/claude-sonnet-4-5"])
+        runner = SimulationRunner("room-1")
+        runner.llm_timeout_seconds = 5
+        history = [{"role": "user", "content": "[User]: hi"}]
+
+        first = await runner._call_llm(agent, history)
+        assert (first.text, first.model_used) == ("from anthropic/claude-sonnet-4-5", "anthropic/claude-sonnet-4-5")
+        second = await runner._call_llm(agent, history)
+        assert (second.text, second.model_used) == ("from openai/gpt-5.2", "openai/gpt-5.2")
+        assert cache.stats()["memory_hits"] == 0
+        assert (await runner._call_llm(agent, history)).text == "from openai/gpt-5.2"
+        assert cache.stats()["memory_hits"] == 1
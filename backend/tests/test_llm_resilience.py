@@ -0,0 +1,185 @@
+"""Tests for LLM call timeouts, retries and hedging."""
+
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from services import llm_resilience
+from services.llm_resilience import (
+    CallPolicy,
+    LatencyTracker,
+    backoff_delay,
+    call_with_policy,
+    is_retryable,
+)
+
+
+def _status_error(status: int) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://example.test")
+    return openai.APIStatusError("err", response=httpx.Response(status, request=request), body=None)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff_sleep(monkeypatch):
+    monkeypatch.setattr(llm_resilience, "backoff_delay", lambda attempt, base, cap: 0)
+
+
+class TestClassification:
+    def test_retryable(self):
+        assert is_retryable(TimeoutError())
+        assert is_retryable(ConnectionResetError())
+        assert is_retryable(_status_error(429))
+        assert is_retryable(_status_error(503))
+
+    def test_not_retryable(self):
+        assert not is_retryable(ValueError("bad"))
+        assert not is_retryable(_status_error(400))
+        assert not is_retryable(_status_error(401))
+
+    def test_backoff_is_bounded(self):
+        for attempt in range(10):
+            assert 0 <= backoff_delay(attempt, 0.5, 4) <= 4
+
+
+class TestLatencyTracker:
+    def test_percentile_needs_min_samples(self):
+        tracker = LatencyTracker(min_samples=5)
+        for v in range(4):
+            tracker.record("m", v)
+        assert tracker.percentile("m", 95) is None
+        tracker.record("m", 4)
+        assert tracker.percentile("m", 95) == 4
+
+    def test_window(self):
+        tracker = LatencyTracker(window=3, min_samples=1)
+        for v in (100, 1, 2, 3):
+            tracker.record("m", v)
+        assert tracker.percentile("m", 99) == 3
+
+
+class TestCallWithPolicy:
+    async def test_timeout_raises(self):
+        async def slow():
+            await asyncio.sleep(1)
+
+        with pytest.raises(TimeoutError):
+            await call_with_policy(slow, CallPolicy(timeout=0.01), "m", LatencyTracker())
+
+    async def test_retries_transient_errors(self):
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise _status_error(503)
+            return "ok"
+
+        assert await call_with_policy(flaky, CallPolicy(max_retries=2), "m", LatencyTracker()) == "ok"
+        assert attempts == 3
+
+    async def test_retries_timeouts(self):
+        attempts = 0
+
+        async def hangs_once():
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                await asyncio.sleep(1)
+            return "ok"
+
+        result = await call_with_policy(hangs_once, CallPolicy(timeout=0.01, max_retries=1), "m", LatencyTracker())
+        assert result == "ok"
+
+    async def test_gives_up_after_max_retries(self):
+        attempts = 0
+
+        async def always_fails():
+            nonlocal attempts
+            attempts += 1
+            raise _status_error(500)
+
+        with pytest.raises(openai.APIStatusError):
+            await call_with_policy(always_fails, CallPolicy(max_retries=2), "m", LatencyTracker())
+        assert attempts == 3
+
+    async def test_does_not_retry_permanent_errors(self):
+        attempts = 0
+
+        async def bad_request():
+            nonlocal attempts
+            attempts += 1
+            raise _status_error(400)
+
+        with pytest.raises(openai.APIStatusError):
+            await call_with_policy(bad_request, CallPolicy(max_retries=3), "m", LatencyTracker())
+        assert attempts == 1
+
+    async def test_records_latency(self):
+        tracker = LatencyTracker(min_samples=1)
+
+        async def fast():
+            return 1
+
+        await call_with_policy(fast, CallPolicy(), "model-a", tracker)
+        assert tracker.percentile("model-a", 50) is not None
+
+
+class TestHedging:
+    async def test_hedge_wins_when_primary_is_slow(self):
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(5)
+                return "primary"
+            return "hedge"
+
+        policy = CallPolicy(hedge=True, hedge_delay=0.01)
+        assert await asyncio.wait_for(call_with_policy(fn, policy, "m", LatencyTracker()), 1) == "hedge"
+        assert calls == 2
+
+    async def test_no_hedge_when_primary_is_fast(self):
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            return "primary"
+
+        policy = CallPolicy(hedge=True, hedge_delay=1)
+        assert await call_with_policy(fn, policy, "m", LatencyTracker()) == "primary"
+        assert calls == 1
+
+    async def test_hedge_delay_uses_p95(self):
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record("m", 0.01)
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(5)
+            return calls
+
+        policy = CallPolicy(hedge=True, hedge_delay=60)
+        assert await asyncio.wait_for(call_with_policy(fn, policy, "m", tracker), 1) == 2
+
+    async def test_surviving_request_wins_when_other_fails(self):
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.05)
+                return "primary"
+            raise ValueError("hedge failed")
+
+        policy = CallPolicy(hedge=True, hedge_delay=0.01)
+        assert await call_with_policy(fn, policy, "m", LatencyTracker()) == "primary"
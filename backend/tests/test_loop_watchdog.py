@@ -0,0 +1,55 @@
+"""Tests for the event-loop lag watchdog."""
+
+import asyncio
+import time
+
+from services.loop_watchdog import LoopWatchdog
+
+
+def _block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+class TestLoopWatchdog:
+    async def test_records_lag_percentiles(self):
+        watchdog = LoopWatchdog(interval=0.01, block_threshold=1)
+        watchdog.start()
+        await asyncio.sleep(0.1)
+        await watchdog.stop()
+
+        lag = watchdog.percentiles()
+        assert lag["samples"] > 0
+        assert lag["p50_ms"] <= lag["p99_ms"] <= lag["max_ms"]
+        assert watchdog.total_blocks == 0
+        assert not watchdog.running
+
+    async def test_captures_stack_of_blocking_task(self):
+        watchdog = LoopWatchdog(interval=0.01, block_threshold=0.1)
+        watchdog.start()
+        await asyncio.sleep(0.05)
+
+        async def offender():
+            _block_the_loop(0.4)
+
+        await asyncio.create_task(offender(), name="slow-room")
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+
+        assert watchdog.total_blocks == 1
+        block = watchdog.blocks[0]
+        assert block["task"].startswith("slow-room")
+        assert any("_block_the_loop" in line for line in block["stack"])
+        assert block["duration_seconds"] >= 0.3
+
+        snapshot = watchdog.snapshot(include_stacks=False)
+        assert "stack" not in snapshot["recent_blocks"][0]
+
+    async def test_admin_endpoint(self, admin_client, monkeypatch):
+        from routers import admin
+
+        monkeypatch.setattr(admin, "loop_watchdog", LoopWatchdog())
+        response = await admin_client.get("/api/admin/event-loop")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["running"] is False
+        assert data["lag"] == {"samples": 0}
@@ -0,0 +1,84 @@
+"""Tests for the Prometheus-style metrics registry and /metrics endpoint."""
+
+import pytest
+
+from services.metrics import MetricsRegistry
+from services.simulation_engine import ws_manager
+from tests.conftest import FakeWebSocket
+
+
+class TestMetricsRegistry:
+    def test_counter_and_gauge(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("path",))
+        requests.labels("/a").inc()
+        requests.labels(path="/a").inc(2)
+        temperature = registry.gauge("temperature", "Temp")
+        temperature.set(1.5)
+
+        text = registry.render()
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{path="/a"} 3' in text
+        assert "temperature 1.5" in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 5):
+            latency.observe(value)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert "latency_seconds_sum 5.65" in text
+
+    def test_histogram_timer(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("op_seconds", "Op", ("op",))
+        with latency.labels("x").time():
+            pass
+        assert 'op_seconds_count{op="x"} 1' in registry.render()
+
+    def test_label_escaping(self):
+        registry = MetricsRegistry()
+        registry.gauge("g", "G", ("name",)).labels('a"b\\c').set(1)
+        assert 'g{name="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_labelled_metric_requires_labels(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("c", "C", ("x",))
+        with pytest.raises(ValueError):
+            counter.inc()
+
+    def test_duplicate_name_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter("c", "C")
+        with pytest.raises(ValueError):
+            registry.gauge("c", "C")
+
+    def test_collectors_run_before_render(self):
+        registry = MetricsRegistry()
+        gauge = registry.gauge("live", "Live")
+        registry.register_collector(lambda: gauge.set(7))
+        assert "live 7" in registry.render()
+
+
+class TestMetricsEndpoint:
+    async def test_exposes_runtime_metrics(self, client):
+        ws = FakeWebSocket()
+        await ws_manager.connect("metrics-room", ws)
+        try:
+            await ws_manager.broadcast("metrics-room", {"type": "status"})
+            response = await client.get("/metrics")
+        finally:
+            ws_manager.disconnect("metrics-room", ws)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        assert 'nebula_websocket_connections{room_id="metrics-room"} 1' in text
+        assert 'nebula_simulations{state="running"}' in text
+        assert "nebula_broadcast_seconds_count" in text
+        assert "nebula_turn_duration_seconds" in text
@@ -0,0 +1,75 @@
+"""Tests for parallel round mode, where every agent in a round answers concurrently."""
+
+import asyncio
+
+import pytest
+
+from conftest import TestSessionLocal
+from models.room import Room
+from services import simulation_engine
+from services.simulation_engine import SimulationRunner
+from tests.conftest import make_room, message_contents
+
+DELAYS = {"Ada": 0.06, "Bob": 0.03, "Cy": 0.0}
+
+
+@pytest.fixture
+def llm(engine_db, monkeypatch) -> dict:
+    """Stub the LLM: slower for earlier agents; records histories and peak concurrency."""
+    monkeypatch.setattr(simulation_engine.settings, "SIMULATION_TURN_DELAY", 0)
+    seen = {"histories": {}, "in_flight": 0, "peak": 0}
+
+    async def fake_call_llm(self, agent_model, history):
+        seen["histories"][agent_model.name] = [m["content"] for m in history]
+        seen["in_flight"] += 1
+        seen["peak"] = max(seen["peak"], seen["in_flight"])
+        await asyncio.sleep(DELAYS[agent_model.name])
+        seen["in_flight"] -= 1
+        return simulation_engine.LLMResult(f"{agent_model.name} says hi")
+
+    monkeypatch.setattr(SimulationRunner, "_call_llm", fake_call_llm)
+    return seen
+
+
+async def make_delayed_room(client, max_turns: int = 3, **options) -> str:
+    """A room whose agents answer after their ``DELAYS``."""
+    return await make_room(client, max_turns, agents=DELAYS, **options)
+
+
+class TestParallelRounds:
+    async def test_round_runs_concurrently_and_saves_in_turn_order(self, client, llm):
+        room_id = await make_delayed_room(client, turn_mode="parallel")
+        await SimulationRunner(room_id).run()
+
+        assert llm["peak"] == 3
+        assert llm["histories"] == {"Ada": [], "Bob": [], "Cy": []}  # same snapshot for everyone
+        assert await message_contents(client, room_id) == ["Ada says hi", "Bob says hi", "Cy says hi"]
+        async with TestSessionLocal() as db:
+            room = await db.get(Room, room_id)
+            assert (room.status, room.current_turn_index) == ("idle", 3)
+
+    async def test_completion_order(self, client, llm):
+        room_id = await make_delayed_room(client, turn_mode="parallel", round_order="completion")
+        await SimulationRunner(room_id).run()
+        assert await message_contents(client, room_id) == ["Cy says hi", "Bob says hi", "Ada says hi"]
+
+    async def test_next_round_sees_previous_round(self, client, llm):
+        room_id = await make_delayed_room(client, max_turns=4, turn_mode="parallel")
+        await SimulationRunner(room_id).run()
+        assert llm["histories"]["Ada"] == ["Ada says hi", "[Bob]: Bob says hi", "[Cy]: Cy says hi"]
+        assert len(await message_contents(client, room_id)) == 4  # max_turns cuts the second round short
+
+    async def test_resumed_mid_round_finishes_that_round(self, client, llm):
+        room_id = await make_delayed_room(client, max_turns=6, turn_mode="parallel")
+        runner = SimulationRunner(room_id)
+        runner.current_turn_index, runner.max_turns = 1, 6
+        await runner._run_round((await runner._load_config()).agents, "turn")
+        assert await message_contents(client, room_id) == ["Bob says hi", "Cy says hi"]
+        assert runner.current_turn_index == 3
+
+    async def test_room_options_validated(self, client):
+        resp = await client.post("/api/rooms", json={"name": "R", "turn_mode": "parallel"})
+        assert (resp.json()["turn_mode"], resp.json()["round_order"]) == ("parallel", "turn")
+        resp = await client.post("/api/rooms", json={"name": "R", "turn_mode": "chaos"})
+        assert resp.status_code == 422
+
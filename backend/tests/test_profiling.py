@@ -0,0 +1,93 @@
+"""Tests for the profiling services and their admin-only endpoints."""
+
+import asyncio
+
+import pytest
+
+from config import settings
+from services.profiler import MemoryProfiler, ProfilerBusyError, SamplingProfiler
+
+
+@pytest.fixture
+def memory_profiler(monkeypatch):
+    from routers import profiling
+
+    profiler = MemoryProfiler()
+    monkeypatch.setattr(profiling, "memory_profiler", profiler)
+    yield profiler
+    profiler.stop()
+
+
+class TestSamplingProfiler:
+    async def test_folded_stacks(self):
+        folded, info = await SamplingProfiler().profile(0.05, interval=0.005)
+        assert info["samples"] > 1
+        line = folded.splitlines()[0]
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) >= 1
+        assert ";" in stack
+
+    async def test_one_profile_at_a_time(self):
+        profiler = SamplingProfiler()
+        first = asyncio.create_task(profiler.profile(0.1))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ProfilerBusyError):
+            await profiler.profile(0.1)
+        await first
+
+
+class TestMemoryProfiler:
+    def test_snapshot_and_diff(self):
+        profiler = MemoryProfiler()
+        with pytest.raises(RuntimeError):
+            profiler.take_snapshot()
+        profiler.start()
+        try:
+            base = profiler.take_snapshot()
+            hoard = [bytearray(1024) for _ in range(1000)]  # noqa: F841
+            target = profiler.take_snapshot()
+            report = profiler.diff(profiler.get(base), profiler.get(target))
+            assert "test_profiling.py" in report
+            assert profiler.status()["tracing"] is True
+        finally:
+            profiler.stop()
+        assert profiler.status() == {"tracing": False, "traced_bytes": 0, "peak_traced_bytes": 0, "snapshots": []}
+
+
+class TestProfilingEndpoints:
+    async def test_disabled_without_token_setting(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+        response = await client.get("/api/admin/profile/memory", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 403
+
+    async def test_rejects_wrong_token(self, admin_client):
+        response = await admin_client.get("/api/admin/profile/memory", headers={"X-Admin-Token": "nope"})
+        assert response.status_code == 401
+
+    async def test_cpu_profile_download(self, admin_client):
+        response = await admin_client.post("/api/admin/profile/cpu", params={"seconds": 0.05})
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        assert int(response.headers["X-Profile-Samples"]) > 0
+
+    async def test_memory_snapshot_flow(self, admin_client, memory_profiler):
+        response = await admin_client.post("/api/admin/profile/memory/snapshots")
+        assert response.status_code == 400
+
+        await admin_client.post("/api/admin/profile/memory/start")
+        base = (await admin_client.post("/api/admin/profile/memory/snapshots")).json()["id"]
+        target = (await admin_client.post("/api/admin/profile/memory/snapshots")).json()["id"]
+
+        response = await admin_client.get(f"/api/admin/profile/memory/snapshots/{base}")
+        assert response.status_code == 200
+        assert response.text.startswith("Top ")
+
+        response = await admin_client.get("/api/admin/profile/memory/diff", params={"base": base, "target": target})
+        assert response.status_code == 200
+        assert response.text.startswith("Net change")
+
+        response = await admin_client.get("/api/admin/profile/memory/snapshots/999")
+        assert response.status_code == 404
+
+        status = (await admin_client.post("/api/admin/profile/memory/stop")).json()
+        assert status["tracing"] is False
@@ -0,0 +1,100 @@
+"""Tests for the WebSocket pub/sub backends."""
+
+import asyncio
+import json
+
+import pytest
+
+from config import settings
+from services.pubsub import InProcessPubSub, RedisPubSub, pubsub_from_settings
+from services.simulation_engine import ConnectionManager
+from tests.conftest import FakeWebSocket
+
+
+class FakeBroker:
+    """Stands in for Redis: routes published messages to every subscribed process."""
+
+    def __init__(self):
+        self.subscribers: dict[str, set] = {}
+
+    def backend(self, deliver):
+        return FakeBrokerPubSub(self, deliver)
+
+
+class FakeBrokerPubSub(InProcessPubSub):
+    name = "fake"
+    local_only = False
+
+    def __init__(self, broker: FakeBroker, deliver):
+        super().__init__(deliver)
+        self.broker = broker
+
+    async def subscribe(self, room_id):
+        self.broker.subscribers.setdefault(room_id, set()).add(self)
+
+    async def unsubscribe(self, room_id):
+        self.broker.subscribers.get(room_id, set()).discard(self)
+
+    async def publish(self, room_id, message):
+        for sub in list(self.broker.subscribers.get(room_id, ())):
+            await sub.deliver(room_id, message)
+
+
+def process(broker: FakeBroker) -> ConnectionManager:
+    mgr = ConnectionManager()
+    mgr.backend = broker.backend(mgr._deliver)
+    return mgr
+
+
+class TestCrossProcessFanOut:
+    async def test_viewer_on_other_process_receives_events(self):
+        broker = FakeBroker()
+        api, worker = process(broker), process(broker)
+        ws = FakeWebSocket()
+        await api.connect("room-1", ws)
+
+        await worker.broadcast("room-1", {"type": "status", "status": "running"})
+        assert [json.loads(m)["status"] for m in ws.sent] == ["running"]
+
+    async def test_unsubscribes_after_last_viewer_leaves(self):
+        broker = FakeBroker()
+        api = process(broker)
+        ws1, ws2 = FakeWebSocket(), FakeWebSocket()
+        await api.connect("room-1", ws1)
+        await api.connect("room-1", ws2)
+
+        api.disconnect("room-1", ws1)
+        await asyncio.sleep(0)
+        assert api.backend in broker.subscribers["room-1"]
+
+        api.disconnect("room-1", ws2)
+        await asyncio.sleep(0)
+        assert broker.subscribers["room-1"] == set()
+
+    async def test_reconnect_before_unsubscribe_keeps_subscription(self):
+        broker = FakeBroker()
+        api = process(broker)
+        ws = FakeWebSocket()
+        await api.connect("room-1", ws)
+        api.disconnect("room-1", ws)
+        await api.connect("room-1", ws)
+        await asyncio.sleep(0)
+        assert api.backend in broker.subscribers["room-1"]
+
+
+class TestBackendSelection:
+    def test_memory_is_default(self):
+        assert isinstance(pubsub_from_settings(lambda *a: None), InProcessPubSub)
+
+    def test_unknown_backend_rejected(self, monkeypatch):
+        monkeypatch.setattr(settings, "PUBSUB_BACKEND", "carrier-pigeon")
+        with pytest.raises(ValueError):
+            pubsub_from_settings(lambda *a: None)
+
+    async def test_redis_requires_package(self, monkeypatch):
+        import sys
+
+        monkeypatch.setitem(sys.modules, "redis", None)
+        monkeypatch.setitem(sys.modules, "redis.asyncio", None)
+        with pytest.raises(RuntimeError, match="redis"):
+            await RedisPubSub(lambda *a: None, "redis://localhost").start()
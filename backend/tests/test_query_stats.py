@@ -0,0 +1,78 @@
+"""Tests for SQL query instrumentation."""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+
+import main
+from conftest import TestSessionLocal, engine
+from routers import admin
+from services.query_stats import QueryInstrumentation
+
+
+@pytest.fixture
+def instrumentation(monkeypatch):
+    inst = QueryInstrumentation(slow_query_ms=10_000, repeat_threshold=3)
+    inst.install(engine.sync_engine)
+    monkeypatch.setattr(main, "query_instrumentation", inst)
+    monkeypatch.setattr(admin, "query_instrumentation", inst)
+    yield inst
+    inst.uninstall(engine.sync_engine)
+
+
+class TestQueryInstrumentation:
+    async def test_disabled_tracks_nothing(self):
+        inst = QueryInstrumentation()
+        with inst.track("GET /x") as stats:
+            assert stats is None
+        assert inst.summary() == []
+
+    async def test_counts_queries_in_context(self, instrumentation):
+        async with TestSessionLocal() as db:
+            with instrumentation.track("job") as stats:
+                await db.execute(text("SELECT 1"))
+                await db.execute(text("SELECT 2"))
+            await db.execute(text("SELECT 3"))
+        assert stats.count == 2
+        assert stats.total_seconds > 0
+
+    async def test_flags_repeated_statements(self, instrumentation, caplog):
+        async with TestSessionLocal() as db:
+            with caplog.at_level(logging.WARNING), instrumentation.track("GET /rooms") as stats:
+                for i in range(3):
+                    await db.execute(text("SELECT :i"), {"i": i})
+                await db.execute(text("SELECT :i"), {"i": 0})
+        assert stats.repeated(3) == [("SELECT ?", 4)]
+        assert stats.duplicates() == 1
+        assert "possible N+1" in caplog.text
+
+        route = instrumentation.summary()[0]
+        assert route["route"] == "GET /rooms"
+        assert route["flagged_requests"] == 1
+        assert route["duplicate_queries"] == 1
+
+    async def test_logs_slow_queries_with_params(self, instrumentation, caplog):
+        instrumentation.slow_query_ms = 0
+        async with TestSessionLocal() as db:
+            with caplog.at_level(logging.WARNING):
+                await db.execute(text("SELECT :value"), {"value": "needle"})
+        assert "Slow query" in caplog.text
+        assert "needle" in caplog.text
+
+
+class TestRequestTracking:
+    async def test_requests_aggregate_by_route(self, admin_client, instrumentation):
+        room_ids = [(await admin_client.post("/api/rooms", json={"name": f"R{i}"})).json()["id"] for i in range(2)]
+        for room_id in room_ids:
+            response = await admin_client.get(f"/api/rooms/{room_id}")
+            assert int(response.headers["X-DB-Queries"]) >= 1
+
+        data = (await admin_client.get("/api/admin/queries")).json()
+        assert data["enabled"] is True
+        routes = {r["route"]: r for r in data["routes"]}
+        assert routes["GET /api/rooms/{room_id}"]["requests"] == 2
+        assert routes["POST /api/rooms"]["requests"] == 2
+
+        await admin_client.delete("/api/admin/queries")
+        assert instrumentation.summary() == []
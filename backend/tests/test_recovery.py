@@ -0,0 +1,105 @@
+"""Tests for startup recovery of interrupted simulations and resume-from-checkpoint starts."""
+
+import asyncio
+
+import pytest_asyncio
+
+from config import settings
+from conftest import TestSessionLocal
+from models.room import Room
+from services import simulation_engine
+from services.simulation_engine import SimulationRunner
+from services.simulation_leases import LeaseCoordinator
+from tests.conftest import create_room_with_agent, create_room_with_status
+
+
+@pytest_asyncio.fixture
+async def manager(fresh_manager, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_SIMULATIONS", 0)
+    monkeypatch.setattr(simulation_engine.ws_manager, "broadcast", lambda *a, **k: asyncio.sleep(0))
+    hold = asyncio.Event()
+
+    async def run(self):
+        await hold.wait()
+
+    monkeypatch.setattr(SimulationRunner, "run", run)
+    yield fresh_manager
+    hold.set()
+
+
+async def get_room(room_id: str) -> Room:
+    async with TestSessionLocal() as db:
+        return await db.get(Room, room_id)
+
+
+class TestRecovery:
+    async def test_resume_restarts_interrupted_rooms_in_place(self, manager):
+        running = await create_room_with_status("running", turn=57)
+        paused = await create_room_with_status("paused", turn=3)
+        idle = await create_room_with_status("idle", turn=9)
+
+        result = await manager.recover("resume")
+        assert sorted(result["resumed"]) == sorted([running, paused])
+        assert result["stopped"] == []
+        assert (await get_room(running)).current_turn_index == 57
+        assert manager.simulations[running].pause_event.is_set()
+        assert not manager.simulations[paused].pause_event.is_set()
+        assert idle not in manager.simulations
+
+    async def test_stop_marks_rooms_stopped_and_keeps_progress(self, manager):
+        running = await create_room_with_status("running", turn=57)
+        queued = await create_room_with_status("queued")
+
+        result = await manager.recover("stop")
+        assert sorted(result["stopped"]) == sorted([running, queued])
+        room = await get_room(running)
+        assert (room.status, room.current_turn_index) == ("stopped", 57)
+        assert manager.simulations == {}
+
+    async def test_off_leaves_rooms_alone(self, manager):
+        running = await create_room_with_status("running")
+        assert await manager.recover("off") == {"resumed": [], "stopped": []}
+        assert (await get_room(running)).status == "running"
+
+    async def test_rooms_leased_by_live_worker_are_skipped(self, manager):
+        manager.leases = LeaseCoordinator("me", session_factory=TestSessionLocal)
+        elsewhere = await create_room_with_status("running", turn=4)
+        orphaned = await create_room_with_status("running", turn=8)
+        await LeaseCoordinator("other", session_factory=TestSessionLocal).acquire(elsewhere)
+
+        result = await manager.recover("stop")
+        assert result["stopped"] == [orphaned]
+        assert (await get_room(elsewhere)).status == "running"
+
+
+class TestResumeStart:
+    async def test_resume_keeps_turn_index(self, client, manager, monkeypatch):
+        from routers import simulation as simulation_router
+
+        monkeypatch.setattr(simulation_router, "simulation_manager", manager)
+        room_id, _ = await create_room_with_agent(client)
+        async with TestSessionLocal() as db:
+            room = await db.get(Room, room_id)
+            room.current_turn_index, room.status = 12, "stopped"
+            await db.commit()
+
+        response = await client.post(f"/api/simulation/{room_id}/start", params={"resume": "true"})
+        assert response.json() == {"status": "started"}
+        assert (await get_room(room_id)).current_turn_index == 12
+
+        await manager.stop(room_id)
+        await client.post(f"/api/simulation/{room_id}/start")
+        assert (await get_room(room_id)).current_turn_index == 0
+
+    async def test_resume_finished_room_rejected(self, client, manager, monkeypatch):
+        from routers import simulation as simulation_router
+
+        monkeypatch.setattr(simulation_router, "simulation_manager", manager)
+        room_id, _ = await create_room_with_agent(client)
+        async with TestSessionLocal() as db:
+            room = await db.get(Room, room_id)
+            room.current_turn_index = room.max_turns
+            await db.commit()
+
+        response = await client.post(f"/api/simulation/{room_id}/start", params={"resume": "true"})
+        assert response.status_code == 400
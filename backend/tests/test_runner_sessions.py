@@ -0,0 +1,64 @@
+"""Tests that simulation runners only hold a DB session for each persistence step."""
+
+import contextlib
+
+from conftest import TestSessionLocal
+from models.room import Room
+from services import simulation_engine
+from services.simulation_engine import SimulationRunner
+from tests.conftest import make_room, message_contents
+
+
+def counting_sessions(monkeypatch) -> dict:
+    """Route the engine's sessions through ``TestSessionLocal`` and count how many are open."""
+    counts = {"open": 0, "opened": 0}
+
+    @contextlib.asynccontextmanager
+    async def session():
+        counts["open"] += 1
+        counts["opened"] += 1
+        try:
+            async with TestSessionLocal() as db:
+                yield db
+        finally:
+            counts["open"] -= 1
+
+    monkeypatch.setattr(simulation_engine, "async_session", session)
+    return counts
+
+
+class TestShortSessions:
+    async def test_no_session_open_during_llm_call_or_turn_delay(self, client, monkeypatch):
+        counts = counting_sessions(monkeypatch)
+        monkeypatch.setattr(simulation_engine.settings, "SIMULATION_TURN_DELAY", 0)
+        open_during_llm = []
+
+        async def fake_call_llm(self, agent_model, history):
+            open_during_llm.append(counts["open"])
+            return simulation_engine.LLMResult(f"turn {self.current_turn_index}")
+
+        monkeypatch.setattr(SimulationRunner, "_call_llm", fake_call_llm)
+        room_id = await make_room(client, max_turns=3)
+        runner = SimulationRunner(room_id)
+        await runner.run()
+
+        assert open_during_llm == [0, 0, 0]
+        assert counts["open"] == 0
+        assert await message_contents(client, room_id) == ["turn 0", "turn 1", "turn 2"]
+        async with TestSessionLocal() as db:
+            room = await db.get(Room, room_id)
+            assert (room.status, room.current_turn_index) == ("idle", 3)
+
+    async def test_injections_saved_in_one_session(self, client, monkeypatch):
+        counts = counting_sessions(monkeypatch)
+        room_id = await make_room(client)
+        runner = SimulationRunner(room_id)
+        await runner._drain_injects()
+        assert counts["opened"] == 0  # nothing queued, no session
+
+        for text in ("one", "two", "three"):
+            await runner.inject_queue.put(text)
+        await runner._drain_injects()
+        assert counts["opened"] == 1
+        assert await message_contents(client, room_id) == ["one", "two", "three"]
+
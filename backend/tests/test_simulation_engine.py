@@ -1,19 +1,16 @@
-"""Unit tests for ConnectionManager and SimulationManager."""
+"""Unit tests for ConnectionManager, SimulationManager and runner state."""
 
+import asyncio
 import json
 
-from services.simulation_engine import ConnectionManager, SimulationManager
-
-
-class FakeWebSocket:
-    def __init__(self):
-        self.sent: list[str] = []
-        self.closed = False
-
-    async def send_text(self, data: str):
-        if self.closed:
-            raise RuntimeError("WebSocket closed")
-        self.sent.append(data)
+from services.simulation_engine import (
+    ConnectionManager,
+    HistoryCache,
+    RunnerStats,
+    SimulationManager,
+    SimulationRunner,
+)
+from tests.conftest import FakeWebSocket
 
 
 class TestConnectionManager:
@@ -88,43 +85,110 @@ class TestConnectionManager:
 
 
 class TestSimulationManagerSingleton:
-    def test_singleton(self):
-        SimulationManager._instance = None
-        m1 = SimulationManager()
-        m2 = SimulationManager()
-        assert m1 is m2
-        SimulationManager._instance = None
-
-    def test_get_status_nonexistent(self):
-        SimulationManager._instance = None
-        mgr = SimulationManager()
-        assert mgr.get_status("nonexistent") is None
-        SimulationManager._instance = None
-
-    async def test_stop_nonexistent(self):
-        SimulationManager._instance = None
-        mgr = SimulationManager()
-        result = await mgr.stop("nonexistent")
+    def test_singleton(self, fresh_manager):
+        assert SimulationManager() is fresh_manager
+        assert SimulationManager() is SimulationManager()
+
+    def test_get_status_nonexistent(self, fresh_manager):
+        assert fresh_manager.get_status("nonexistent") is None
+
+    async def test_stop_nonexistent(self, fresh_manager):
+        result = await fresh_manager.stop("nonexistent")
         assert result is False
-        SimulationManager._instance = None
 
-    async def test_pause_nonexistent(self):
-        SimulationManager._instance = None
-        mgr = SimulationManager()
-        result = await mgr.pause("nonexistent")
+    async def test_pause_nonexistent(self, fresh_manager):
+        result = await fresh_manager.pause("nonexistent")
         assert result is False
-        SimulationManager._instance = None
 
-    async def test_resume_nonexistent(self):
-        SimulationManager._instance = None
-        mgr = SimulationManager()
-        result = await mgr.resume("nonexistent")
+    async def test_resume_nonexistent(self, fresh_manager):
+        result = await fresh_manager.resume("nonexistent")
         assert result is False
-        SimulationManager._instance = None
 
-    async def test_inject_nonexistent(self):
-        SimulationManager._instance = None
-        mgr = SimulationManager()
-        result = await mgr.inject("nonexistent", "message")
+    async def test_inject_nonexistent(self, fresh_manager):
+        result = await fresh_manager.inject("nonexistent", "message")
         assert result is False
-        SimulationManager._instance = None
+
+
+class TestHistoryCache:
+    def test_builds_from_agent_perspective(self):
+        cache = HistoryCache()
+        cache.load([("a1", "Ada", "hi"), (None, "User", "hello")])
+        cache.append("a2", "Bob", "hey")
+        assert cache.build("a1") == [
+            {"role": "assistant", "content": "hi"},
+            {"role": "user", "content": "[User]: hello"},
+            {"role": "user", "content": "[Bob]: hey"},
+        ]
+        assert cache.size_bytes > 0
+
+    def test_append_before_load_is_ignored(self):
+        cache = HistoryCache()
+        cache.append("a1", "Ada", "hi")
+        assert cache.entries == []
+        assert cache.size_bytes == 0
+
+
+class TestRunnerStats:
+    def test_turn_rate_needs_two_turns(self):
+        stats = RunnerStats()
+        stats.record_turn(0.5)
+        assert stats.turns_per_minute() is None
+        stats.recent_turn_ends.append(stats.recent_turn_ends[0] + 30)
+        assert stats.turns_per_minute() == 2.0
+
+    async def test_snapshot(self):
+        runner = SimulationRunner("room-1")
+        runner.task = asyncio.create_task(asyncio.sleep(10))
+        await runner.inject_queue.put("hi")
+        runner.pause_event.clear()
+        snapshot = runner.snapshot()
+        runner.task.cancel()
+        assert snapshot["state"] == "paused"
+        assert snapshot["queued_injections"] == 1
+        assert snapshot["viewers"] == 0
+
+
+class TestReaping:
+    async def test_empty_ws_rooms_reaped_after_ttl(self):
+        mgr = ConnectionManager()
+        ws = FakeWebSocket()
+        await mgr.connect("room-1", ws)
+        mgr.disconnect("room-1", ws)
+
+        assert mgr.reap(ttl=60) == 0
+        assert "room-1" in mgr.rooms
+        assert mgr.reap(ttl=0) == 1
+        assert "room-1" not in mgr.rooms
+
+    async def test_reconnect_cancels_reaping(self):
+        mgr = ConnectionManager()
+        ws = FakeWebSocket()
+        await mgr.connect("room-1", ws)
+        mgr.disconnect("room-1", ws)
+        await mgr.connect("room-1", ws)
+        assert mgr.reap(ttl=0) == 0
+        assert mgr.rooms["room-1"] == [ws]
+
+    async def test_finished_runners_reaped_after_ttl(self, fresh_manager):
+        mgr = fresh_manager
+        live, finished, legacy = SimulationRunner("live"), SimulationRunner("finished"), SimulationRunner("legacy")
+        live.task = asyncio.create_task(asyncio.sleep(10))
+        finished.task = legacy.task = asyncio.create_task(asyncio.sleep(0))
+        await finished.task
+        finished.history.load([("a1", "Ada", "x" * 1000)])
+        mgr._on_runner_done(finished)
+        mgr.simulations = {"live": live, "finished": finished, "legacy": legacy}
+
+        assert finished.history.entries == []  # transcript dropped as soon as the runner ends
+        assert mgr.reap(ttl=60) == 0
+        assert legacy.finished_at is not None  # clock started on first sighting
+        assert mgr.reap(ttl=0) == 2
+        assert list(mgr.simulations) == ["live"]
+        live.task.cancel()
+
+    def test_memory_estimate_tracks_history(self):
+        runner = SimulationRunner("room-1")
+        before = runner.memory_bytes()
+        runner.history.load([("a1", "Ada", "x" * 10_000)])
+        assert runner.memory_bytes() >= before + 10_000
+        assert runner.snapshot()["memory_bytes"] == runner.memory_bytes()
@@ -0,0 +1,298 @@
+"""Tests for DB-backed simulation leases and cross-worker command routing."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from conftest import TestSessionLocal
+from models.room import Room
+from models.simulation_lease import SimulationLease
+from services import simulation_engine, simulation_leases
+from services.simulation_leases import LeaseCoordinator
+from tests.conftest import create_room_with_agent, create_room_with_status
+
+
+def coordinator(worker_id: str, **kwargs) -> LeaseCoordinator:
+    kwargs = {"ttl": 15, "poll_interval": 0.02, "command_timeout": 1, **kwargs}
+    return LeaseCoordinator(worker_id, session_factory=TestSessionLocal, **kwargs)
+
+
+async def expire(room_id: str):
+    async with TestSessionLocal() as db:
+        await db.execute(
+            update(SimulationLease)
+            .where(SimulationLease.room_id == room_id)
+            .values(expires_at=datetime.now(UTC) - timedelta(seconds=1))
+        )
+        await db.commit()
+
+
+@pytest.fixture
+def manager(fresh_manager):
+    fresh_manager.leases = coordinator("worker-a")
+    return fresh_manager
+
+
+class TestLeaseCoordinator:
+    async def test_acquire_is_exclusive_until_expiry(self):
+        room_id = await create_room_with_status()
+        a, b = coordinator("a"), coordinator("b")
+
+        assert await a.acquire(room_id)
+        assert await a.acquire(room_id)  # renewing your own lease succeeds
+        assert not await b.acquire(room_id)
+        assert await b.owner(room_id) == "a"
+
+        await expire(room_id)
+        assert await b.owner(room_id) is None
+        assert await b.acquire(room_id)
+        assert await a.owner(room_id) == "b"
+
+    async def test_renew_reports_lost_leases(self):
+        first, second = await create_room_with_status(), await create_room_with_status()
+        a, b = coordinator("a"), coordinator("b")
+        await a.acquire(first)
+        await a.acquire(second)
+        await expire(second)
+        await b.acquire(second)
+
+        assert await a.renew([first, second]) == {second}
+
+    async def test_release_only_drops_own_lease(self):
+        room_id = await create_room_with_status()
+        a, b = coordinator("a"), coordinator("b")
+        await a.acquire(room_id)
+        await b.release(room_id)
+        assert await a.owner(room_id) == "a"
+        await a.release(room_id)
+        assert await a.owner(room_id) is None
+
+    async def test_command_round_trip(self, monkeypatch):
+        room_id = await create_room_with_status()
+        a, b = coordinator("a"), coordinator("b")
+        handled = []
+
+        class Owner:
+            async def execute(self, command, room_id, payload):
+                handled.append((command, room_id, payload))
+                return True
+
+        async def owner_polls(_delay):
+            # Run the owner's poll where the sender waits, keeping the test single-task.
+            await b.process_commands(Owner())
+
+        monkeypatch.setattr(simulation_leases.asyncio, "sleep", owner_polls)
+        assert await a.send(room_id, "b", "inject", {"content": "hi"})
+        assert handled == [("inject", room_id, {"content": "hi"})]
+        assert await b.pending() == []
+
+    async def test_unanswered_command_is_withdrawn(self):
+        room_id = await create_room_with_status()
+        a = coordinator("a", command_timeout=0.05)
+        assert not await a.send(room_id, "gone", "pause")
+        assert await coordinator("gone").pending() == []
+
+
+class TestManagerRouting:
+    async def test_start_refused_while_another_worker_owns_room(self, manager):
+        room_id = await create_room_with_status(status="idle")
+        await coordinator("worker-b").acquire(room_id)
+        assert not await manager.start(room_id)
+        assert room_id not in manager.simulations
+
+    async def test_control_calls_forward_to_owner(self, manager):
+        room_id = await create_room_with_status()
+        await coordinator("worker-b").acquire(room_id)
+        sent = []
+
+        async def fake_send(room_id, worker_id, command, payload=None):
+            sent.append((worker_id, command, payload))
+            return True
+
+        manager.leases.send = fake_send
+        assert await manager.pause(room_id)
+        assert await manager.inject(room_id, "hello")
+        assert await manager.stop(room_id)
+        assert sent == [
+            ("worker-b", "pause", None),
+            ("worker-b", "inject", {"content": "hello", "interrupt": False}),
+            ("worker-b", "stop", None),
+        ]
+
+    async def test_stop_with_finished_local_runner_forwards_to_owner(self, manager):
+        room_id = await create_room_with_status()
+        await coordinator("worker-b").acquire(room_id)
+        stale = simulation_engine.SimulationRunner(room_id)
+        stale.task = asyncio.create_task(asyncio.sleep(0))
+        await stale.task
+        manager.simulations[room_id] = stale
+        sent = []
+
+        async def fake_send(room_id, worker_id, command, payload=None):
+            sent.append((worker_id, command))
+            return True
+
+        manager.leases.send = fake_send
+        assert await manager.stop(room_id)
+        assert sent == [("worker-b", "stop")]
+        assert room_id not in manager.simulations
+
+    async def test_unowned_room_is_not_forwarded(self, manager):
+        room_id = await create_room_with_status()
+        assert not await manager.pause(room_id)
+
+    async def test_takeover_resumes_without_resetting_turns(self, manager, monkeypatch):
+        room_id = await create_room_with_status(status="paused", turn=4)
+        await coordinator("dead-worker").acquire(room_id)
+        await expire(room_id)
+        started = []
+
+        async def fake_start(room_id, reset=True, paused=False):
+            started.append((room_id, reset, paused))
+            return True
+
+        monkeypatch.setattr(manager, "start", fake_start)
+        await manager.leases.heartbeat(manager)
+        assert started == [(room_id, False, True)]
+        assert await manager.leases.owner(room_id) == "worker-a"
+
+    async def test_drained_workers_queued_room_is_taken_over(self, manager, monkeypatch):
+        monkeypatch.setattr(simulation_engine.settings, "MAX_CONCURRENT_SIMULATIONS", 1)
+        monkeypatch.setattr(simulation_engine.ws_manager, "broadcast", lambda *a, **k: asyncio.sleep(0))
+        monkeypatch.setattr(simulation_engine.SimulationRunner, "run", lambda self: asyncio.Event().wait())
+        running, waiting = await create_room_with_status(status="idle"), await create_room_with_status(status="idle")
+        await manager.start(running)
+        assert await manager.start(waiting)
+        assert waiting in manager.queue
+        assert await coordinator("api").queue_positions([waiting]) == {waiting: 1}
+        await manager.drain(timeout=0.01)
+
+        started = []
+
+        class OtherWorker:
+            def leased_rooms(self):
+                return []
+
+            async def start(self, room_id, reset=True, paused=False):
+                started.append((room_id, reset, paused))
+                return True
+
+        other = coordinator("worker-b")
+        await other.heartbeat(OtherWorker())
+        assert (waiting, False, False) in started
+        assert await other.owner(waiting) == "worker-b"
+        async with TestSessionLocal() as db:
+            assert (await db.get(Room, waiting)).status == "queued"
+
+    async def test_expired_lease_on_finished_room_is_dropped(self, manager):
+        room_id = await create_room_with_status(status="idle")
+        await coordinator("dead-worker").acquire(room_id)
+        await expire(room_id)
+        await manager.leases.heartbeat(manager)
+        assert await manager.leases.leases() == []
+
+    async def test_lost_lease_abandons_runner_without_touching_status(self, manager):
+        room_id = await create_room_with_status(status="running")
+        runner = simulation_engine.SimulationRunner(room_id)
+        runner.task = asyncio.create_task(asyncio.sleep(10))
+        manager.simulations[room_id] = runner
+        await coordinator("worker-b").acquire(room_id)
+
+        await manager.leases.heartbeat(manager)
+        assert room_id not in manager.simulations
+        assert runner.lease_lost and runner.task.cancelled()
+        async with TestSessionLocal() as db:
+            assert (await db.get(Room, room_id)).status == "running"
+
+    async def test_lease_held_while_running_and_released_after(self, manager, monkeypatch):
+        monkeypatch.setattr(simulation_engine.ws_manager, "broadcast", lambda *a, **k: asyncio.sleep(0))
+        room_id = await create_room_with_status(status="idle")  # no agents, so the runner finishes right away
+        assert await manager.start(room_id)
+        assert await manager.leases.owner(room_id) == "worker-a"
+        await manager.simulations[room_id].task
+        assert await manager.leases.owner(room_id) is None
+
+
+class TestExternalMode:
+    async def test_start_is_claimed_by_one_worker(self, manager, monkeypatch):
+        room_id = await create_room_with_status(status="idle")
+        manager.external = True
+        first = coordinator("worker-1", accept_starts=True)
+        second = coordinator("worker-2", accept_starts=True)
+        started = []
+
+        class Worker:
+            def __init__(self, name):
+                self.name = name
+
+            async def execute(self, command, room_id, payload):
+                started.append((self.name, command, payload))
+                return True
+
+        async def workers_poll(_delay):
+            await first.process_commands(Worker("worker-1"))
+            await second.process_commands(Worker("worker-2"))
+
+        monkeypatch.setattr(simulation_leases.asyncio, "sleep", workers_poll)
+        assert await manager.start(room_id, reset=False)
+        assert started == [("worker-1", "start", {"reset": False, "paused": False, "priority": 0})]
+        assert await second.pending() == []
+
+    async def test_start_refused_when_room_already_owned(self, manager):
+        room_id = await create_room_with_status()
+        manager.external = True
+        await coordinator("worker-1").acquire(room_id)
+        assert not await manager.start(room_id)
+
+    async def test_api_coordinator_ignores_unassigned_starts(self, manager):
+        room_id = await create_room_with_status(status="idle")
+        manager.external = True
+        manager.leases.command_timeout = 0.05
+        assert not await manager.start(room_id)  # no worker running: the command is withdrawn
+        assert await manager.leases.pending() == []
+
+    async def test_start_reports_the_workers_admission(self, manager, monkeypatch):
+        room_id = await create_room_with_status(status="idle")
+        manager.external = True
+        worker = coordinator("worker-1", accept_starts=True)
+
+        class QueueingWorker:
+            async def execute(self, command, room_id, payload):
+                return {"status": "queued", "queue_position": 2}
+
+        async def worker_polls(_delay):
+            await worker.process_commands(QueueingWorker())
+
+        monkeypatch.setattr(simulation_leases.asyncio, "sleep", worker_polls)
+        assert await manager.admit(room_id) == {"status": "queued", "queue_position": 2}
+
+    async def test_no_worker_is_distinct_from_refusal(self, manager, client, monkeypatch):
+        from routers import simulation as simulation_router
+
+        monkeypatch.setattr(simulation_router, "simulation_manager", manager)
+        room_id, _ = await create_room_with_agent(client)
+        manager.external = True
+        manager.leases.command_timeout = 0.05
+        with pytest.raises(simulation_leases.WorkerUnavailableError):
+            await manager.admit(room_id)
+        assert (await client.post(f"/api/simulation/{room_id}/start")).status_code == 503
+
+    async def test_queue_positions_read_from_owning_workers_leases(self, manager):
+        first, second, urgent, elsewhere = [await create_room_with_status(status="queued") for _ in range(4)]
+        worker, other = coordinator("worker-1"), coordinator("worker-2")
+        for room_id in (first, second, urgent):
+            await worker.acquire(room_id)
+        await other.acquire(elsewhere)
+        await worker.mark_queued(first, 0, 0)
+        await worker.mark_queued(second, 0, 1)
+        await worker.mark_queued(urgent, 5, 2)
+        await other.mark_queued(elsewhere, 0, 7)
+        assert await manager.queue_positions([first, second, urgent, elsewhere]) == {
+            urgent: 1, first: 2, second: 3, elsewhere: 1,
+        }
+
+        await worker.clear_queued([urgent, first])  # admitted
+        assert await manager.queue_positions([first, second]) == {second: 1}
+        assert {lease["room_id"]: lease["queue_position"] for lease in await worker.leases()}[second] == 1
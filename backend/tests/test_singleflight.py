@@ -0,0 +1,119 @@
+"""Tests for coalescing identical concurrent LLM requests."""
+
+import asyncio
+
+import pytest
+
+from services import simulation_engine
+from services.llm_cache import LLMResponseCache
+from services.simulation_engine import LLMResult, SimulationRunner
+from services.singleflight import SingleFlight
+from tests.conftest import FakeAgentModel
+
+
+class TestSingleFlight:
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.create_task(flight.do("k", fn)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(*waiters) == ["result"] * 5
+        assert calls == 1
+        assert flight.stats() == {"in_flight": 0, "executed": 1, "coalesced": 4}
+
+    async def test_sequential_calls_execute_again(self):
+        flight = SingleFlight()
+
+        async def fn():
+            return 1
+
+        await flight.do("k", fn)
+        await flight.do("k", fn)
+        assert flight.executed == 2
+
+    async def test_exception_propagates_to_all_waiters(self):
+        flight = SingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flight.do("k", fn), flight.do("k", fn), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_cancelling_one_waiter_keeps_shared_call(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(flight.do("k", fn))
+        second = asyncio.create_task(flight.do("k", fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        release.set()
+        assert await second == "done"
+
+    async def test_cancelling_all_waiters_cancels_call(self):
+        flight = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def fn():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(flight.do("k", fn))
+        await started.wait()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert flight.stats()["in_flight"] == 0
+
+
+class TestCallLLMCoalescing:
+    async def _run_pair(self, monkeypatch, coalesce: bool) -> int:
+        monkeypatch.setattr(simulation_engine, "llm_cache", LLMResponseCache(enabled=False))
+        monkeypatch.setattr(simulation_engine, "llm_singleflight", SingleFlight())
+        calls = 0
+
+        async def fake_run_agent(self, name, model_str, instructions, input_messages):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return LLMResult("hi", input_tokens=10)
+
+        monkeypatch.setattr(SimulationRunner, "_run_agent", fake_run_agent)
+        runners = [SimulationRunner("room-a"), SimulationRunner("room-b")]
+        for runner in runners:
+            runner.coalesce_llm_requests = coalesce
+        history = [{"role": "user", "content": "[User]: hello"}]
+        results = await asyncio.gather(*(r._call_llm(FakeAgentModel(), history) for r in runners))
+        assert [r.text for r in results] == ["hi", "hi"]
+        # Coalesced calls are billed once.
+        assert sum(r.input_tokens for r in results) == 10 * calls
+        return calls
+
+    async def test_identical_requests_across_rooms_coalesce(self, monkeypatch):
+        assert await self._run_pair(monkeypatch, coalesce=True) == 1
+
+    async def test_rooms_can_opt_out(self, monkeypatch):
+        assert await self._run_pair(monkeypatch, coalesce=False) == 2
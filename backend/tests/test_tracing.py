@@ -0,0 +1,153 @@
+"""Tests for the tracer, its exporters and per-turn tracing in the simulation runner."""
+
+import json
+
+import pytest
+
+from services import simulation_engine
+from services.tracing import FileSpanExporter, OTLPHttpSpanExporter, Tracer, current_span
+
+
+class TestTracer:
+    def test_nested_spans_share_trace(self):
+        tracer = Tracer()
+        with tracer.span("root", room_id="r1") as root:
+            with tracer.span("child") as child:
+                assert current_span() is child
+            assert current_span() is root
+        assert current_span() is None
+
+        assert child.trace_id == root.trace_id
+        assert child.parent_id == root.span_id
+        spans = tracer.get_trace(root.trace_id)
+        assert [s.name for s in spans] == ["root", "child"]
+        assert root.duration_ms >= child.duration_ms
+
+    def test_new_trace_ignores_current_span(self):
+        tracer = Tracer()
+        with tracer.span("outer") as outer, tracer.span("turn", new_trace=True) as turn:
+            assert turn.parent_id is None
+            assert turn.trace_id != outer.trace_id
+
+    def test_error_marks_span(self):
+        tracer = Tracer()
+        with pytest.raises(ValueError), tracer.span("boom") as span:
+            raise ValueError("bad")
+        assert span.status == "error"
+        assert "ValueError" in span.attributes["error"]
+
+    def test_child_span_is_noop_outside_trace(self):
+        tracer = Tracer()
+        with tracer.child_span("db.commit"):
+            pass
+        assert tracer.recent_traces() == []
+
+    def test_buffer_evicts_oldest_trace(self):
+        tracer = Tracer(max_traces=2)
+        ids = []
+        for i in range(3):
+            with tracer.span(f"t{i}") as span:
+                ids.append(span.trace_id)
+        assert tracer.get_trace(ids[0]) is None
+        assert tracer.get_trace(ids[2]) is not None
+
+    def test_recent_traces_filters_and_sorts(self):
+        tracer = Tracer()
+        for name, duration in [("a", 5), ("b", 50), ("a", 20)]:
+            with tracer.span(name) as span:
+                pass
+            span.end_ns = span.start_ns + duration * 1_000_000
+        assert [s.duration_ms for s in tracer.recent_traces("a")] == [20, 5]
+        assert [s.name for s in tracer.recent_traces(min_duration_ms=10)] == ["b", "a"]
+
+
+class TestExporters:
+    async def test_file_exporter_writes_jsonl(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(exporter=FileSpanExporter(str(path)))
+        with tracer.span("root"), tracer.span("child"):
+            pass
+        await tracer.flush()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert {line["name"] for line in lines} == {"root", "child"}
+        assert all(line["duration_ms"] is not None for line in lines)
+
+    async def test_export_failure_is_logged_not_raised(self):
+        class Broken:
+            def export(self, spans):
+                raise OSError("collector down")
+
+        tracer = Tracer(exporter=Broken())
+        with tracer.span("root"):
+            pass
+        await tracer.flush()
+        assert tracer._pending == []
+
+    def test_otlp_encoding(self):
+        tracer = Tracer()
+        with tracer.span("root", turn_number=3, cache_hit=True), tracer.span("child"):
+            pass
+        spans = tracer.recent_traces()[0]
+        encoded = OTLPHttpSpanExporter("http://collector").encode(tracer.get_trace(spans.trace_id))
+
+        otlp_spans = encoded["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        root, child = otlp_spans
+        assert "parentSpanId" not in root
+        assert child["parentSpanId"] == root["spanId"]
+        assert {"key": "turn_number", "value": {"intValue": "3"}} in root["attributes"]
+        assert {"key": "cache_hit", "value": {"boolValue": True}} in root["attributes"]
+
+
+class TestTurnTracing:
+    async def test_turn_trace_is_stored_on_message(self, client, engine_db, monkeypatch):
+        agent = await client.post("/api/agents", json={"name": "Ada", "system_prompt": "p", "model": "m"})
+        room = await client.post("/api/rooms", json={"name": "Traced", "max_turns": 1})
+        room_id = room.json()["id"]
+        await client.post(f"/api/rooms/{room_id}/agents", json={"agent_id": agent.json()["id"]})
+
+        tracer = Tracer()
+        monkeypatch.setattr(simulation_engine, "tracer", tracer)
+        monkeypatch.setattr(simulation_engine.settings, "SIMULATION_TURN_DELAY", 0)
+
+        async def fake_call_llm(self, agent_model, history):
+            return simulation_engine.LLMResult("hello")
+
+        monkeypatch.setattr(simulation_engine.SimulationRunner, "_call_llm", fake_call_llm)
+        runner = simulation_engine.SimulationRunner(room_id)
+        await runner.inject_queue.put("hi all")
+        await runner.run()
+
+        messages = (await client.get(f"/api/messages/{room_id}")).json()["messages"]
+        assert len(messages) == 2
+        trace_id = messages[1]["trace_id"]
+        assert trace_id and messages[0]["trace_id"] == trace_id
+
+        names = [s.name for s in tracer.get_trace(trace_id)]
+        assert names[0] == "simulation.turn"
+        assert {"simulation.history", "llm.call", "db.commit"} <= set(names)
+
+
+class TestTraceAdmin:
+    async def test_list_and_get(self, admin_client, monkeypatch):
+        from routers import admin
+
+        tracer = Tracer()
+        monkeypatch.setattr(admin, "tracer", tracer)
+        with tracer.span("simulation.turn", new_trace=True, room_id="r1") as turn, tracer.span("llm.call"):
+            pass
+
+        response = await admin_client.get("/api/admin/traces", params={"name": "simulation.turn", "room_id": "r1"})
+        assert response.status_code == 200
+        assert [t["trace_id"] for t in response.json()] == [turn.trace_id]
+
+        response = await admin_client.get(f"/api/admin/traces/{turn.trace_id}")
+        assert response.status_code == 200
+        assert [s["name"] for s in response.json()["spans"]] == ["simulation.turn", "llm.call"]
+
+        response = await admin_client.get("/api/admin/traces/missing")
+        assert response.status_code == 404
+
+    async def test_requests_get_trace_header(self, client):
+        response = await client.get("/api/health")
+        assert len(response.headers["X-Trace-Id"]) == 32
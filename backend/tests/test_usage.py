@@ -0,0 +1,150 @@
+"""Tests for token usage capture, persistence and the usage endpoints."""
+
+from types import SimpleNamespace
+
+from models.message import Message
+from services import simulation_engine
+from services.simulation_engine import LLMResult, SimulationRunner, _finish_reason
+from services.usage_service import lookup_price, token_cost
+
+PRICES = {
+    "openai/gpt-5.2": {"input": 1.0, "output": 10.0, "cached_input": 0.1},
+    "cheap": {"input": 0.5, "output": 1.0},
+}
+
+
+class TestPricing:
+    def test_lookup_exact_and_without_provider(self):
+        assert lookup_price("openai/gpt-5.2", PRICES)["output"] == 10.0
+        assert lookup_price("openrouter/cheap", PRICES)["input"] == 0.5
+        assert lookup_price("unknown", PRICES) is None
+        assert lookup_price(None, PRICES) is None
+
+    def test_cost_splits_cached_input(self):
+        cost = token_cost(PRICES["openai/gpt-5.2"], input_tokens=1_000_000, output_tokens=100_000, cached_tokens=500_000)
+        assert cost == 0.5 + 0.05 + 1.0
+
+    def test_cached_price_defaults_to_input_price(self):
+        assert token_cost(PRICES["cheap"], 1_000_000, 0, 1_000_000) == 0.5
+
+
+class TestLLMResult:
+    def test_cache_round_trip_bills_no_tokens(self):
+        result = LLMResult("hi", model_used="m", input_tokens=5, output_tokens=3, finish_reason="stop")
+        restored = LLMResult.from_cache(result.to_cache())
+        assert restored.text == "hi"
+        assert restored.model_used == "m"
+        assert restored.finish_reason == "stop"
+        assert restored.input_tokens == restored.output_tokens == 0
+
+    def test_legacy_string_cache_entry(self):
+        assert LLMResult.from_cache("old").text == "old"
+
+    def test_finish_reason(self):
+        def run(*items):
+            return SimpleNamespace(raw_responses=[SimpleNamespace(output=list(items))])
+
+        assert _finish_reason(SimpleNamespace(raw_responses=[])) is None
+        assert _finish_reason(run()) == "empty"
+        assert _finish_reason(run(SimpleNamespace(type="message", status="completed"))) == "stop"
+        assert _finish_reason(run(SimpleNamespace(type="message", status="incomplete"))) == "length"
+        assert _finish_reason(run(SimpleNamespace(type="function_call", status="completed"))) == "tool_calls"
+
+    async def test_run_agent_extracts_usage(self, monkeypatch):
+        usage = SimpleNamespace(
+            input_tokens=120, output_tokens=30, input_tokens_details=SimpleNamespace(cached_tokens=100),
+        )
+
+        async def fake_run(agent, input, max_turns):
+            return SimpleNamespace(
+                final_output="done",
+                context_wrapper=SimpleNamespace(usage=usage),
+                raw_responses=[SimpleNamespace(output=[SimpleNamespace(type="message", status="completed")])],
+            )
+
+        monkeypatch.setattr(simulation_engine.Runner, "run", fake_run)
+        result = await SimulationRunner("room-1")._run_agent("Ada", "openai/gpt-5.2", "p", [])
+        assert result == LLMResult("done", "openai/gpt-5.2", 120, 30, 100, "stop")
+
+
+async def _setup_room(client, name="Room", agents=("Ada",)):
+    room_id = (await client.post("/api/rooms", json={"name": name})).json()["id"]
+    agent_ids = []
+    for agent in agents:
+        agent_id = (await client.post("/api/agents", json={"name": agent, "system_prompt": "p", "model": "m"})).json()["id"]
+        await client.post(f"/api/rooms/{room_id}/agents", json={"agent_id": agent_id})
+        agent_ids.append(agent_id)
+    return room_id, agent_ids
+
+
+class TestUsagePersistence:
+    async def test_turn_persists_usage(self, client, engine_db, monkeypatch):
+        room_id, _ = await _setup_room(client)
+        monkeypatch.setattr(simulation_engine.settings, "SIMULATION_TURN_DELAY", 0)
+
+        async def fake_call_llm(self, agent_model, history):
+            return LLMResult("hello", "openai/gpt-5.2", 100, 20, 40, "stop")
+
+        monkeypatch.setattr(SimulationRunner, "_call_llm", fake_call_llm)
+        await client.put(f"/api/rooms/{room_id}", json={"max_turns": 1})
+        runner = SimulationRunner(room_id)
+        await runner.run()
+
+        message = (await client.get(f"/api/messages/{room_id}")).json()["messages"][0]
+        assert message["model_used"] == "openai/gpt-5.2"
+        assert (message["input_tokens"], message["output_tokens"], message["cached_tokens"]) == (100, 20, 40)
+        assert message["finish_reason"] == "stop"
+        assert message["run_id"] == runner.run_id
+        assert message["latency_ms"] >= 0
+
+
+class TestUsageAPI:
+    async def _seed(self, client, db_session):
+        room_a, (ada, bob) = await _setup_room(client, "A", ("Ada", "Bob"))
+        room_b, (cy,) = await _setup_room(client, "B", ("Cy",))
+        rows = [
+            (room_a, ada, "run-1", "openai/gpt-5.2", 1000, 100, 0),
+            (room_a, ada, "run-1", "openrouter/cheap", 2000, 0, 0),
+            (room_a, bob, "run-2", "openai/gpt-5.2", 10, 10, 0),
+            (room_b, cy, "run-3", "mystery", 50_000, 5000, 0),
+        ]
+        for room_id, agent_id, run_id, model, input_tokens, output_tokens, cached in rows:
+            db_session.add(Message(
+                room_id=room_id, agent_id=agent_id, role="assistant", content="x", run_id=run_id,
+                model_used=model, input_tokens=input_tokens, output_tokens=output_tokens,
+                cached_tokens=cached, latency_ms=250.0,
+            ))
+        db_session.add(Message(room_id=room_a, role="user", content="injected", run_id="run-1"))
+        await db_session.commit()
+        return room_a, room_b
+
+    async def test_by_room_orders_by_tokens(self, client, db_session, monkeypatch):
+        monkeypatch.setattr(simulation_engine.settings, "LLM_PRICE_TABLE", PRICES)
+        await self._seed(client, db_session)
+
+        rows = (await client.get("/api/usage/rooms")).json()
+        assert [r["name"] for r in rows] == ["B", "A"]
+        b, a = rows
+        assert b["total_tokens"] == 55_000
+        assert b["unpriced_messages"] == 1
+        assert a["messages"] == 3
+        assert a["models"] == ["openai/gpt-5.2", "openrouter/cheap"]
+        assert a["cost_usd"] == round((1010 * 1.0 + 110 * 10.0 + 2000 * 0.5) / 1_000_000, 6)
+
+        rows = (await client.get("/api/usage/rooms", params={"order_by": "cost"})).json()
+        assert rows[0]["name"] == "A"
+
+    async def test_by_agent_and_run(self, client, db_session):
+        room_a, _ = await self._seed(client, db_session)
+
+        agents = (await client.get("/api/usage/agents", params={"room_id": room_a})).json()
+        assert [(r["name"], r["total_tokens"]) for r in agents] == [("Ada", 3100), ("Bob", 20)]
+        assert agents[0]["latency_ms_avg"] == 250.0
+
+        runs = (await client.get("/api/usage/runs", params={"room_id": room_a})).json()
+        assert [(r["id"], r["messages"]) for r in runs] == [("run-1", 2), ("run-2", 1)]
+        assert runs[0]["room_id"] == room_a
+
+    async def test_invalid_order(self, client):
+        response = await client.get("/api/usage/rooms", params={"order_by": "nope"})
+        assert response.status_code == 422
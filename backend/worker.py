@@ -0,0 +1,70 @@
+"""Simulation worker process: runs simulations away from the API's event loop.
+
+Start the API with SIMULATION_MODE=external and a cross-process PUBSUB_BACKEND, then run one
+or more workers against the same database and broker:
+
+    uv run python worker.py
+
+The API queues start/pause/resume/stop/inject commands in the database. An idle worker claims
+each start and takes the room's lease; later commands go to the lease owner. Room events
+reach the API's WebSockets through pub/sub.
+"""
+
+import asyncio
+import contextlib
+import logging
+import signal
+
+from config import settings
+from database import engine, init_db
+from services.loop_watchdog import loop_watchdog
+from services.query_stats import query_instrumentation
+from services.simulation_engine import simulation_manager, ws_manager
+from services.simulation_leases import LeaseCoordinator
+from services.tracing import tracer
+
+logger = logging.getLogger("worker")
+
+
+async def run_worker(stop: asyncio.Event):
+    await init_db()
+    if settings.DB_QUERY_INSTRUMENTATION:
+        query_instrumentation.install(engine.sync_engine)
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    await ws_manager.start()
+    simulation_manager.leases = LeaseCoordinator.from_settings(accept_starts=True)
+    background = [asyncio.create_task(simulation_manager.leases.run(simulation_manager))]
+    background.append(asyncio.create_task(
+        simulation_manager.run_reaper(settings.REAPER_INTERVAL_SECONDS, settings.FINISHED_RUNNER_TTL_SECONDS)
+    ))
+    if tracer.exporter is not None:
+        background.append(asyncio.create_task(tracer.run_exporter()))
+    await simulation_manager.recover(settings.SIMULATION_RECOVERY)
+    logger.info(f"Simulation worker {simulation_manager.leases.worker_id} ready")
+
+    await stop.wait()
+
+    logger.info("Draining simulation worker")
+    await simulation_manager.drain(settings.SHUTDOWN_DRAIN_SECONDS)
+    for task in background:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await ws_manager.close()
+    await loop_watchdog.stop()
+
+
+async def main():
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await run_worker(stop)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if settings.PUBSUB_BACKEND == "memory":
+        logger.warning("PUBSUB_BACKEND=memory: room events from this worker will not reach API WebSockets")
+    asyncio.run(main())
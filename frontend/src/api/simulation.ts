@@ -1,11 +1,12 @@
 import { apiFetch } from "./client";
-import type { SimulationStatus } from "../types";
+import type { InjectMode, SimulationStatus } from "../types";
 
 export const simulationApi = {
-  start: (roomId: string) =>
-    apiFetch<{ status: string }>(`/api/simulation/${roomId}/start`, {
-      method: "POST",
-    }),
+  start: (roomId: string, resume = false) =>
+    apiFetch<{ status: string; queue_position?: number }>(
+      `/api/simulation/${roomId}/start${resume ? "?resume=true" : ""}`,
+      { method: "POST" },
+    ),
   pause: (roomId: string) =>
     apiFetch<{ status: string }>(`/api/simulation/${roomId}/pause`, {
       method: "POST",
@@ -18,11 +19,15 @@ export const simulationApi = {
     apiFetch<{ status: string }>(`/api/simulation/${roomId}/stop`, {
       method: "POST",
     }),
-  inject: (roomId: string, content: string) =>
+  inject: (roomId: string, content: string, mode: InjectMode = "queue") =>
     apiFetch<{ status: string }>(`/api/simulation/${roomId}/inject`, {
       method: "POST",
-      body: JSON.stringify({ content }),
+      body: JSON.stringify({ content, mode }),
     }),
   status: (roomId: string) =>
     apiFetch<SimulationStatus>(`/api/simulation/${roomId}/status`),
+  statuses: (roomIds: string[]) =>
+    apiFetch<SimulationStatus[]>(
+      `/api/simulation/status?room_ids=${roomIds.map(encodeURIComponent).join(",")}`,
+    ),
 };
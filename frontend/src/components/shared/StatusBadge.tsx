@@ -1,5 +1,6 @@
 const statusStyles: Record<string, string> = {
   idle: "bg-nebula-600/50 text-nebula-200",
+  queued: "bg-blue-500/20 text-blue-400 border-blue-500/30",
   running: "bg-green-500/20 text-green-400 border-green-500/30",
   paused: "bg-yellow-500/20 text-yellow-400 border-yellow-500/30",
   stopped: "bg-red-500/20 text-red-400 border-red-500/30",
@@ -20,7 +21,9 @@ export default function StatusBadge({ status }: { status: string }) {
               ? "bg-yellow-400"
               : status === "stopped"
                 ? "bg-red-400"
-                : "bg-nebula-400"
+                : status === "queued"
+                  ? "bg-blue-400"
+                  : "bg-nebula-400"
         }`}
       />
       {status}
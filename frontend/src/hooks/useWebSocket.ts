@@ -16,6 +16,7 @@ export function useWebSocket(roomId: string | undefined, callbacks: WSCallbacks)
   const wsRef = useRef<WebSocket | null>(null);
   const cbRef = useRef(callbacks);
   const retriesRef = useRef(0);
+  const reconnectHintRef = useRef<number | null>(null);
 
   useEffect(() => {
     cbRef.current = callbacks;
@@ -56,6 +57,10 @@ export function useWebSocket(roomId: string | undefined, callbacks: WSCallbacks)
           case "error":
             console.error("WS error:", data.error);
             break;
+          case "reconnect":
+            // Server is restarting: it is about to close this socket; come back after the hint.
+            reconnectHintRef.current = data.retry_after_ms ?? BASE_DELAY;
+            break;
         }
       };
 
@@ -63,7 +68,11 @@ export function useWebSocket(roomId: string | undefined, callbacks: WSCallbacks)
         setConnected(false);
         wsRef.current = null;
         if (unmountedRef.current) return;
-        if (retriesRef.current < MAX_RETRIES) {
+        if (reconnectHintRef.current !== null) {
+          const delay = reconnectHintRef.current;
+          reconnectHintRef.current = null;
+          timerRef.current = setTimeout(() => connectRef.current?.(), delay);
+        } else if (retriesRef.current < MAX_RETRIES) {
           const delay = Math.min(BASE_DELAY * 2 ** retriesRef.current, MAX_DELAY);
           retriesRef.current++;
           timerRef.current = setTimeout(() => connectRef.current?.(), delay);
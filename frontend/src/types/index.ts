@@ -3,6 +3,8 @@ export interface Agent {
   name: string;
   system_prompt: string;
   model: string;
+  llm_timeout_seconds?: number | null;
+  fallback_models?: string[];
   created_at: string;
 }
 
@@ -10,12 +12,16 @@ export interface AgentCreate {
   name: string;
   system_prompt: string;
   model: string;
+  llm_timeout_seconds?: number | null;
+  fallback_models?: string[];
 }
 
 export interface AgentUpdate {
   name?: string;
   system_prompt?: string;
   model?: string;
+  llm_timeout_seconds?: number | null;
+  fallback_models?: string[];
 }
 
 export interface RoomAgentInfo {
@@ -24,13 +30,21 @@ export interface RoomAgentInfo {
   agent: Agent;
 }
 
+export type TurnMode = "sequential" | "parallel";
+export type RoundOrder = "turn" | "completion";
+
 export interface Room {
   id: string;
   name: string;
   description: string | null;
-  status: "idle" | "running" | "paused" | "stopped";
+  status: "idle" | "queued" | "running" | "paused" | "stopped";
   current_turn_index: number;
   max_turns: number;
+  coalesce_llm_requests: boolean;
+  llm_timeout_seconds: number | null;
+  hedge_llm_requests: boolean;
+  turn_mode: TurnMode;
+  round_order: RoundOrder;
   created_at: string;
   agents: RoomAgentInfo[];
 }
@@ -39,12 +53,22 @@ export interface RoomCreate {
   name: string;
   description?: string;
   max_turns?: number;
+  coalesce_llm_requests?: boolean;
+  llm_timeout_seconds?: number | null;
+  hedge_llm_requests?: boolean;
+  turn_mode?: TurnMode;
+  round_order?: RoundOrder;
 }
 
 export interface RoomUpdate {
   name?: string;
   description?: string;
   max_turns?: number;
+  coalesce_llm_requests?: boolean;
+  llm_timeout_seconds?: number | null;
+  hedge_llm_requests?: boolean;
+  turn_mode?: TurnMode;
+  round_order?: RoundOrder;
 }
 
 export interface Message {
@@ -56,6 +80,14 @@ export interface Message {
   turn_number: number;
   created_at: string;
   agent_name: string | null;
+  trace_id?: string | null;
+  run_id?: string | null;
+  model_used?: string | null;
+  finish_reason?: string | null;
+  input_tokens?: number;
+  output_tokens?: number;
+  cached_tokens?: number;
+  latency_ms?: number | null;
 }
 
 export interface SimulationStatus {
@@ -63,19 +95,26 @@ export interface SimulationStatus {
   status: string;
   current_turn_index: number;
   max_turns: number;
+  queue_position?: number | null;
 }
 
 export interface WSMessage {
-  type: "message" | "status" | "typing" | "error";
+  type: "message" | "status" | "typing" | "error" | "reconnect" | "inject_ack";
   message?: Message;
   status?: string;
+  queue_position?: number;
   current_turn_index?: number;
   max_turns?: number;
   agent_id?: string;
   agent_name?: string;
   error?: string;
+  retry_after_ms?: number;
+  message_ids?: string[];
+  interrupted?: boolean;
 }
 
+export type InjectMode = "queue" | "interrupt";
+
 export interface Provider {
   id: string;
   label: string;